@@ -0,0 +1,122 @@
+"""전체 파이프라인(OpenAI 호출) 동시 실행 수 제한, 우선순위 대기열, 과부하 시 빠른 대체 답변
+
+- 캐시 적중은 이 계층을 거치지 않는다 (ResumeChatbot 에서 캐시 조회 후에만 슬롯을 잡는다).
+- 슬롯이 없으면 우선순위(작을수록 먼저) → 도착 순으로 대기하고, 대기열이 가득 찼거나 대기 시간이
+  queue_timeout 을 넘으면 Overloaded 를 던진다. 호출 쪽은 가장 가까운 캐시 답변으로 대신 응답한다.
+"""
+import asyncio
+import heapq
+import itertools
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+
+from prometheus_client import Counter, Gauge
+
+from resume.db.lexical_index import tokenize
+from resume.metrics import REGISTRY
+
+QUEUE_DEPTH = Gauge("resume_admission_queue_depth", "Requests waiting for a pipeline slot", registry=REGISTRY)
+INFLIGHT = Gauge("resume_admission_inflight", "Full pipelines currently running", registry=REGISTRY)
+ADMISSIONS = Counter("resume_admission", "Admission decisions", ("result",), registry=REGISTRY)
+
+# 대화를 이어가는 세션이 새 방문자보다 먼저 슬롯을 받는다
+PRIORITY_FOLLOW_UP = 0
+PRIORITY_NEW = 1
+
+
+class Overloaded(Exception):
+    """대기열이 가득 찼거나 대기 시간 안에 슬롯을 받지 못함"""
+    def __init__(self, reason: str) -> None:
+        super().__init__(f"파이프라인 과부하 ({reason})")
+        self.reason = reason
+
+
+class AdmissionController:
+    def __init__(self, max_concurrent: Optional[int] = None, max_queue: Optional[int] = None, queue_timeout: Optional[float] = None) -> None:
+        # max_concurrent 가 0 이면 제한 없음 (CLI/벤치마크 기본값)
+        self.max_concurrent = max_concurrent if max_concurrent is not None else int(os.getenv("ADMISSION_MAX_CONCURRENT", 8))
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv("ADMISSION_MAX_QUEUE", 32))
+        self.queue_timeout = queue_timeout if queue_timeout is not None else float(os.getenv("ADMISSION_QUEUE_TIMEOUT", 10))
+        self.active = 0
+        self.queued = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self.stats = {"admitted": 0, "queued": 0, "shed_queue_full": 0, "shed_deadline": 0}
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_NEW) -> AsyncIterator[None]:
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: int = PRIORITY_NEW) -> None:
+        if not self.max_concurrent or (self.active < self.max_concurrent and not self.queued):
+            self._admit("admitted")
+            return
+        if self.queued >= self.max_queue:
+            self._shed("shed_queue_full")
+            raise Overloaded("queue_full")
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._set_queued(self.queued + 1)
+        self.stats["queued"] += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+        except BaseException as e:
+            if future.done() and not future.cancelled():
+                # 시간 초과/취소와 동시에 슬롯을 넘겨받았으면 다음 대기자에게 돌려준다
+                self.release()
+            else:
+                future.cancel()
+                self._set_queued(self.queued - 1)
+            if isinstance(e, asyncio.TimeoutError):
+                self._shed("shed_deadline")
+                raise Overloaded("deadline") from None
+            raise
+
+    def release(self) -> None:
+        """슬롯 반환 - 대기자가 있으면 active 를 줄이지 않고 그대로 넘긴다"""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue  # 시간 초과/취소된 대기자
+            self._set_queued(self.queued - 1)
+            self.stats["admitted"] += 1
+            ADMISSIONS.labels(result="admitted").inc()
+            future.set_result(None)
+            return
+        self.active -= 1
+        INFLIGHT.set(self.active)
+
+    def _admit(self, result: str) -> None:
+        self.active += 1
+        self.stats[result] += 1
+        ADMISSIONS.labels(result=result).inc()
+        INFLIGHT.set(self.active)
+
+    def _shed(self, result: str) -> None:
+        self.stats[result] += 1
+        ADMISSIONS.labels(result=result).inc()
+
+    def _set_queued(self, queued: int) -> None:
+        self.queued = queued
+        QUEUE_DEPTH.set(queued)
+
+
+def closest_answer(question: str, records: list[dict[str, Any]], min_score: Optional[float] = None) -> Optional[str]:
+    """캐시 레코드({"q", "a"}) 중 질문 토큰(한글 2-gram)을 가장 많이 포함한 답변 (포함 비율이 min_score 미만이면 None)"""
+    min_score = min_score if min_score is not None else float(os.getenv("SHED_MIN_SIMILARITY", 0.5))
+    query = set(tokenize(question))
+    best, best_score = None, 0.0
+    for record in records:
+        tokens = set(tokenize(record.get("q", "")))
+        if not query or not tokens:
+            continue
+        score = len(query & tokens) / len(query)
+        if score > best_score:
+            best, best_score = record.get("a"), score
+    return best if best_score >= min_score else None
@@ -1,13 +1,95 @@
+import asyncio
+import copy
 import json
-from typing import Any
+import os
+import time
+from typing import Any, Awaitable, Callable, Optional
 from openai import AsyncOpenAI
 
+from resume.agents.local_classifier import PROTOTYPES, LocalClassifier
+from resume.db.local_cache import MISSING, LocalCache
+from resume.metrics import agent_span, record_usage
+from resume.repository.stage_repository import StageResultRepository
+from resume.utils.text import normalize_question
+
 # Agent 1: 질문 분류기
 class Classifier:
-    def __init__(self, client: AsyncOpenAI) -> None:
+    def __init__(self, client: AsyncOpenAI, embed_documents: Optional[Callable[[list[str]], Awaitable[list[list[float]]]]] = None, memo_size: int = 1024, stage_cache: Optional[StageResultRepository] = None) -> None:
         self.client = client 
+        # 대표 질문 임베딩 함수 (없으면 키워드 규칙만 사용)
+        self.embed_documents = embed_documents
+        self.local = LocalClassifier()
+        # LLM 분류 결과 메모 (정규화한 질문 → 분류, 분류는 인덱스와 무관하므로 TTL 없이 LRU 로만 제한)
+        self.memo = LocalCache(max_size=memo_size, ttl=float("inf"))
+        # 다른 인스턴스/재시작 후에도 LLM 분류를 재사용하기 위한 Redis 단계 캐시
+        self.stage_cache = stage_cache
+        # 중심 벡터는 요청 경로를 막지 않고 백그라운드 태스크로 만들고, 실패하면 지수 백오프 후에만 다시 시도
+        self.centroid_backoff = float(os.getenv("CLASSIFIER_CENTROID_BACKOFF", 30))
+        self._centroid_task: Optional[asyncio.Task] = None
+        self._centroid_failures = 0
+        self._centroid_retry_at = 0.0
+        self.stats = {"local": 0, "memo": 0, "cache": 0, "llm": 0}
+
+    async def classify_question(self, question: str, vector: Optional[list[float]] = None) -> dict[str, Any]:
+        """로컬 분류 → 메모 → 단계 캐시 → LLM 순으로 질문을 분류 (vector 는 이미 계산한 질문 임베딩)"""
+        result = self.local.classify(question, vector)
+        if result is not None:
+            self.stats["local"] += 1
+            return result
+        # 중심 벡터가 아직 없으면 만들기 시작만 하고 이번 질문은 기다리지 않는다
+        self.start_centroids()
+
+        key = normalize_question(question)
+        memoized = self.memo.get(key)
+        if memoized is not MISSING:
+            self.stats["memo"] += 1
+            return copy.deepcopy(memoized)
+
+        if self.stage_cache is not None:
+            cached = await self.stage_cache.get("classify", question)
+            if cached is not None and "category" in cached:
+                self.stats["cache"] += 1
+                self.memo.set(key, copy.deepcopy(cached))
+                return cached
+
+        result = await self.classify_with_llm(question)
+        self.stats["llm"] += 1
+        self.memo.set(key, copy.deepcopy(result))
+        if self.stage_cache is not None:
+            await self.stage_cache.save("classify", question, result)
+        return result
+
+    def start_centroids(self) -> Optional[asyncio.Task]:
+        """중심 벡터를 만드는 백그라운드 태스크 (이미 있거나, 진행 중이거나, 실패 후 백오프 중이면 새로 시작하지 않음)"""
+        if self.local.has_centroids or self.embed_documents is None:
+            return None
+        if self._centroid_task is not None and not self._centroid_task.done():
+            return self._centroid_task
+        if time.monotonic() < self._centroid_retry_at:
+            return None
+        self._centroid_task = asyncio.get_running_loop().create_task(self.build_centroids())
+        return self._centroid_task
+
+    async def build_centroids(self) -> bool:
+        """카테고리 대표 질문들을 한 번에 임베딩해 중심 벡터를 만든다"""
+        texts = [(category, text) for category, examples in PROTOTYPES.items() for text in examples]
+        try:
+            vectors = await self.embed_documents([text for _, text in texts])
+        except Exception as e:
+            # 실패하는 동안 요청마다 같은 호출을 반복하지 않도록 다음 시도를 미룬다 (그 사이엔 규칙/LLM 만 사용)
+            self._centroid_failures += 1
+            delay = min(self.centroid_backoff * 2 ** (self._centroid_failures - 1), 600)
+            self._centroid_retry_at = time.monotonic() + delay
+            print(f"분류기 중심 벡터 생성 실패 ({delay:.0f}초 후 재시도): {e}")
+            return False
+        grouped: dict[str, list[list[float]]] = {}
+        for (category, _), vector in zip(texts, vectors):
+            grouped.setdefault(category, []).append(vector)
+        self.local.set_centroids(grouped)
+        self._centroid_failures = 0
+        return True
 
-    async def classify_question(self, question: str) -> dict[str, Any]:
+    async def classify_with_llm(self, question: str) -> dict[str, Any]:
         """질문을 카테고리 + 검색 메타데이터 필드로 분류"""
         categories = ["프로젝트 경험", "기술스택", "협업", "자기소개", "학습 경험"]
         prompt = f"""
@@ -51,13 +133,15 @@ class Classifier:
         }}
         """
 
-        response = await self.client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": prompt},
-                {"role": "user", "content": f'분류할 질문: "{question}"'},
-            ],
-            response_format={"type": "json_object"} 
-        )
+        with agent_span("classifier"):
+            response = await self.client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": f'분류할 질문: "{question}"'},
+                ],
+                response_format={"type": "json_object"} 
+            )
+        record_usage("classifier", "gpt-4o-mini", getattr(response, "usage", None))
 
         return json.loads(response.choices[0].message.content.strip())
\ No newline at end of file
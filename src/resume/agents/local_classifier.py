@@ -0,0 +1,104 @@
+import os
+import re
+from typing import Any, Optional
+
+import numpy as np
+
+# 카테고리 → doc_type (LLM 분류기 프롬프트의 매핑과 동일)
+DOC_TYPES = {
+    "프로젝트 경험": "projects",
+    "기술스택": "projects",
+    "협업": "qna",
+    "학습 경험": "qna",
+    "자기소개": "summary",
+}
+
+# 뜻이 분명한 표현은 키워드 규칙으로 바로 분류
+KEYWORD_RULES = {
+    "기술스택": re.compile(r"기술\s*스택|스택|언어|프레임워크|라이브러리|주력\s*기술|다룰\s*수|사용(해\s*본|하신|한)\s*기술"),
+    "협업": re.compile(r"협업|팀워크|팀원|동료|갈등|소통|커뮤니케이션|의견\s*(충돌|차이)"),
+    "학습 경험": re.compile(r"공부|학습|배운|배우|자기\s*계발|성장"),
+    "자기소개": re.compile(r"자기\s*소개|본인\s*소개|소개\s*(해|좀)|어떤\s*사람|장점|단점|성격"),
+    "프로젝트 경험": re.compile(r"프로젝트|경력|회사|담당|업무|역할|성과"),
+}
+
+TIME_RULES = {
+    "recent": re.compile(r"최근|마지막|요즘|최신|가장\s*늦"),
+    "first": re.compile(r"처음|첫\s*(번째|프로젝트|회사|직장)|최초|가장\s*오래"),
+}
+
+# 카테고리 중심 벡터를 만들 대표 질문들
+PROTOTYPES = {
+    "프로젝트 경험": ["어떤 프로젝트를 진행했나요?", "회사에서 맡았던 역할이 무엇인가요?", "가장 기억에 남는 프로젝트는?", "프로젝트에서 어떤 성과를 냈나요?"],
+    "기술스택": ["사용할 수 있는 기술 스택이 무엇인가요?", "주로 쓰는 언어와 프레임워크는?", "어떤 기술을 다룰 수 있나요?"],
+    "협업": ["팀원과 갈등이 있을 때 어떻게 해결하나요?", "협업 경험을 말해주세요", "동료와 소통하는 방식은?"],
+    "학습 경험": ["새로운 기술을 어떻게 공부하나요?", "최근에 배운 것이 있나요?", "개발자로서 어떻게 성장해왔나요?"],
+    "자기소개": ["자기소개 해주세요", "당신은 어떤 사람인가요?", "본인의 장점과 단점은?"],
+}
+
+# 영문 고유명사(회사/기술 이름)가 있으면 LLM 이 메타데이터 regex 필터를 만들 수 있도록 넘긴다
+NAMED_ENTITY = re.compile(r"[A-Za-z][A-Za-z0-9.+#-]+")
+
+
+class LocalClassifier:
+    """API 호출 없는 분류 단계 - 키워드 규칙 → 카테고리 중심 벡터 최근접 순으로 시도
+
+    확신이 낮으면 None 을 돌려주고, 이때만 LLM 분류기를 호출한다.
+    """
+    def __init__(self, min_score: Optional[float] = None, min_margin: Optional[float] = None) -> None:
+        self.min_score = min_score if min_score is not None else float(os.getenv("CLASSIFIER_MIN_SCORE", 0.35))
+        self.min_margin = min_margin if min_margin is not None else float(os.getenv("CLASSIFIER_MIN_MARGIN", 0.04))
+        self.categories: list[str] = []
+        self.centroids = np.empty((0, 0), dtype=np.float32)
+
+    @property
+    def has_centroids(self) -> bool:
+        return self.centroids.size > 0
+
+    def set_centroids(self, vectors: dict[str, list[list[float]]]) -> None:
+        """카테고리별 대표 질문 임베딩의 평균을 정규화해 중심 벡터로 사용"""
+        self.categories = list(vectors)
+        self.centroids = np.vstack([self._normalize(np.mean(np.asarray(v, dtype=np.float32), axis=0)) for v in vectors.values()])
+
+    def classify(self, question: str, vector: Optional[list[float]] = None) -> Optional[dict[str, Any]]:
+        if NAMED_ENTITY.search(question):
+            return None
+
+        matched = [category for category, pattern in KEYWORD_RULES.items() if pattern.search(question)]
+        if len(matched) == 1:
+            return self._result(matched[0], question)
+
+        # 규칙이 없거나 여러 개 걸리면 중심 벡터로 판단 (여러 개면 걸린 카테고리 안에서만)
+        category = self._nearest(vector, matched)
+        return self._result(category, question) if category else None
+
+    def _nearest(self, vector: Optional[list[float]], candidates: list[str]) -> Optional[str]:
+        if vector is None or not self.has_centroids:
+            return None
+        scores = self.centroids @ self._normalize(np.asarray(vector, dtype=np.float32))
+        if candidates:
+            scores = np.where([c in candidates for c in self.categories], scores, -np.inf)
+
+        order = np.argsort(scores)[::-1]
+        best = float(scores[order[0]])
+        second = float(scores[order[1]]) if len(order) > 1 else -np.inf
+        if best < self.min_score or best - second < self.min_margin:
+            return None
+        return self.categories[int(order[0])]
+
+    def _result(self, category: str, question: str) -> dict[str, Any]:
+        time_condition = "none"
+        if category == "프로젝트 경험":
+            for condition, pattern in TIME_RULES.items():
+                if pattern.search(question):
+                    time_condition = condition
+                    break
+        return {
+            "category": category,
+            "time_condition": time_condition,
+            "filters": {"doc_type": DOC_TYPES[category]},
+        }
+
+    def _normalize(self, v: np.ndarray) -> np.ndarray:
+        norm = np.linalg.norm(v)
+        return v / norm if norm else v
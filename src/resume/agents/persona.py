@@ -1,6 +1,9 @@
 # Agent 3: 답변 생성기 (Persona Agent)
+from typing import AsyncIterator
 from openai import AsyncOpenAI
 
+from resume.agents.refiner import STYLE_RULES
+from resume.metrics import agent_span, record_usage
 from resume.repository.history_repository import HistoryRepository
 
 
@@ -10,8 +13,34 @@ class Persona:
         self.name = name 
         self.history_repository = history_repository
 
-    async def persona_answer(self, question: str, category: str, context: str, session_id: str) -> str:
-        """이력서 주인공(Yoonha Lee)의 톤으로 답변 생성"""
+    async def persona_answer(self, question: str, category: str, context: str, session_id: str, single_pass: bool = False) -> str:
+        """이력서 주인공(Yoonha Lee)의 톤으로 답변 생성 (single_pass 면 스타일 보정까지 한 번에)"""
+        messages = await self._build_messages(question, category, context, session_id, single_pass)
+        with agent_span("persona"):
+            response = await self.client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=messages
+            )
+        record_usage("persona", "gpt-4o-mini", getattr(response, "usage", None))
+        return response.choices[0].message.content
+
+    async def persona_answer_stream(self, question: str, category: str, context: str, session_id: str, single_pass: bool = False) -> AsyncIterator[str]:
+        """persona_answer 의 스트리밍 버전 - 생성되는 토큰 조각을 바로 yield"""
+        messages = await self._build_messages(question, category, context, session_id, single_pass)
+        with agent_span("persona"):
+            stream = await self.client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=messages,
+                stream=True,
+                # 마지막 청크(choices 없음)로 토큰 사용량을 받는다
+                stream_options={"include_usage": True},
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                record_usage("persona", "gpt-4o-mini", getattr(chunk, "usage", None))
+
+    async def _build_messages(self, question: str, category: str, context: str, session_id: str, single_pass: bool) -> list[dict[str, str]]:
         prompt = f"""
         당신은 {self.name}으로서 행동하고 있습니다. 
         당신은 {self.name}의 웹사이트에서 질문에 답변하고 있으며, 
@@ -43,8 +72,12 @@ class Persona:
         - 개인 적인 경험과 성과, 배운점을 강조한다. 
         - 인터뷰 응답자 형식의 대화 형식을 유지한다. 
         """
+        if single_pass:
+            # Refiner 를 거치지 않으므로 최종 스타일 기준까지 함께 지시
+            prompt += f"""
+        최종 답변은 다음 스타일 기준을 모두 만족해야 한다:{STYLE_RULES}        """
         messages = [{"role": "system", "content": prompt}]
-        recent_history = await self.history_repository.get_summary(session_id, n=3)
+        recent_history = await self.history_repository.get_window(session_id, n=3)
 
         for turn in recent_history:
             if "summary" in turn:
@@ -53,10 +86,4 @@ class Persona:
                 messages.append({"role": "user", "content": turn["q"]})
                 messages.append({"role": "assistant", "content": turn["a"]})
         messages.append({"role": "user", "content": question})
-
-        response = await self.client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=messages
-        )
-
-        return response.choices[0].message.content
\ No newline at end of file
+        return messages
\ No newline at end of file
@@ -1,32 +1,57 @@
-import datetime
+import os
+from typing import Optional
 from openai import AsyncOpenAI
 
 from resume.db.vector_store import VectorStore
+from resume.utils.context import ContextAssembler, compact_document
 
 # Agent 2: 지식 검색기 (RAG Agent)
 class Retriever:
-    def __init__(self, client: AsyncOpenAI, store: VectorStore) -> None:
+    def __init__(self, client: AsyncOpenAI, store: Optional[VectorStore]) -> None:
         self.client = client 
         self.store = store 
+        # 벡터 검색 결과에 BM25 결과를 RRF 로 섞을지 / 정확한 용어가 있으면 임베딩을 생략할지
+        self.hybrid = os.getenv("HYBRID_SEARCH", "true").lower() == "true"
+        self.lexical_fast_mode = os.getenv("LEXICAL_FAST_MODE", "true").lower() == "true"
+        # 최근/처음 질문에서 기간 순으로 자른 k 개를 질문 유사도 순으로 다시 정렬할지
+        self.time_rerank = os.getenv("TIME_RERANK", "false").lower() == "true"
+        # 검색 결과를 토큰 예산(CONTEXT_TOKEN_BUDGET) 안으로 압축해 Persona 프롬프트에 넣는다
+        self.assembler = ContextAssembler()
 
-    async def retrieve_context(self, question: str, category_info: dict) -> str:
-        """질문과 가장 유사한 카테고리 정보에 맞는 메타데이터 기반 Resume/summary 부분을 검색"""
+    def needs_embedding(self, question: str) -> bool:
+        """회사/기술/프로젝트 이름이 그대로 들어 있는 질문은 BM25 만으로 검색 (임베딩 호출 생략)"""
+        return not (self.lexical_fast_mode and self.store.exact_match(question))
+
+    async def embed_question(self, question: str) -> list[float]:
+        """요청당 한 번 계산한 질문 벡터를 게이트/검색 단계에서 재사용"""
+        return await self.store.embed_query(question)
+
+    async def prefetch(self, vector: Optional[list[float]], k: int = 15) -> list:
+        """분류가 끝나기 전에 필터 없는 top-k 를 미리 검색 (retrieve_context 에서 재사용)"""
+        if vector is None:
+            return []
+        return self.store.get_similar_data_by_vector(vector, k)
+
+    async def retrieve_context(self, question: str, category_info: dict, vector: Optional[list[float]] = None, prefetched: Optional[list] = None) -> str:
+        """질문과 가장 유사한 카테고리 정보에 맞는 메타데이터 기반 Resume/summary 부분을 검색 (vector 가 없으면 BM25 만 사용)"""
         time_condition = category_info.get("time_condition", "none")
         filters = category_info.get("filters", {})  
         category = category_info.get("category")
         k = 5
 
+        results = None
         try:
-            if(time_condition != "none" and category == "프로젝트 경험"):
-                results = self.store.get_similar_data(question,20,filters)
-                if time_condition == "recent":
-                    results = sorted(results, key=lambda r: self._parse_date_safe(r.metadata.get("period_from")), reverse=True)[:k]
-                elif time_condition == "first":
-                    results = sorted(results, key=lambda r: self._parse_date_safe(r.metadata.get("period_from")), reverse=False)[:k]
-            else :
-                results = self.store.get_similar_data(question,k,filters)
+            if(time_condition in ("recent", "first") and category == "프로젝트 경험"):
+                # 미리 정렬해 둔 기간 순서에서 k 개만 잘라 사용 (벡터 검색 없음)
+                results = self.store.get_chronological(time_condition, k, filters, vector=vector if self.time_rerank else None)
+            if not results:
+                # 기간 정보가 없거나 필터에 맞는 프로젝트가 없으면 일반 검색
+                results = self._search(question, filters, k, vector, prefetched)
         except Exception:
-            results = self.store.get_similar_data(question, k=3)
+            if vector is None:
+                results = self.store.lexical_search(question, k=3)
+            else:
+                results = self.store.get_similar_data_by_vector(vector, k=3)
 
         # for r in results:
         #     print(r.page_content)
@@ -36,14 +61,29 @@ class Retriever:
         if not results:
             return ""
 
-        return "\n".join([r.page_content for r in results])
+        return self.assembler.assemble([compact_document(r.page_content) for r in results])
 
-    def _parse_date_safe(self, val: str | None) -> datetime.datetime:
-        try:
-            return datetime.datetime.fromisoformat(val) if val else datetime.datetime.min
-        except Exception:
-            return datetime.datetime.min
+    def _search(self, question: str, filters: dict, k: int, vector: Optional[list[float]], prefetched: Optional[list]) -> list:
+        if vector is None:
+            return self.store.lexical_search(question, k, filters)
+        results = self._from_prefetched(prefetched, filters, k)
+        if self.hybrid:
+            return self.store.hybrid_search(question, vector, k, filters, dense=results)
+        if results is None:
+            results = self.store.get_similar_data_by_vector(vector,k,filters)
+        return results
+
+    def _from_prefetched(self, prefetched: Optional[list], filters: dict, k: int) -> Optional[list]:
+        """doc_type 필터만 있는 경우 미리 검색한 결과에서 k 개를 채울 수 있으면 그대로 사용"""
+        if not prefetched or set(filters) - {"doc_type"}:
+            return None
+        doc_type = filters.get("doc_type")
+        results = [r for r in prefetched if doc_type is None or r.metadata.get("doc_type") == doc_type]
+        return results[:k] if len(results) >= k else None
 
-    async def is_context_valid(self, question: str, threshold: float = 0.2) -> bool:
-        score= self.store.get_context_score(question)
+    async def is_context_valid(self, question: str, threshold: float = 0.2, vector: Optional[list[float]] = None) -> bool:
+        if vector is None:
+            # 임베딩을 생략한 질문은 고유 용어가 문서와 정확히 일치한 경우뿐
+            return bool(self.store.exact_match(question))
+        score= self.store.get_context_score_by_vector(vector)
         return score >= threshold
\ No newline at end of file
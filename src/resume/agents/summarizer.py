@@ -1,15 +1,22 @@
 # Agent 5 대화 요약기 Agent 
+from typing import Optional
 from openai import AsyncOpenAI
 
+from resume.metrics import agent_span, record_usage
+
 
 class Summarizer:  
     def __init__(self, client: AsyncOpenAI) -> None:
         self.client = client
 
-    async def summarize_history(self, history: list[dict[str, str]]) -> str:
+    async def summarize_history(self, history: list[dict[str, str]], previous_summary: Optional[str] = None) -> str:
         text = "\n".join([f"Q: {h['q']}\nA: {h['a']}" for h in history])
-        response = await self.client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "system", "content": f"아래 대화를 5문장 이내로 요약해줘:\n{text}"}]
-        )
+        if previous_summary:
+            text = f"이전 대화 요약: {previous_summary}\n{text}"
+        with agent_span("summarizer"):
+            response = await self.client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[{"role": "system", "content": f"아래 대화를 5문장 이내로 요약해줘:\n{text}"}]
+            )
+        record_usage("summarizer", "gpt-4o-mini", getattr(response, "usage", None))
         return response.choices[0].message.content.strip()
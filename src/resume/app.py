@@ -2,6 +2,8 @@ import os
 import gradio as gr
 import uuid
 
+from resume.admission import AdmissionController
+from resume.metrics import serve_metrics
 from resume.resume_chatbot import ResumeChatbot
 
 
@@ -9,11 +11,20 @@ def init_session():
     return str(uuid.uuid4())
 
 def main():
+    # Prometheus 스크레이프용 /metrics (Gradio 와 별도 포트)
+    if os.getenv('METRICS_ENABLED', 'true').lower() == 'true':
+        server = serve_metrics()
+        print(f"metrics: http://0.0.0.0:{server.server_address[1]}/metrics")
     bot = ResumeChatbot(
         gcs_bucket=os.getenv('GCS_BUCKET'),
         gcs_projects_path=os.getenv('GCS_PROJECTS_PATH', 'projects.json'),
         gcs_qna_path=os.getenv('GCS_QNA_PATH', 'qna.json'),
-        gcs_introduce_path=os.getenv('GCS_INTRODUCE_PATH', 'introduce.txt')
+        gcs_introduce_path=os.getenv('GCS_INTRODUCE_PATH', 'introduce.txt'),
+        # 벡터 스토어는 백그라운드에서 준비하고 서버 포트는 바로 연다
+        fast_startup=os.getenv('FAST_STARTUP', 'true').lower() == 'true',
+        # 캐시 적중은 바로 답하고, OpenAI 를 부르는 전체 파이프라인만 동시 실행 수/대기열을 제한
+        # (ADMISSION_MAX_CONCURRENT, ADMISSION_MAX_QUEUE, ADMISSION_QUEUE_TIMEOUT)
+        admission=AdmissionController(),
     )
     # 로컬 파일 사용 (기존 방식)
     # BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -96,14 +107,23 @@ def main():
         session_id = gr.State(init_session)
         # 응답 함수
         async def respond(message, history, session_id):
-            response = await bot.chat(message, history, session_id)   
-            history.append((message, response))
-            return "", history, session_id
+            # 답변을 스트리밍으로 받아 말풍선을 점진적으로 갱신
+            history = history + [(message, "")]
+            async for partial in bot.chat_stream(message, history, session_id):
+                history[-1] = (message, partial)
+                yield "", history, session_id
 
         msg.submit(respond, [msg, chatbot, session_id], [msg, chatbot, session_id])
         clear.click(lambda: None, None, chatbot, queue=False)
 
 
+    # generator 응답(스트리밍)은 queue 가 활성화되어 있어야 동작
+    # 동시 실행 제한은 AdmissionController 가 맡으므로 Gradio 워커는 캐시 적중이 막히지 않을 만큼 넉넉하게 두고,
+    # Gradio 대기열 길이만 제한해 폭주 시 연결이 무한히 쌓이지 않게 한다
+    demo.queue(
+        concurrency_count=int(os.getenv('GRADIO_CONCURRENCY', 64)),
+        max_size=int(os.getenv('GRADIO_MAX_QUEUE', 256)),
+    )
     demo.launch(server_name="0.0.0.0", server_port=7860, share=False)
 
 
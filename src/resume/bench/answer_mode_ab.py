@@ -0,0 +1,120 @@
+"""답변 생성 모드(two_stage / single_pass) A/B 하네스
+
+고정된 질문 세트를 두 모드로 재생해 지연 시간과 토큰 사용량을 비교한다.
+기본은 네트워크 없이 StubAsyncOpenAI 로 실행하고, --live 를 주면 실제 OpenAI API 를 호출한다.
+
+    python -m resume.bench.answer_mode_ab --rounds 3 --json ab.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from typing import Any, Optional, Sequence
+
+from resume.agents.persona import Persona
+from resume.agents.refiner import Refiner
+from resume.bench.stub_openai import StubAsyncOpenAI
+
+QUESTIONS = [
+    ("최근 프로젝트가 뭐예요?", "프로젝트 경험"),
+    ("기술스택이 뭐예요?", "기술스택"),
+    ("협업하면서 어려웠던 점이 있었나요?", "협업"),
+    ("자기소개 부탁드려요.", "자기소개"),
+    ("최근에 공부한 것은 무엇인가요?", "학습 경험"),
+    ("Kafka 를 써본 경험이 있나요?", "프로젝트 경험"),
+]
+
+DEFAULT_CONTEXT_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "me", "summary.txt")
+
+
+class RecordingClient:
+    """chat.completions.create 호출마다 지연 시간과 토큰 사용량을 기록하는 래퍼"""
+    def __init__(self, client: Any) -> None:
+        self.client = client
+        self.calls: list[dict[str, Any]] = []
+        self.chat = self
+        self.completions = self
+
+    async def create(self, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        response = await self.client.chat.completions.create(**kwargs)
+        usage = getattr(response, "usage", None)
+        self.calls.append({
+            "latency": time.perf_counter() - start,
+            "prompt_tokens": getattr(usage, "prompt_tokens", 0),
+            "completion_tokens": getattr(usage, "completion_tokens", 0),
+        })
+        return response
+
+
+class _EmptyHistory:
+    """하네스에서는 대화 이력 없이 매 질문을 첫 질문으로 취급"""
+    async def get_window(self, session_id: str, n: int = 3) -> list[dict[str, Any]]:
+        return []
+
+
+async def run_mode(mode: str, client: RecordingClient, context: str, rounds: int) -> dict[str, Any]:
+    persona = Persona(client, _EmptyHistory())
+    refiner = Refiner(client)
+    latencies = []
+    client.calls.clear()
+
+    for _ in range(rounds):
+        for question, category in QUESTIONS:
+            start = time.perf_counter()
+            answer = await persona.persona_answer(question, category, context, "ab-harness", single_pass=mode == "single_pass")
+            if mode == "two_stage":
+                await refiner.refine_answer(answer)
+            latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "questions": len(latencies),
+        "llm_calls": len(client.calls),
+        "latency_mean": statistics.mean(latencies),
+        "latency_p50": latencies[len(latencies) // 2],
+        "latency_p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "prompt_tokens": sum(c["prompt_tokens"] for c in client.calls),
+        "completion_tokens": sum(c["completion_tokens"] for c in client.calls),
+    }
+
+
+async def run(rounds: int, context: str, live: bool) -> list[dict[str, Any]]:
+    if live:
+        from openai import AsyncOpenAI
+        client = RecordingClient(AsyncOpenAI())
+    else:
+        client = RecordingClient(StubAsyncOpenAI())
+    return [await run_mode(mode, client, context, rounds) for mode in ("two_stage", "single_pass")]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="two_stage / single_pass 답변 모드 A/B 비교")
+    parser.add_argument("--rounds", type=int, default=1, help="질문 세트 반복 횟수")
+    parser.add_argument("--context-file", default=DEFAULT_CONTEXT_FILE, help="Persona 에 넣을 고정 컨텍스트 파일")
+    parser.add_argument("--live", action="store_true", help="stub 대신 실제 OpenAI API 호출")
+    parser.add_argument("--json", dest="json_path", help="결과를 JSON 으로 저장할 경로")
+    args = parser.parse_args(argv)
+
+    with open(args.context_file, "r", encoding="utf-8") as f:
+        context = f.read()
+
+    results = asyncio.run(run(args.rounds, context, args.live))
+    for r in results:
+        print(
+            f"{r['mode']:<12} calls={r['llm_calls']:<4} "
+            f"mean={r['latency_mean'] * 1000:.0f}ms p50={r['latency_p50'] * 1000:.0f}ms p95={r['latency_p95'] * 1000:.0f}ms "
+            f"prompt_tokens={r['prompt_tokens']} completion_tokens={r['completion_tokens']}"
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
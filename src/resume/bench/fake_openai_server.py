@@ -0,0 +1,270 @@
+"""부하 테스트용 로컬 OpenAI 호환 HTTP 서버 (표준 라이브러리만 사용)
+
+- POST /v1/chat/completions : 일반 / JSON 모드(분류) / stream=true(SSE) 응답
+- POST /v1/embeddings       : 글자(토큰 id) 2-gram 해시 기반의 결정적 임베딩 (비슷한 문장은 가까운 벡터, float/base64)
+- 엔드포인트별 지연 시간, 스트리밍 토큰 간격, 429 주입 비율을 설정할 수 있다.
+
+별도 스레드의 이벤트 루프에서 돌기 때문에 측정 대상 이벤트 루프의 지연에 섞이지 않는다.
+
+    python -m resume.bench.fake_openai_server --port 8089 --chat-latency 0.4 --rate-limit 0.05
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from resume.agents.local_classifier import LocalClassifier
+from resume.bench.stub_openai import DEFAULT_ANSWER, DEFAULT_CLASSIFICATION
+from resume.utils.tokens import count_tokens
+
+EMBEDDING_DIM = 256
+
+
+@dataclass
+class FakeServerConfig:
+    chat_latency: float = 0.3        # 첫 바이트까지 (초)
+    per_token_latency: float = 0.01  # 스트리밍 토큰 사이 / 비스트리밍은 출력 토큰 비례
+    embedding_latency: float = 0.03
+    rate_limit: float = 0.0          # 429 를 돌려줄 확률
+    retry_after_ms: int = 200
+    answer: str = DEFAULT_ANSWER
+    seed: int = 0
+
+
+@dataclass
+class FakeServerStats:
+    requests: dict[str, int] = field(default_factory=dict)
+    rate_limited: int = 0
+
+
+def fake_embedding(item: Any, dim: int = EMBEDDING_DIM, shared: float = 1.0) -> list[float]:
+    """문자열은 글자 2-gram, 토큰 id 목록은 id 2-gram 을 해시해 만든 정규화 벡터
+
+    모든 벡터에 공통 성분(shared)을 더해 서로 다른 문장도 코사인 0.5 안팎이 되게 한다.
+    (실제 임베딩 모델처럼 같은 도메인 문장끼리 어느 정도 가까워야 컨텍스트 게이트를 통과한다)
+    """
+    units = list(item) if isinstance(item, str) else [str(t) for t in item]
+    grams = [a + "|" + b for a, b in zip(units, units[1:])] or units or [""]
+    vector = np.zeros(dim, dtype=np.float32)
+    for gram in grams:
+        h = int.from_bytes(hashlib.blake2b(gram.encode(), digest_size=8).digest(), "little")
+        vector[1 + h % (dim - 1)] += 1.0 if (h >> 32) & 1 else -1.0
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    vector[0] = shared
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+class FakeOpenAIServer:
+    def __init__(self, config: Optional[FakeServerConfig] = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.config = config or FakeServerConfig()
+        self.host = host
+        self.port = port
+        self.stats = FakeServerStats()
+        self.classifier = LocalClassifier()
+        self._random = random.Random(self.config.seed)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    def start_in_thread(self) -> "FakeOpenAIServer":
+        self._thread = threading.Thread(target=self._run_thread, name="fake-openai", daemon=True)
+        self._thread.start()
+        self._started.wait()
+        return self
+
+    def stop(self) -> None:
+        """열린 연결을 모두 정리한 뒤 스레드의 이벤트 루프를 멈추고 닫는다"""
+        if self._loop is None or self._thread is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+    async def _shutdown(self) -> None:
+        if self._server is not None:
+            self._server.close()
+        # keep-alive 로 대기 중인 연결 처리 태스크
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _run_thread(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self.start())
+        self._started.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """HTTP/1.1 keep-alive 연결 하나를 처리"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                _, path, _ = request_line.decode().split(" ", 2)
+                headers = {}
+                while True:
+                    line = (await reader.readline()).decode().strip()
+                    if not line:
+                        break
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                await self._dispatch(path.split("?")[0], json.loads(body or b"{}"), writer)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, path: str, body: dict[str, Any], writer: asyncio.StreamWriter) -> None:
+        endpoint = path.rsplit("/v1/", 1)[-1]
+        self.stats.requests[endpoint] = self.stats.requests.get(endpoint, 0) + 1
+
+        if self.config.rate_limit and self._random.random() < self.config.rate_limit:
+            self.stats.rate_limited += 1
+            self._write_json(writer, 429, {"error": {"message": "Rate limit reached (fake)", "type": "requests", "code": "rate_limit_exceeded"}}, {
+                "retry-after-ms": str(self.config.retry_after_ms),
+                "x-ratelimit-remaining-requests": "0",
+            })
+            return
+
+        if endpoint == "embeddings":
+            await self._embeddings(body, writer)
+        elif endpoint == "chat/completions":
+            await self._chat(body, writer)
+        else:
+            self._write_json(writer, 404, {"error": {"message": f"unknown endpoint {path}"}})
+
+    async def _embeddings(self, body: dict[str, Any], writer: asyncio.StreamWriter) -> None:
+        inputs = body.get("input")
+        if isinstance(inputs, str) or (isinstance(inputs, list) and inputs and isinstance(inputs[0], int)):
+            inputs = [inputs]
+        await asyncio.sleep(self.config.embedding_latency)
+        vectors = [fake_embedding(item) for item in inputs or []]
+        if body.get("encoding_format") == "base64":
+            # openai SDK 는 형식을 지정하지 않으면 base64(float32) 로 요청한다
+            vectors = [base64.b64encode(np.asarray(v, dtype=np.float32).tobytes()).decode() for v in vectors]
+        data = [{"object": "embedding", "index": i, "embedding": vector} for i, vector in enumerate(vectors)]
+        tokens = sum(len(item) for item in inputs or [])
+        self._write_json(writer, 200, {
+            "object": "list",
+            "data": data,
+            "model": body.get("model"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        })
+
+    async def _chat(self, body: dict[str, Any], writer: asyncio.StreamWriter) -> None:
+        messages = body.get("messages") or []
+        if (body.get("response_format") or {}).get("type") == "json_object":
+            content = json.dumps(self._classify(messages), ensure_ascii=False)
+        else:
+            content = self.config.answer
+        prompt_tokens = sum(count_tokens(str(m.get("content", ""))) for m in messages)
+        completion_tokens = count_tokens(content)
+
+        if body.get("stream"):
+            usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens}
+            await self._stream(body, content, writer, usage if (body.get("stream_options") or {}).get("include_usage") else None)
+            return
+
+        await asyncio.sleep(self.config.chat_latency + self.config.per_token_latency * completion_tokens)
+        self._write_json(writer, 200, {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens},
+        })
+
+    def _classify(self, messages: list[dict[str, Any]]) -> dict[str, Any]:
+        question = str(messages[-1].get("content", "")) if messages else ""
+        return self.classifier.classify(question.replace("분류할 질문:", "").strip(' "')) or DEFAULT_CLASSIFICATION
+
+    async def _stream(self, body: dict[str, Any], content: str, writer: asyncio.StreamWriter, usage: Optional[dict[str, int]] = None) -> None:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"content-type: text/event-stream\r\n"
+            b"transfer-encoding: chunked\r\n\r\n"
+        )
+        await asyncio.sleep(self.config.chat_latency)
+        for piece in content.split(" "):
+            await asyncio.sleep(self.config.per_token_latency)
+            chunk = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": body.get("model"),
+                "choices": [{"index": 0, "delta": {"content": piece + " "}, "finish_reason": None}],
+            }
+            self._write_chunk(writer, f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode())
+            await writer.drain()
+        if usage is not None:
+            # stream_options.include_usage - choices 가 비어 있는 마지막 청크에 usage
+            chunk = {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": int(time.time()), "model": body.get("model"), "choices": [], "usage": usage}
+            self._write_chunk(writer, f"data: {json.dumps(chunk)}\n\n".encode())
+        self._write_chunk(writer, b"data: [DONE]\n\n")
+        writer.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, writer: asyncio.StreamWriter, data: bytes) -> None:
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    def _write_json(self, writer: asyncio.StreamWriter, status: int, payload: dict[str, Any], headers: Optional[dict[str, str]] = None) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode()
+        reason = {200: "OK", 404: "Not Found", 429: "Too Many Requests"}[status]
+        lines = [f"HTTP/1.1 {status} {reason}", "content-type: application/json", f"content-length: {len(data)}"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + data)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="로컬 OpenAI 호환 가짜 서버")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--chat-latency", type=float, default=0.3)
+    parser.add_argument("--token-latency", type=float, default=0.01)
+    parser.add_argument("--embedding-latency", type=float, default=0.03)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="429 를 돌려줄 확률 (0~1)")
+    args = parser.parse_args(argv)
+
+    config = FakeServerConfig(args.chat_latency, args.token_latency, args.embedding_latency, args.rate_limit)
+    server = FakeOpenAIServer(config, port=args.port)
+
+    async def serve() -> None:
+        await server.start()
+        print(f"fake OpenAI server: {server.base_url}")
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
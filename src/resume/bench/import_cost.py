@@ -0,0 +1,68 @@
+"""import / 기동 비용 측정 스크립트
+
+새 파이썬 프로세스에서 `-X importtime` 으로 모듈을 import 해 최상위 패키지별 누적 import 시간을 보고한다.
+
+    python -m resume.bench.import_cost resume.resume_chatbot resume.app --top 15
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Optional, Sequence
+
+
+def measure(module: str) -> dict:
+    """모듈 하나의 import 벽시계 시간과 최상위 패키지별 import 비용(ms)"""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env,
+    )
+    wall = time.perf_counter() - start
+
+    per_package: dict[str, float] = defaultdict(float)
+    for line in proc.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        try:
+            self_us, _, name = line[len("import time:"):].split("|")
+        except ValueError:
+            continue
+        per_package[name.strip().split(".")[0]] += int(self_us.strip()) / 1000
+
+    return {
+        "module": module,
+        "ok": proc.returncode == 0,
+        "error": proc.stderr.strip().splitlines()[-1] if proc.returncode else None,
+        "wall_ms": wall * 1000,
+        "packages_ms": dict(sorted(per_package.items(), key=lambda kv: kv[1], reverse=True)),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="모듈별 import 비용 측정")
+    parser.add_argument("modules", nargs="*", default=["resume.resume_chatbot", "resume.app"])
+    parser.add_argument("--top", type=int, default=10, help="출력할 최상위 패키지 수")
+    parser.add_argument("--json", dest="json_path", help="결과를 JSON 으로 저장할 경로")
+    args = parser.parse_args(argv)
+
+    results = [measure(module) for module in args.modules]
+    for r in results:
+        status = "ok" if r["ok"] else f"실패: {r['error']}"
+        print(f"{r['module']}: {r['wall_ms']:.0f}ms (프로세스 기동 포함, {status})")
+        for package, ms in list(r["packages_ms"].items())[:args.top]:
+            print(f"    {package:<28} {ms:8.1f}ms")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,310 @@
+"""ResumeChatbot 전체 파이프라인 부하 테스트 (네트워크/외부 서비스 없이)
+
+- OpenAI: 별도 스레드의 FakeOpenAIServer (엔드포인트별 지연, 스트리밍, 429 주입) - 실제 SDK/연결 풀/limiter 를 그대로 거친다
+- Redis: fakeredis (기본) 또는 --redis-url 로 지정한 로컬 Redis
+- 원본 문서: 임시 디렉토리에 만든 합성 이력서 (db/chroma 등 상대 경로도 임시 디렉토리 아래에 생성)
+
+N 개의 가상 세션이 동시에 질문(일부는 반복)을 보내고, 단계별 p50/p95/p99, 처리량, 이벤트 루프 지연을 JSON 으로 남긴다.
+--baseline 으로 이전 결과를 주면 p95 변화량을 함께 출력한다.
+
+    python -m resume.bench.load_test --sessions 20 --requests 10 --json load.json
+    python -m resume.bench.load_test --stream --rate-limit 0.05 --baseline load.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Any, Optional, Sequence
+
+from resume.bench.fake_openai_server import FakeOpenAIServer, FakeServerConfig
+
+STAGES = ["cache_lookup", "embed", "gate", "classify", "retrieve_cache", "prefetch", "semantic", "retrieve", "persona", "refine", "history_save"]
+
+QUESTIONS = [
+    "최근 프로젝트가 뭐예요?",
+    "처음 참여한 프로젝트는 무엇인가요?",
+    "기술스택이 뭐예요?",
+    "Kafka 를 써본 경험이 있나요?",
+    "결제 시스템 프로젝트에서 맡은 역할은?",
+    "협업하면서 어려웠던 점이 있었나요?",
+    "자기소개 부탁드려요.",
+    "장애를 해결한 경험을 알려주세요.",
+    "가장 자신 있는 언어는 무엇인가요?",
+    "최근에 공부한 것은 무엇인가요?",
+]
+
+PROJECTS = {"projects": [
+    {
+        "name": "결제 시스템 재구축",
+        "company": "페이컴퍼니",
+        "role": ["백엔드 개발", "설계"],
+        "period": {"from": "2021.03", "to": "2022.02"},
+        "tech_stack": [{"name": "Kotlin"}, {"name": "Spring"}, {"name": "Kafka"}],
+        "description": "레거시 결제 API 를 이벤트 기반 구조로 전환하고 정산 배치를 분리했다.",
+    },
+    {
+        "name": "인증 서비스 트래픽 대응",
+        "company": "페이컴퍼니",
+        "role": ["백엔드 개발"],
+        "period": {"from": "2022.03", "to": "2023.01"},
+        "tech_stack": [{"name": "Go"}, {"name": "Redis"}, {"name": "gRPC"}],
+        "description": "로그인 트래픽 급증에 대비해 토큰 검증을 캐시하고 장애 대응 절차를 정리했다.",
+    },
+    {
+        "name": "이력서 챗봇",
+        "company": "개인 프로젝트",
+        "role": "1인 개발",
+        "period": {"from": "2024.05", "to": "ING"},
+        "tech_stack": [{"name": "Python"}, {"name": "OpenAI"}, {"name": "Chroma"}],
+        "description": "이력서 문서를 검색해 면접 질문에 답하는 RAG 챗봇을 만들었다.",
+    },
+]}
+
+QNA = [
+    {"question": "협업하면서 어려웠던 점이 있었나요?", "answer": "일정이 다른 팀과 API 계약을 먼저 정하고 목업으로 병렬 개발했습니다.", "topic_tags": ["협업"]},
+    {"question": "최근에 공부한 것은 무엇인가요?", "answer": "검색 품질을 높이기 위해 BM25 와 벡터 검색 결합을 공부했습니다.", "topic_tags": ["학습 경험"]},
+    {"question": "장애를 해결한 경험을 알려주세요.", "answer": "Kafka 컨슈머 지연으로 정산이 밀린 장애를 파티션 재분배로 해결했습니다.", "topic_tags": ["문제 해결"]},
+]
+
+INTRODUCE = (
+    "안녕하세요, 백엔드 개발자입니다. 결제와 인증처럼 트래픽이 많은 서비스를 주로 개발했습니다.\n"
+    "Kotlin, Go, Python 을 사용하며 가장 자신 있는 언어는 Kotlin 입니다.\n"
+    "운영 지표를 먼저 정하고 개선하는 방식을 선호합니다."
+)
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """밀리초 단위 p50/p95/p99/mean/max"""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000
+
+    return {
+        "count": len(ordered),
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "mean_ms": statistics.mean(ordered) * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def write_corpus(directory: str) -> dict[str, Any]:
+    """합성 이력서 원본을 쓰고 ResumeChatbot 생성 인자를 반환"""
+    paths = {name: os.path.join(directory, name) for name in ("projects.json", "qna.json", "introduce.txt")}
+    with open(paths["projects.json"], "w", encoding="utf-8") as f:
+        json.dump(PROJECTS, f, ensure_ascii=False)
+    with open(paths["qna.json"], "w", encoding="utf-8") as f:
+        json.dump(QNA, f, ensure_ascii=False)
+    with open(paths["introduce.txt"], "w", encoding="utf-8") as f:
+        f.write(INTRODUCE)
+    return dict(
+        gcs_bucket=None,
+        gcs_projects_path=paths["projects.json"],
+        gcs_qna_path=paths["qna.json"],
+        gcs_introduce_path=paths["introduce.txt"],
+        use_gcs=False,
+    )
+
+
+def use_redis(redis_url: Optional[str]) -> str:
+    """--redis-url 이 있으면 그 Redis 를, 없으면 프로세스 내 fakeredis 를 CacheStore 공유 풀로 지정"""
+    import redis.asyncio as aioredis
+    from resume.db.cache_store import CacheStore
+
+    if redis_url:
+        CacheStore.use_pool(aioredis.ConnectionPool.from_url(redis_url, decode_responses=True))
+        return redis_url
+    import fakeredis
+    CacheStore.use_pool(aioredis.ConnectionPool(
+        connection_class=getattr(fakeredis.aioredis, "FakeAsyncRedisConnection", fakeredis.aioredis.FakeConnection),
+        server=fakeredis.FakeServer(),
+        decode_responses=True,
+    ))
+    return "fakeredis"
+
+
+class LoopLagMonitor:
+    """interval 마다 깨어나 예정보다 늦게 깨어난 시간(이벤트 루프 지연)을 기록"""
+    def __init__(self, interval: float = 0.01) -> None:
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - start - self.interval))
+
+
+async def run_session(bot: Any, session: int, questions: list[str], stream: bool, think_time: float, latencies: list[float], errors: list[str]) -> None:
+    session_id = f"load-{session}"
+    history: list = []
+    for question in questions:
+        start = time.perf_counter()
+        try:
+            if stream:
+                answer = ""
+                async for answer in bot.chat_stream(question, history, session_id):
+                    pass
+            else:
+                answer = await bot.chat(question, history, session_id)
+            latencies.append(time.perf_counter() - start)
+            history.append((question, answer))
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+        if think_time:
+            await asyncio.sleep(think_time)
+
+
+async def drive(bot: Any, args: argparse.Namespace) -> dict[str, Any]:
+    timings: dict[str, list[float]] = {stage: [] for stage in STAGES}
+    bot.timing_listeners.append(lambda stage, seconds: timings.setdefault(stage, []).append(seconds))
+
+    # 세션마다 질문 풀에서 뽑아 반복 질문(캐시 적중/동시 중복)이 섞이게 한다
+    rng = random.Random(args.seed)
+    plans = [[rng.choice(QUESTIONS) for _ in range(args.requests)] for _ in range(args.sessions)]
+
+    monitor = LoopLagMonitor()
+    monitor.start()
+    latencies: list[float] = []
+    errors: list[str] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        run_session(bot, i, plan, args.stream, args.think_time, latencies, errors) for i, plan in enumerate(plans)
+    ))
+    elapsed = time.perf_counter() - start
+    await monitor.stop()
+
+    return {
+        "elapsed_s": elapsed,
+        "requests": len(latencies) + len(errors),
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "errors": len(errors),
+        "error_samples": errors[:5],
+        "end_to_end": percentiles(latencies),
+        "stages": {stage: percentiles(samples) for stage, samples in timings.items()},
+        "loop_lag": percentiles(monitor.samples),
+    }
+
+
+def compare(result: dict[str, Any], baseline: dict[str, Any]) -> list[str]:
+    """같은 항목의 p95 변화량 (baseline 대비)"""
+    lines = []
+    pairs = [("end_to_end", result["end_to_end"], baseline.get("end_to_end", {}))]
+    pairs += [(stage, stats, baseline.get("stages", {}).get(stage, {})) for stage, stats in result["stages"].items()]
+    for name, now, before in pairs:
+        if "p95_ms" in now and "p95_ms" in before:
+            delta = now["p95_ms"] - before["p95_ms"]
+            ratio = delta / before["p95_ms"] * 100 if before["p95_ms"] else 0.0
+            lines.append(f"{name:<14} p95 {before['p95_ms']:8.1f}ms → {now['p95_ms']:8.1f}ms ({ratio:+.1f}%)")
+    return lines
+
+
+def report(result: dict[str, Any]) -> None:
+    print(
+        f"requests={result['requests']} errors={result['errors']} elapsed={result['elapsed_s']:.2f}s "
+        f"throughput={result['throughput_rps']:.1f} req/s"
+    )
+    rows = [("end_to_end", result["end_to_end"]), ("loop_lag", result["loop_lag"])] + list(result["stages"].items())
+    for name, stats in rows:
+        if stats.get("count"):
+            print(
+                f"{name:<14} n={stats['count']:<5} p50={stats['p50_ms']:8.1f}ms p95={stats['p95_ms']:8.1f}ms "
+                f"p99={stats['p99_ms']:8.1f}ms max={stats['max_ms']:8.1f}ms"
+            )
+    print(f"answer cache: {result['answer_cache']}  stage cache: {result['stage_cache']}  classifier: {result['classifier']}")
+    print(f"fake server: {result['server']}  limiter: {result['limiter']}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="가짜 OpenAI 서버 + fakeredis 로 ResumeChatbot 파이프라인 부하 테스트")
+    parser.add_argument("--sessions", type=int, default=10, help="동시 세션 수")
+    parser.add_argument("--requests", type=int, default=10, help="세션당 질문 수")
+    parser.add_argument("--think-time", type=float, default=0.0, help="세션 내 질문 사이 대기 (초)")
+    parser.add_argument("--stream", action="store_true", help="chat 대신 chat_stream 사용")
+    parser.add_argument("--answer-mode", choices=["two_stage", "single_pass"], default="two_stage")
+    parser.add_argument("--chat-latency", type=float, default=0.3)
+    parser.add_argument("--token-latency", type=float, default=0.01)
+    parser.add_argument("--embedding-latency", type=float, default=0.03)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="가짜 서버가 429 를 돌려줄 확률 (0~1)")
+    parser.add_argument("--max-concurrent", type=int, default=0, help="AdmissionController 동시 파이프라인 수 (0 이면 제한 없음)")
+    parser.add_argument("--max-queue", type=int, default=32, help="AdmissionController 대기열 길이")
+    parser.add_argument("--redis-url", help="fakeredis 대신 사용할 Redis (예: redis://localhost:6379/15)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="결과를 JSON 으로 저장할 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    args = parser.parse_args(argv)
+
+    json_path = os.path.abspath(args.json_path) if args.json_path else None
+    baseline_path = os.path.abspath(args.baseline) if args.baseline else None
+
+    server = FakeOpenAIServer(FakeServerConfig(
+        chat_latency=args.chat_latency,
+        per_token_latency=args.token_latency,
+        embedding_latency=args.embedding_latency,
+        rate_limit=args.rate_limit,
+        seed=args.seed,
+    )).start_in_thread()
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+    os.environ["OPENAI_API_KEY"] = "fake-key"
+    redis_target = use_redis(args.redis_url)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # db/chroma, db/sources 같은 상대 경로가 저장소를 건드리지 않도록 임시 디렉토리에서 실행
+        os.chdir(tmp)
+        try:
+            from resume.admission import AdmissionController
+            from resume.llm_client import rate_limit_stats
+            from resume.resume_chatbot import ResumeChatbot
+
+            start = time.perf_counter()
+            bot = ResumeChatbot(**write_corpus(tmp), answer_mode=args.answer_mode, fast_startup=False,
+                                admission=AdmissionController(max_concurrent=args.max_concurrent, max_queue=args.max_queue))
+            startup = time.perf_counter() - start
+            result = asyncio.run(drive(bot, args))
+        finally:
+            os.chdir(cwd)
+            server.stop()
+
+    result.update({
+        "config": {k: v for k, v in vars(args).items() if k not in ("json_path", "baseline")} | {"redis": redis_target},
+        "startup_s": startup,
+        "answer_cache": dict(bot.answer_repository.stats) if hasattr(bot.answer_repository, "stats") else {},
+        "classifier": dict(bot.classifier.stats),
+        "stage_cache": dict(bot.stage_repository.stats),
+        "admission": dict(bot.admission.stats),
+        "server": {"requests": server.stats.requests, "rate_limited": server.stats.rate_limited},
+        "limiter": rate_limit_stats(),
+    })
+    report(result)
+
+    if baseline_path:
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            for line in compare(result, json.load(f)):
+                print(line)
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,53 @@
+"""네트워크 없이 파이프라인을 돌려보기 위한 AsyncOpenAI 대역 (벤치마크/하네스 전용)"""
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Optional
+
+from resume.utils.tokens import count_tokens
+
+DEFAULT_ANSWER = (
+    "저는 인증 서비스의 트래픽이 몰리는 상황에서 API 구조를 다시 설계한 경험이 있습니다. "
+    "Kafka 이벤트로 사용자 흐름을 비동기 처리하도록 바꿨고, 응답 지연을 크게 줄일 수 있었습니다. "
+    "이 과정에서 팀과 함께 운영 지표를 정하고 배포 과정을 자동화한 것이 기억에 남습니다."
+)
+
+DEFAULT_CLASSIFICATION = {
+    "category": "프로젝트 경험",
+    "time_condition": "none",
+    "filters": {"doc_type": "projects"},
+}
+
+
+class StubAsyncOpenAI:
+    """chat.completions.create 만 흉내내는 대역 - 지연 시간은 고정값 + 출력 토큰 비례"""
+    def __init__(self, latency: float = 0.3, per_token_latency: float = 0.01, answer: str = DEFAULT_ANSWER, classification: Optional[dict[str, Any]] = None) -> None:
+        self.latency = latency
+        self.per_token_latency = per_token_latency
+        self.answer = answer
+        self.classification = classification or DEFAULT_CLASSIFICATION
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, model: str, messages: list[dict[str, str]], stream: bool = False, response_format: Optional[dict] = None, **kwargs: Any) -> Any:
+        if response_format and response_format.get("type") == "json_object":
+            content = json.dumps(self.classification, ensure_ascii=False)
+        else:
+            content = self.answer
+
+        prompt_tokens = sum(count_tokens(m["content"]) for m in messages)
+        completion_tokens = count_tokens(content)
+        usage = SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, total_tokens=prompt_tokens + completion_tokens)
+
+        if stream:
+            return self._stream(content)
+
+        await asyncio.sleep(self.latency + self.per_token_latency * completion_tokens)
+        message = SimpleNamespace(role="assistant", content=content)
+        return SimpleNamespace(model=model, choices=[SimpleNamespace(index=0, message=message, finish_reason="stop")], usage=usage)
+
+    async def _stream(self, content: str) -> AsyncIterator[Any]:
+        await asyncio.sleep(self.latency)
+        for piece in content.split(" "):
+            await asyncio.sleep(self.per_token_latency)
+            delta = SimpleNamespace(content=piece + " ")
+            yield SimpleNamespace(choices=[SimpleNamespace(index=0, delta=delta, finish_reason=None)])
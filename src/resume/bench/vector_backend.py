@@ -0,0 +1,128 @@
+"""벡터 검색 백엔드(chroma / numpy) 지연 시간·메모리 비교
+
+이력서 규모(수십 개 문서)의 임의 임베딩으로 두 백엔드를 만들고 같은 질의 벡터로 top-k 검색을 반복한다.
+Chroma 는 앱과 같은 langchain 래퍼(similarity_search_by_vector)를 거쳐 측정한다.
+Chroma 는 메타데이터 $regex 필터를 지원하지 않으므로 regex 필터 항목은 numpy 만 측정한다.
+
+    python -m resume.bench.vector_backend --docs 60 --queries 500 --json backend.json
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, Optional, Sequence
+
+import numpy as np
+
+from resume.db.numpy_index import NumpyVectorIndex
+
+FILTERS = {
+    "none": None,
+    "doc_type": {"doc_type": "projects"},
+    "regex": {"doc_type": "projects", "tech_stack": {"$regex": ".*kafka.*"}},
+}
+
+
+def rss_mb() -> float:
+    """현재 프로세스 RSS (MB, Linux /proc 기준 - 없으면 최대 RSS)"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def make_corpus(n: int, dim: int, seed: int = 0) -> tuple[list[str], list[str], list[dict[str, Any]], np.ndarray]:
+    rng = np.random.default_rng(seed)
+    doc_types = ["projects", "qna", "summary"]
+    stacks = ["Kafka, Spring", "Python, FastAPI", "React, TypeScript", "Go, gRPC"]
+    ids = [f"doc-{i}" for i in range(n)]
+    docs = [f"문서 {i}" for i in range(n)]
+    metas = [{"doc_type": doc_types[i % 3], "tech_stack": stacks[i % len(stacks)]} for i in range(n)]
+    return ids, docs, metas, rng.standard_normal((n, dim)).astype(np.float32)
+
+
+def measure(search: Callable[[list[float]], Any], queries: np.ndarray) -> dict[str, float]:
+    latencies = []
+    for q in queries:
+        start = time.perf_counter()
+        search(q.tolist())
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+def bench_numpy(corpus: tuple, queries: np.ndarray, k: int, directory: str) -> dict[str, Any]:
+    ids, docs, metas, vectors = corpus
+    before = rss_mb()
+    NumpyVectorIndex.build(ids, docs, metas, vectors).save(directory, "bench")
+    index = NumpyVectorIndex.load(directory, "bench")
+    result: dict[str, Any] = {"backend": "numpy", "matrix_bytes": int(index.vectors.nbytes)}
+    for name, filters in FILTERS.items():
+        result[name] = measure(lambda q: index.search(q, k, filters), queries)
+    result["rss_delta_mb"] = rss_mb() - before
+    return result
+
+
+def bench_chroma(corpus: tuple, queries: np.ndarray, k: int, directory: str) -> Optional[dict[str, Any]]:
+    try:
+        import chromadb
+        from langchain_community.vectorstores import Chroma
+    except ImportError as e:
+        print(f"chroma 측정 생략 (import 실패: {e})")
+        return None
+
+    ids, docs, metas, vectors = corpus
+    before = rss_mb()
+    client = chromadb.PersistentClient(path=directory)
+    client.get_or_create_collection("bench").add(ids=ids, embeddings=vectors.tolist(), documents=docs, metadatas=metas)
+    store = Chroma(client=client, collection_name="bench")
+    result: dict[str, Any] = {"backend": "chroma"}
+    for name, filters in FILTERS.items():
+        if name == "regex":
+            continue
+        result[name] = measure(lambda q: store.similarity_search_by_vector(q, k=k, filter=filters), queries)
+    result["rss_delta_mb"] = rss_mb() - before
+    return result
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="chroma / numpy 벡터 검색 백엔드 비교")
+    parser.add_argument("--docs", type=int, default=60, help="문서 수")
+    parser.add_argument("--dim", type=int, default=1536, help="임베딩 차원 (text-embedding-ada-002 / 3-small 기준)")
+    parser.add_argument("--queries", type=int, default=500, help="측정할 질의 수")
+    parser.add_argument("-k", type=int, default=5, help="top-k")
+    parser.add_argument("--json", dest="json_path", help="결과를 JSON 으로 저장할 경로")
+    args = parser.parse_args(argv)
+
+    corpus = make_corpus(args.docs, args.dim)
+    queries = np.random.default_rng(1).standard_normal((args.queries, args.dim)).astype(np.float32)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        results.append(bench_numpy(corpus, queries, args.k, os.path.join(tmp, "numpy")))
+        chroma = bench_chroma(corpus, queries, args.k, os.path.join(tmp, "chroma"))
+        if chroma:
+            results.append(chroma)
+
+    for r in results:
+        timings = " ".join(f"{name}: p50={r[name]['p50_ms']:.3f}ms p99={r[name]['p99_ms']:.3f}ms" for name in FILTERS if name in r)
+        print(f"{r['backend']:<7} rss+{r['rss_delta_mb']:.1f}MB  {timings}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
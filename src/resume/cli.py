@@ -0,0 +1,121 @@
+"""resume 명령행 도구
+
+    resume index [--local] [--rebuild]   # 벡터 인덱스를 미리 빌드 (Docker 이미지 빌드 단계 등)
+    resume warmup [--local] [--faq PATH] # 인덱싱 후 자주 묻는 질문의 답변을 미리 캐시에 저장
+    resume invalidate-cache              # 모든 인스턴스의 답변 캐시를 한 번에 무효화 (프롬프트 변경 등)
+"""
+import argparse
+import os
+from typing import Optional, Sequence
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def source_kwargs(use_gcs: bool) -> dict:
+    """app.py 와 같은 환경변수로 원본 문서 위치를 결정 (--local 이면 패키지의 me/ 디렉토리)"""
+    if use_gcs:
+        return dict(
+            gcs_bucket=os.getenv('GCS_BUCKET'),
+            gcs_projects_path=os.getenv('GCS_PROJECTS_PATH', 'projects.json'),
+            gcs_qna_path=os.getenv('GCS_QNA_PATH', 'qna.json'),
+            gcs_introduce_path=os.getenv('GCS_INTRODUCE_PATH', 'introduce.txt'),
+            use_gcs=True,
+        )
+    return dict(
+        gcs_bucket=os.getenv('GCS_BUCKET'),
+        gcs_projects_path=os.path.join(BASE_DIR, "me", "projects.json"),
+        gcs_qna_path=os.path.join(BASE_DIR, "me", "qna.json"),
+        gcs_introduce_path=os.path.join(BASE_DIR, "me", "introduce.txt"),
+        use_gcs=False,
+    )
+
+
+def _greet(args: argparse.Namespace) -> int:
+    print(f"Hello, {args.name}!")
+    return 0
+
+
+def _index(args: argparse.Namespace) -> int:
+    import asyncio
+    from dotenv import load_dotenv
+    from resume.db.indexer import EmbeddingIndexer
+    from resume.db.vector_store import VectorStore
+
+    load_dotenv(override=True)
+    from langchain_openai import OpenAIEmbeddings
+    indexer = EmbeddingIndexer(
+        OpenAIEmbeddings(),
+        max_batch_tokens=args.batch_tokens,
+        max_concurrency=args.concurrency,
+    )
+    store = asyncio.run(VectorStore(**source_kwargs(not args.local), indexer=indexer).sync(rebuild=args.rebuild))
+    print(f"인덱스 준비 완료 (index_version={store.index_version})")
+    return 0
+
+
+def _warmup(args: argparse.Namespace) -> int:
+    import asyncio
+    from dotenv import load_dotenv
+
+    load_dotenv(override=True)
+    from resume.resume_chatbot import ResumeChatbot
+    from resume.warmup import collect_questions, warm_answers
+
+    bot = ResumeChatbot(**source_kwargs(not args.local), fast_startup=False)
+    questions = collect_questions(bot, args.faq)
+    print(f"warm-up 대상 질문 {len(questions)}개 (index_version={bot.retriever.store.index_version})")
+    stats = asyncio.run(warm_answers(bot, questions, concurrency=args.concurrency, ttl=args.ttl))
+    print(f"warm-up 완료: {stats}")
+    return 0 if stats["failed"] == 0 else 1
+
+
+def _invalidate_cache(args: argparse.Namespace) -> int:
+    import asyncio
+    from dotenv import load_dotenv
+
+    load_dotenv(override=True)
+    from resume.db.cache_store import CacheStore
+    from resume.repository.answer_repository import GENERATION_KEY
+
+    async def bump() -> int:
+        store = CacheStore()
+        try:
+            return await store.incr(GENERATION_KEY)
+        finally:
+            await store.close()
+
+    print(f"답변 캐시 무효화 완료 (generation={asyncio.run(bump())})")
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="resume")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    greet = subparsers.add_parser("greet", help="인사 출력 (설치 확인용)")
+    greet.add_argument("name", nargs="?", default="World")
+    greet.set_defaults(func=_greet)
+
+    index = subparsers.add_parser("index", help="벡터 인덱스를 증분 빌드")
+    index.add_argument("--local", action="store_true", help="GCS 대신 패키지 내 me/ 디렉토리의 파일 사용")
+    index.add_argument("--rebuild", action="store_true", help="기존 인덱스를 비우고 전체 재임베딩")
+    index.add_argument("--batch-tokens", type=int, default=8000, help="임베딩 배치당 최대 토큰 수")
+    index.add_argument("--concurrency", type=int, default=4, help="동시에 보낼 임베딩 요청 수")
+    index.set_defaults(func=_index)
+
+    warmup = subparsers.add_parser("warmup", help="qna.json/FAQ 질문의 답변을 미리 생성해 캐시에 저장")
+    warmup.add_argument("--local", action="store_true", help="GCS 대신 패키지 내 me/ 디렉토리의 파일 사용")
+    warmup.add_argument("--faq", default=None, help="추가 FAQ 질문 파일 (기본값: FAQ_PATH 환경변수)")
+    warmup.add_argument("--concurrency", type=int, default=4, help="동시에 생성할 답변 수")
+    warmup.add_argument("--ttl", type=int, default=None, help="미리 만든 답변의 TTL(초, 기본값: WARMUP_TTL 또는 7일)")
+    warmup.set_defaults(func=_warmup)
+
+    invalidate = subparsers.add_parser("invalidate-cache", help="답변 캐시 세대를 올려 저장된 답변을 모두 무효화")
+    invalidate.set_defaults(func=_invalidate_cache)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,18 +1,259 @@
+import asyncio
 import json
 import os
-from typing import Any, Union
+import time
+import uuid
+from typing import Any, Optional, Sequence, Union
 import redis
+import redis.asyncio as aioredis
+
+from resume.db.local_cache import MISSING, NEGATIVE, LocalCache
+
+# Redis 장애로 간주하는 예외 (이때는 L1 만으로 동작)
+REDIS_ERRORS = (redis.exceptions.RedisError, OSError)
 
 
 class CacheStore:
+    """L1(in-process LRU) + L2(redis.asyncio) 2단 캐시 저장소
+
+    - 인스턴스들은 Redis 커넥션 풀을 공유한다.
+    - L1 은 짧은 TTL 과 pub/sub 무효화로 다른 인스턴스의 저장과 일관성을 맞춘다.
+    - Redis 에 연결할 수 없으면 retry_after 초 동안 L1 만으로 동작한다.
+    """
+    _pool: Optional[aioredis.ConnectionPool] = None
+    INVALIDATION_CHANNEL = "cache:invalidate"
+    POLL_INTERVAL = 0.5  # 무효화 채널 대기 단위(초) - socket_timeout 보다 짧아야 한다
+
+    def __init__(self, l1: Optional[LocalCache] = None) -> None:
+        self.redis = aioredis.Redis(connection_pool=self._get_pool())
+        self.l1 = l1 or LocalCache(
+            max_size=int(os.getenv('L1_CACHE_SIZE', 1024)),
+            ttl=float(os.getenv('L1_CACHE_TTL', 30)),
+            negative_ttl=float(os.getenv('L1_NEGATIVE_TTL', 5)),
+        )
+        self.stats = {"l1_hit": 0, "l1_negative_hit": 0, "l2_hit": 0, "miss": 0, "l2_error": 0}
+        self.instance_id = uuid.uuid4().hex
+        self.retry_after = float(os.getenv('REDIS_RETRY_AFTER', 5))
+        self._down_until = 0.0
+        self._subscriber: Optional[asyncio.Task] = None
+
+    @classmethod
+    def _get_pool(cls) -> aioredis.ConnectionPool:
+        if cls._pool is None:
+            cls._pool = aioredis.ConnectionPool(
+                host=os.getenv('REDIS_HOST'),
+                port=int(os.getenv('REDIS_PORT', 6379)),
+                max_connections=int(os.getenv('REDIS_MAX_CONNECTIONS', 50)),
+                socket_connect_timeout=float(os.getenv('REDIS_CONNECT_TIMEOUT', 1)),
+                # 연결은 되지만 응답이 없는 Redis 도 장애로 보고 L1 만으로 전환하도록 명령에도 제한 시간을 둔다
+                socket_timeout=float(os.getenv('REDIS_SOCKET_TIMEOUT', 1)),
+                decode_responses=True,
+            )
+        return cls._pool
+
+    @classmethod
+    def use_pool(cls, pool: aioredis.ConnectionPool) -> None:
+        """공유 커넥션 풀을 직접 지정 (벤치마크에서 fakeredis 풀을 쓰는 경우 등, CacheStore 생성 전에 호출)"""
+        cls._pool = pool
+
+    @property
+    def available(self) -> bool:
+        """최근 Redis 장애 이후 retry_after 가 지났는지"""
+        return time.monotonic() >= self._down_until
+
+    def mark_down(self, error: Exception) -> None:
+        self.stats["l2_error"] += 1
+        if self.available:
+            print(f"Redis 연결 실패, {self.retry_after:.0f}초 동안 L1 캐시만 사용합니다: {error}")
+        self._down_until = time.monotonic() + self.retry_after
+
+    async def save(self, key: str, ttl: int, data: Any, index_sets: Sequence[str] = ()) -> None:
+        """key 에 저장하고, index_sets 가 있으면 각 set 에 key 를 같은 왕복으로 등록 (보조 인덱스)"""
+        self._ensure_subscriber()
+        encoded = self.encode(data)
+        if not self.available:
+            # Redis 가 없는 동안은 L1 이 원본 역할
+            self.l1.set(key, encoded, ttl)
+            return
+
+        self.l1.set(key, encoded)
+        try:
+            async with self.pipeline() as pipe:
+                pipe.setex(key, ttl, encoded)
+                for index_set in index_sets:
+                    pipe.sadd(index_set, key)
+                    # set 의 TTL 은 멤버 중 가장 긴 TTL 을 따른다 (새 set 이면 설정, 있으면 늘리기만 함 - Redis 7+)
+                    pipe.expire(index_set, ttl, nx=True)
+                    pipe.expire(index_set, ttl, gt=True)
+                pipe.publish(self.INVALIDATION_CHANNEL, f"{self.instance_id}:{key}")
+                await pipe.execute()
+        except REDIS_ERRORS as e:
+            self.mark_down(e)
+            self.l1.set(key, encoded, ttl)
+
+    async def get(self, key: str) -> Union[list[Any], dict[str, Any]]:
+        self._ensure_subscriber()
+        cached = self.l1.get(key)
+        if cached is NEGATIVE:
+            self.stats["l1_negative_hit"] += 1
+            return self.decode(None)
+        if cached is not MISSING:
+            self.stats["l1_hit"] += 1
+            return self.decode(cached)
+
+        if not self.available:
+            self.stats["miss"] += 1
+            return self.decode(None)
+        try:
+            data = await self.redis.get(key)
+        except REDIS_ERRORS as e:
+            self.mark_down(e)
+            self.stats["miss"] += 1
+            return self.decode(None)
+
+        if data is None:
+            self.l1.set_missing(key)
+            self.stats["miss"] += 1
+        else:
+            self.l1.set(key, data)
+            self.stats["l2_hit"] += 1
+        return self.decode(data)
+
+    async def get_many(self, keys: Sequence[str]) -> list[Any]:
+        """여러 키를 L1 확인 후 남은 것만 MGET 한 번으로 조회 (없는 키는 decode(None))"""
+        self._ensure_subscriber()
+        results: list[Any] = [None] * len(keys)
+        pending: list[int] = []
+        for i, key in enumerate(keys):
+            cached = self.l1.get(key)
+            if cached is NEGATIVE:
+                self.stats["l1_negative_hit"] += 1
+            elif cached is not MISSING:
+                self.stats["l1_hit"] += 1
+                results[i] = cached
+            else:
+                pending.append(i)
+
+        if pending and self.available:
+            try:
+                values = await self.redis.mget([keys[i] for i in pending])
+            except REDIS_ERRORS as e:
+                self.mark_down(e)
+                values = [None] * len(pending)
+            for i, data in zip(pending, values):
+                if data is None:
+                    self.l1.set_missing(keys[i])
+                    self.stats["miss"] += 1
+                else:
+                    self.l1.set(keys[i], data)
+                    self.stats["l2_hit"] += 1
+                results[i] = data
+        else:
+            self.stats["miss"] += len(pending)
+        return [self.decode(data) for data in results]
+
+    async def set_members(self, key: str) -> list[str]:
+        """보조 인덱스 set 의 멤버 (Redis 장애 중에는 빈 목록)"""
+        if not self.available:
+            return []
+        try:
+            return sorted(await self.redis.smembers(key))
+        except REDIS_ERRORS as e:
+            self.mark_down(e)
+            return []
+
+    async def get_counter(self, key: str) -> Optional[int]:
+        """INCR 로 올리는 정수 카운터 값 (없으면 0, Redis 장애면 None)"""
+        if not self.available:
+            return None
+        try:
+            return int(await self.redis.get(key) or 0)
+        except REDIS_ERRORS as e:
+            self.mark_down(e)
+            return None
+
+    async def incr(self, key: str) -> int:
+        return int(await self.redis.incr(key))
+
+    def hit_ratios(self) -> dict[str, float]:
+        """조회 대비 계층별 적중 비율"""
+        lookups = self.stats["l1_hit"] + self.stats["l1_negative_hit"] + self.stats["l2_hit"] + self.stats["miss"]
+        if not lookups:
+            return {"l1": 0.0, "l2": 0.0, "overall": 0.0}
+        return {
+            "l1": self.stats["l1_hit"] / lookups,
+            "l2": self.stats["l2_hit"] / lookups,
+            "overall": (self.stats["l1_hit"] + self.stats["l2_hit"]) / lookups,
+        }
+
+    def _ensure_subscriber(self) -> None:
+        if self._subscriber is not None and not self._subscriber.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._subscriber = loop.create_task(self._listen_invalidations())
+
+    async def _listen_invalidations(self) -> None:
+        """다른 인스턴스가 저장한 키를 L1 에서 제거"""
+        missed = False
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.INVALIDATION_CHANNEL)
+                if missed:
+                    # 구독이 끊긴 동안의 무효화 메시지는 놓쳤으므로 L1 을 비운다
+                    self.l1.clear()
+                    missed = False
+                while True:
+                    # 조용한 채널에서 socket_timeout 에 걸리지 않도록 짧게 나눠 기다린다
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=self.POLL_INTERVAL)
+                    if message is None:
+                        continue
+                    origin, _, key = message["data"].partition(":")
+                    if origin != self.instance_id:
+                        self.l1.delete(key)
+            except REDIS_ERRORS:
+                missed = True
+                await asyncio.sleep(self.retry_after)
+            finally:
+                await pubsub.aclose()
+
+    async def get_list(self, key: str, start: int = 0, end: int = -1) -> list[Any]:
+        return [self.decode(item) for item in await self.redis.lrange(key, start, end)]
+
+    def pipeline(self) -> aioredis.client.Pipeline:
+        """여러 명령을 한 번의 왕복으로 보내기 위한 pipeline (값은 encode/decode 로 직렬화)"""
+        return self.redis.pipeline(transaction=False)
+
+    @staticmethod
+    def encode(data: Any) -> str:
+        return json.dumps(data, ensure_ascii=False) # 한글 깨지지 않게 설정 
+
+    @staticmethod
+    def decode(data: Optional[str]) -> Any:
+        return json.loads(data) if data else []
+
+    async def close(self) -> None:
+        if self._subscriber is not None:
+            self._subscriber.cancel()
+        await self.redis.aclose()
+
+
+class SyncCacheStore:
+    """스크립트용 동기 shim - CacheStore 와 같은 인터페이스를 블로킹 redis.Redis 로 제공"""
     def __init__(self) -> None:
-        self.redis = redis.Redis(host=os.getenv('REDIS_HOST'), port=os.getenv('REDIS_PORT'), decode_responses=True)
-    
+        self.redis = redis.Redis(host=os.getenv('REDIS_HOST'), port=int(os.getenv('REDIS_PORT', 6379)), decode_responses=True)
+
     def save(self, key: str, ttl: int, data: Any) -> None:
-        self.redis.setex(key, ttl, json.dumps(data, ensure_ascii=False)) # 한글 깨지지 않게 설정 
-    
+        self.redis.setex(key, ttl, CacheStore.encode(data))
+
     def get(self, key: str) -> Union[list[Any], dict[str, Any]]:
-        data = self.redis.get(key)
-        return json.loads(data) if data else [] 
-    
-    
+        return CacheStore.decode(self.redis.get(key))
+
+    def get_list(self, key: str, start: int = 0, end: int = -1) -> list[Any]:
+        return [CacheStore.decode(item) for item in self.redis.lrange(key, start, end)]
+
+    def close(self) -> None:
+        self.redis.close()
@@ -0,0 +1,75 @@
+import asyncio
+import random
+from typing import Any, Optional
+
+import openai
+
+from resume.utils.tokens import count_tokens
+
+
+class EmbeddingIndexer:
+    """문서를 토큰 예산 단위 배치로 나눠 동시에 임베딩하고, Chroma 컬렉션에 배치로 기록"""
+    def __init__(self, embeddings: Any, max_batch_tokens: int = 8000, max_concurrency: int = 4, max_retries: int = 5, write_batch_size: int = 64, retry_backoff: float = 1.0, encoding: Optional[str] = "cl100k_base") -> None:
+        self.embeddings = embeddings
+        self.max_batch_tokens = max_batch_tokens
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.write_batch_size = write_batch_size
+        self.retry_backoff = retry_backoff  # 첫 재시도 대기(초), 이후 두 배씩 (최대 30초)
+        self.encoding = encoding  # 임베딩 모델의 tiktoken 인코딩 (None 이면 글자 수 기반 대략치)
+
+    def make_batches(self, docs: list[str]) -> list[list[int]]:
+        """토큰 합이 max_batch_tokens 를 넘지 않도록 문서 인덱스를 배치로 묶음"""
+        batches: list[list[int]] = []
+        current: list[int] = []
+        current_tokens = 0
+        for i, doc in enumerate(docs):
+            tokens = count_tokens(doc, self.encoding)
+            if current and current_tokens + tokens > self.max_batch_tokens:
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    async def embed(self, docs: list[str]) -> list[list[float]]:
+        """배치별로 동시에 임베딩 (동시 실행 수 제한, rate limit 시 지수 백오프 재시도)"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        vectors: list[Optional[list[float]]] = [None] * len(docs)
+
+        async def run(batch: list[int]) -> None:
+            async with semaphore:
+                result = await self._embed_with_retry([docs[i] for i in batch])
+            for i, vector in zip(batch, result):
+                vectors[i] = vector
+
+        await asyncio.gather(*(run(batch) for batch in self.make_batches(docs)))
+        return vectors
+
+    async def _embed_with_retry(self, texts: list[str]) -> list[list[float]]:
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self.embeddings.aembed_documents(texts)
+            except (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError) as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = min(30.0, self.retry_backoff * 2 ** attempt) + random.random() * self.retry_backoff
+                print(f"임베딩 재시도 {attempt + 1}/{self.max_retries} ({type(e).__name__}), {delay:.1f}초 후")
+                await asyncio.sleep(delay)
+
+    async def index(self, collection: Any, ids: list[str], docs: list[str], metas: list[dict]) -> int:
+        """임베딩 후 write_batch_size 단위로 upsert 하고 기록한 문서 수를 반환"""
+        if not docs:
+            return 0
+        vectors = await self.embed(docs)
+        for start in range(0, len(docs), self.write_batch_size):
+            end = start + self.write_batch_size
+            collection.upsert(
+                ids=ids[start:end],
+                embeddings=vectors[start:end],
+                documents=docs[start:end],
+                metadatas=metas[start:end],
+            )
+        return len(docs)
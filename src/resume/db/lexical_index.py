@@ -0,0 +1,185 @@
+import json
+import math
+import os
+import re
+import unicodedata
+from collections import Counter
+from typing import Any, Optional
+
+# 한글 연속 구간은 글자 2-gram, 영문/숫자 단어(회사·라이브러리 이름 등)는 단어 그대로 토큰화
+_HANGUL = re.compile(r"[가-힣]+")
+_WORD = re.compile(r"[a-z0-9][a-z0-9.+#-]*[a-z0-9+#]|[a-z0-9]")
+
+# 질문에 그대로 나오면 "강한 일치"로 보는 메타데이터/본문 필드 (본문 필드는 JSON 으로 저장된 이전 인덱스용)
+EXACT_META_FIELDS = ("project", "company", "tech_stack")
+EXACT_CONTENT_FIELDS = ("name", "title", "project", "project_name")
+# 본문과 함께 BM25 토큰에 넣는 메타데이터 필드
+SEARCHABLE_META_FIELDS = ("project", "company", "role", "tech_stack", "topic_tags")
+
+
+def _normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def tokenize(text: str) -> list[str]:
+    text = _normalize(text)
+    tokens = _WORD.findall(text)
+    for run in _HANGUL.findall(text):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def matches_filter(meta: Optional[dict[str, Any]], filters: Optional[dict[str, Any]]) -> bool:
+    """Chroma where 필터의 부분 집합 (동등 비교, $eq, $in, $regex, $and, $or)"""
+    if not filters:
+        return True
+    meta = meta or {}
+    for field, cond in filters.items():
+        if field == "$and":
+            if not all(matches_filter(meta, f) for f in cond):
+                return False
+        elif field == "$or":
+            if not any(matches_filter(meta, f) for f in cond):
+                return False
+        elif isinstance(cond, dict):
+            value = meta.get(field)
+            if "$eq" in cond and value != cond["$eq"]:
+                return False
+            if "$in" in cond and value not in cond["$in"]:
+                return False
+            if "$regex" in cond and not re.search(cond["$regex"], str(value or ""), re.IGNORECASE):
+                return False
+        elif meta.get(field) != cond:
+            return False
+    return True
+
+
+def reciprocal_rank_fusion(rankings: list[list[Any]], key=lambda d: d.page_content, k: int = 60) -> list[Any]:
+    """여러 검색 결과 순위를 RRF 점수(Σ 1/(k + rank))로 합친다"""
+    scores: dict[str, float] = {}
+    items: dict[str, Any] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking):
+            item_key = key(item)
+            items.setdefault(item_key, item)
+            scores[item_key] = scores.get(item_key, 0.0) + 1.0 / (k + rank + 1)
+    return [items[item_key] for item_key in sorted(scores, key=scores.get, reverse=True)]
+
+
+class LexicalIndex:
+    """이력서 문서에 대한 in-process BM25 인덱스
+
+    질문 임베딩 없이도 회사 이름, 기술 스택, 프로젝트 이름 같은 정확한 용어로 문서를 찾는다.
+    """
+    def __init__(self, ids: list[str], docs: list[str], metas: list[dict[str, Any]], term_freqs: Optional[list[dict[str, int]]] = None, k1: float = 1.5, b: float = 0.75) -> None:
+        self.ids = ids
+        self.docs = docs
+        self.metas = metas
+        self.k1 = k1
+        self.b = b
+        # 저장된 인덱스를 불러올 때는 토큰화 결과를 그대로 사용
+        if term_freqs is not None:
+            self.term_freqs = [Counter(tf) for tf in term_freqs]
+        else:
+            self.term_freqs = [Counter(tokenize(self._searchable_text(doc, meta))) for doc, meta in zip(docs, metas)]
+        self._build_stats()
+        self.exact_terms = self._collect_exact_terms()
+
+    def _searchable_text(self, doc: str, meta: Optional[dict[str, Any]]) -> str:
+        """본문 + 검색에 쓸 만한 메타데이터 값 (company, tech_stack, topic_tags 등)"""
+        values = [str(v) for field, v in (meta or {}).items() if field in SEARCHABLE_META_FIELDS and v]
+        return "\n".join([doc, *values])
+
+    def _build_stats(self) -> None:
+        self.doc_lengths = [sum(tf.values()) for tf in self.term_freqs]
+        self.avg_length = (sum(self.doc_lengths) / len(self.doc_lengths)) if self.doc_lengths else 0.0
+        self.postings: dict[str, list[tuple[int, int]]] = {}
+        for i, tf in enumerate(self.term_freqs):
+            for term, count in tf.items():
+                self.postings.setdefault(term, []).append((i, count))
+        n = len(self.docs)
+        self.idf = {term: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for term, p in self.postings.items()}
+
+    def _collect_exact_terms(self) -> dict[str, set[int]]:
+        """질문에 그대로 나오면 해당 문서를 바로 찾을 수 있는 고유 용어 → 문서 번호"""
+        terms: dict[str, set[int]] = {}
+        for i, (doc, meta) in enumerate(zip(self.docs, self.metas)):
+            values = [(meta or {}).get(field) for field in EXACT_META_FIELDS]
+            try:
+                content = json.loads(doc)
+            except ValueError:
+                content = None
+            if isinstance(content, dict):
+                values += [content.get(field) for field in EXACT_CONTENT_FIELDS]
+            for value in values:
+                if not isinstance(value, str):
+                    continue
+                for term in value.split(","):
+                    term = _normalize(term.strip())
+                    if len(term) >= 2:
+                        terms.setdefault(term, set()).add(i)
+        return terms
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def search(self, query: str, k: int, filters: Optional[dict[str, Any]] = None) -> list[tuple[int, float]]:
+        """BM25 점수 상위 k 개 (문서 번호, 점수) - 일치하는 토큰이 없는 문서는 제외"""
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for i, count in self.postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[i] / (self.avg_length or 1))
+                scores[i] = scores.get(i, 0.0) + idf * count * (self.k1 + 1) / (count + norm)
+        ranked = sorted(((i, s) for i, s in scores.items() if matches_filter(self.metas[i], filters)), key=lambda x: x[1], reverse=True)
+        return ranked[:k]
+
+    def exact_matches(self, query: str) -> list[int]:
+        """질문에 고유 용어(회사/기술/프로젝트 이름)가 그대로 들어 있는 문서 번호"""
+        text = _normalize(query)
+        words = set(_WORD.findall(text))
+        found: set[int] = set()
+        for term, doc_ids in self.exact_terms.items():
+            # 영문 용어는 단어 단위로, 한글이 섞인 용어는 부분 문자열로 비교 ("go" 가 "google" 에 걸리지 않도록)
+            matched = term in words if _WORD.fullmatch(term) else term in text
+            if matched:
+                found |= doc_ids
+        return sorted(found)
+
+    def filter(self, filters: Optional[dict[str, Any]] = None) -> list[int]:
+        return [i for i, meta in enumerate(self.metas) if matches_filter(meta, filters)]
+
+    def save(self, path: str, version: str) -> None:
+        """토큰화 결과(term frequency)까지 저장해 다음 기동 때 다시 토큰화하지 않는다"""
+        data = {
+            "version": version,
+            "ids": self.ids,
+            "docs": self.docs,
+            "metas": self.metas,
+            "term_freqs": [dict(tf) for tf in self.term_freqs],
+        }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, version: str) -> Optional["LexicalIndex"]:
+        """저장된 인덱스가 같은 인덱스 버전일 때만 불러온다"""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != version:
+            return None
+
+        return cls(data["ids"], data["docs"], data["metas"], term_freqs=data["term_freqs"])
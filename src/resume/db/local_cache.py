@@ -0,0 +1,46 @@
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+# get() 결과 구분용 센티널
+MISSING = object()   # L1 에 정보 없음 → L2 조회 필요
+NEGATIVE = object()  # 최근에 L2 에도 없었음 (negative cache)
+
+
+class LocalCache:
+    """크기 제한 LRU + TTL in-process 캐시 (없던 키도 짧게 기억하는 negative cache 포함)"""
+    def __init__(self, max_size: int = 1024, ttl: float = 30.0, negative_ttl: float = 5.0) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        """값, NEGATIVE(없음이 캐시됨), MISSING(모름) 중 하나를 반환"""
+        item = self._data.get(key)
+        if item is None:
+            return MISSING
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def set_missing(self, key: str) -> None:
+        self.set(key, NEGATIVE, self.negative_ttl)
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
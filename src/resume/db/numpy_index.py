@@ -0,0 +1,130 @@
+import json
+import os
+import re
+from typing import Any, Optional
+
+import numpy as np
+
+# 컬럼 배열로 들고 있을 메타데이터 필드 (이 외의 필드 필터는 행 단위로 평가)
+COLUMNS = ("doc_type", "company", "role", "period", "period_from", "period_to", "tech_stack", "topic_tags")
+
+
+class NumpyVectorIndex:
+    """정규화한 float32 임베딩 행렬(.npy, memory-map) + 컬럼형 메타데이터로 정확한 top-k 검색
+
+    문서가 수십 개 수준이라 행렬-벡터 곱 한 번이면 전체 점수를 구할 수 있다.
+    필터는 boolean mask 로 바꿔 캐시해 두고 재사용한다.
+    """
+    def __init__(self, ids: list[str], docs: list[str], metas: list[dict[str, Any]], vectors: np.ndarray) -> None:
+        self.ids = ids
+        self.docs = docs
+        self.metas = [meta or {} for meta in metas]
+        self.vectors = vectors
+        self.columns = {field: self._column(field) for field in COLUMNS}
+        self._masks: dict[str, np.ndarray] = {}
+        # doc_type 필터는 거의 모든 요청에 붙으므로 미리 계산
+        for doc_type in set(self.columns["doc_type"]):
+            self.mask({"doc_type": doc_type})
+
+    @classmethod
+    def build(cls, ids: list[str], docs: list[str], metas: list[dict[str, Any]], embeddings: Any) -> "NumpyVectorIndex":
+        if not ids:
+            return cls([], [], [], np.empty((0, 0), dtype=np.float32))
+        vectors = np.asarray(embeddings, dtype=np.float32).reshape(len(ids), -1)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+        return cls(ids, docs, metas, vectors)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def search(self, vector: list[float], k: int, filters: Optional[dict[str, Any]] = None) -> list[tuple[int, float]]:
+        """코사인 유사도 상위 k 개 (문서 번호, 유사도)"""
+        if not self.ids:
+            return []
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        scores = self.vectors @ (query / norm if norm else query)
+        if filters:
+            scores = np.where(self.mask(filters), scores, -np.inf)
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(i), float(scores[i])) for i in top if scores[i] != -np.inf]
+
+    def distance(self, vector: list[float]) -> float:
+        """가장 가까운 문서까지의 제곱 L2 거리 (Chroma l2 공간과 같은 척도, 빈 인덱스면 0)
+
+        정규화된 벡터의 제곱 L2 거리는 2 - 2cos 이다.
+        """
+        results = self.search(vector, 1)
+        if not results:
+            return 0
+        _, cosine = results[0]
+        return 2.0 - 2.0 * cosine
+
+    def mask(self, filters: dict[str, Any]) -> np.ndarray:
+        key = json.dumps(filters, ensure_ascii=False, sort_keys=True)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = self._build_mask(filters)
+            self._masks[key] = mask
+        return mask
+
+    def _build_mask(self, filters: dict[str, Any]) -> np.ndarray:
+        mask = np.ones(len(self.ids), dtype=bool)
+        for field, cond in filters.items():
+            if field == "$and":
+                for f in cond:
+                    mask &= self._build_mask(f)
+            elif field == "$or":
+                mask &= np.logical_or.reduce([self._build_mask(f) for f in cond])
+            else:
+                mask &= self._field_mask(field, cond)
+        return mask
+
+    def _field_mask(self, field: str, cond: Any) -> np.ndarray:
+        column = self.columns.get(field)
+        if column is None:
+            column = self._column(field)
+        if not isinstance(cond, dict):
+            return column == cond
+
+        mask = np.ones(len(column), dtype=bool)
+        if "$eq" in cond:
+            mask &= column == cond["$eq"]
+        if "$in" in cond:
+            mask &= np.array([v in cond["$in"] for v in column], dtype=bool)
+        if "$regex" in cond:
+            pattern = re.compile(cond["$regex"], re.IGNORECASE)
+            mask &= np.array([bool(pattern.search(str(v or ""))) for v in column], dtype=bool)
+        return mask
+
+    def _column(self, field: str) -> np.ndarray:
+        column = np.empty(len(self.metas), dtype=object)
+        column[:] = [meta.get(field) for meta in self.metas]
+        return column
+
+    def save(self, directory: str, version: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "vectors.npy"), np.ascontiguousarray(self.vectors, dtype=np.float32))
+        with open(os.path.join(directory, "vectors.json"), "w", encoding="utf-8") as f:
+            json.dump({"version": version, "ids": self.ids, "docs": self.docs, "metas": self.metas}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, directory: str, version: str) -> Optional["NumpyVectorIndex"]:
+        """같은 인덱스 버전으로 저장된 경우에만 불러온다 (임베딩 행렬은 memory-map)"""
+        meta_path = os.path.join(directory, "vectors.json")
+        vectors_path = os.path.join(directory, "vectors.npy")
+        if not (os.path.exists(meta_path) and os.path.exists(vectors_path)):
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != version:
+            return None
+        vectors = np.load(vectors_path, mmap_mode="r")
+        return cls(data["ids"], data["docs"], data["metas"], vectors)
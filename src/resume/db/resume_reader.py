@@ -1,21 +1,33 @@
-from typing import Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Union
 from dotenv import load_dotenv
-from pypdf import PdfReader
-from langchain.text_splitter import CharacterTextSplitter
+import hashlib
 import json, os
 from datetime import datetime
-from google.cloud import storage
 import tempfile
-from dateutil import parser
+
+from resume.db.time_index import PRESENT
+from resume.utils.context import render_record
+
+# pypdf, langchain, google-cloud-storage, dateutil 은 import 비용이 커서 실제로 쓰는 시점에 import 한다
 
 class ResumeReader:
-    def __init__(self, gcs_bucket: str, gcs_projects_path: str, gcs_qna_path: str, gcs_introduce_path: str, use_gcs = True, cache_file: str = "answer_cache.json", name: str = "Yoonha Lee"):
+    # 문서 변환 형식 버전 (바뀌면 원본이 그대로여도 인덱스를 다시 동기화)
+    DOC_FORMAT = 3
+
+    def __init__(self, gcs_bucket: str, gcs_projects_path: str, gcs_qna_path: str, gcs_introduce_path: str, use_gcs = True, cache_file: str = "answer_cache.json", name: str = "Yoonha Lee", source_cache_dir: str = "db/sources"):
         load_dotenv(override=True)
         self.name = name 
         self.gcs_bucket = gcs_bucket
+        self.use_gcs = use_gcs
+        self.projects_path = gcs_projects_path
+        self.qna_path = gcs_qna_path
+        self.introduce_path = gcs_introduce_path
+        self.source_cache_dir = source_cache_dir  # GCS 원본의 로컬 디스크 캐시 (generation 과 함께 저장)
 
         if use_gcs:
             try:
+                from google.cloud import storage
                 self.storage_client = storage.Client()
                 print("GCS 클라이언트 초기화 성공")
             except Exception as e:
@@ -23,20 +35,71 @@ class ResumeReader:
 
         self.docs = []
         self.meta = []
-        
-        reader_func = self._read_from_gcs if use_gcs else self._read_from_local
-        projects = reader_func(gcs_projects_path, is_json=True)
-        qna = reader_func(gcs_qna_path, is_json=True)
-        summary = reader_func(gcs_introduce_path, is_json=False)
-        
-        self._project_json_to_docs(projects)
-        self._qna_json_to_docs(qna)
-        self._text_to_docs(summary)
-        
+        self.ids = []  # 문서 내용 기반 해시 (Chroma id 로 사용)
+        self.generations = {}  # 원본 파일 경로 → GCS generation (로컬은 mtime)
+        self.qna = []  # qna.json 원본 (질문 warm-up 에 재사용)
+        self.failed_sources: set[str] = set()  # 읽지 못한 원본 경로 (인덱스 동기화에서 삭제가 아니라 "변경 없음"으로 본다)
+        self.loaded = False
+
+    @property
+    def qna_questions(self) -> list[str]:
+        """qna.json 의 질문 목록 (answer warm-up 용, load() 이후 사용)"""
+        questions = []
+        for item in self.qna:
+            question = item.get("question") or item.get("q") if isinstance(item, dict) else None
+            if question:
+                questions.append(question)
+        return questions
+
+    @property
+    def source_paths(self) -> list[str]:
+        return [self.projects_path, self.qna_path, self.introduce_path]
+
+    @property
+    def source_doc_types(self) -> dict[str, str]:
+        """원본 경로 → 그 원본에서 만든 문서의 doc_type"""
+        return {self.projects_path: "projects", self.qna_path: "qna", self.introduce_path: "summary"}
+
+    def load(self) -> "ResumeReader":
+        """원본 파일을 동시에 읽어 문서로 변환 (인덱싱이 필요할 때만 호출)"""
+        if self.loaded:
+            return self
+
+        reader_func = self._read_from_gcs if self.use_gcs else self._read_from_local
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            projects = pool.submit(reader_func, self.projects_path, is_json=True)
+            qna = pool.submit(reader_func, self.qna_path, is_json=True)
+            summary = pool.submit(reader_func, self.introduce_path, is_json=False)
+
+        self._project_json_to_docs(projects.result())
+        self._qna_json_to_docs(qna.result())
+        self._text_to_docs(summary.result())
+        self.loaded = True
+        return self
+
+    def fetch_generations(self) -> dict[str, str]:
+        """내용은 받지 않고 원본 파일들의 generation(로컬은 mtime)만 동시에 조회"""
+        with ThreadPoolExecutor(max_workers=len(self.source_paths)) as pool:
+            generations = list(pool.map(self._fetch_generation, self.source_paths))
+        return {path: gen for path, gen in zip(self.source_paths, generations) if gen is not None}
+
+    def _fetch_generation(self, file_path: str) -> Optional[str]:
+        try:
+            if not self.use_gcs:
+                return str(os.stat(file_path).st_mtime_ns)
+            if not getattr(self, 'storage_client', None):
+                return None
+            blob = self.storage_client.bucket(self.gcs_bucket).get_blob(file_path)
+            return str(blob.generation) if blob else None
+        except Exception as e:
+            print(f"generation 조회 실패 ({file_path}): {e}")
+            return None
+
     def _read_from_gcs(self, file_path: str, is_pdf: bool = False, is_json: bool = False) -> Union[str, dict, list]:
         """GCS에서 파일을 읽어오는 메서드"""
         if not hasattr(self, 'storage_client') or not self.storage_client:
             print("GCS 클라이언트가 초기화되지 않았습니다.")
+            self._mark_failed(file_path)
             return ""
 
         try:
@@ -46,6 +109,7 @@ class ResumeReader:
             if is_pdf:
                 with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
                     blob.download_to_filename(temp_file.name)
+                    from pypdf import PdfReader
                     reader = PdfReader(temp_file.name)
                     text = ""
                     for page in reader.pages:
@@ -55,19 +119,50 @@ class ResumeReader:
                     os.unlink(temp_file.name) 
                     return text
             elif is_json:
-                text = blob.download_as_text(encoding='utf-8')
-                return json.loads(text)
+                return json.loads(self._download_text(blob, file_path))
             else:
-                return blob.download_as_text(encoding='utf-8')
+                return self._download_text(blob, file_path)
                 
         except Exception as e:
             print(f"GCS에서 파일 읽기 실패 ({file_path}): {e}")
+            self._mark_failed(file_path)
             return ""
 
+    def _download_text(self, blob, file_path: str) -> str:
+        """디스크 캐시와 generation 이 같으면 내려받지 않는 조건부 다운로드"""
+        from google.api_core.exceptions import NotModified
+
+        cache_key = hashlib.sha256(f"{self.gcs_bucket}/{file_path}".encode()).hexdigest()[:16]
+        cache_path = os.path.join(self.source_cache_dir, cache_key)
+        meta_path = cache_path + ".json"
+
+        cached_generation = None
+        if os.path.exists(cache_path) and os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                cached_generation = json.load(f).get("generation")
+
+        try:
+            data = blob.download_as_bytes(if_generation_not_match=int(cached_generation) if cached_generation else None)
+        except NotModified:
+            self.generations[file_path] = cached_generation
+            with open(cache_path, "r", encoding="utf-8") as f:
+                return f.read()
+
+        text = data.decode("utf-8")
+        self.generations[file_path] = str(blob.generation)
+        os.makedirs(self.source_cache_dir, exist_ok=True)
+        with open(cache_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({"path": file_path, "generation": str(blob.generation)}, f)
+        return text
+
     def _read_from_local(self, file_path: str, is_pdf: bool = False, is_json: bool = False) -> Union[str, dict, list]:
         """로컬 파일에서 읽어오는 메서드"""
         try:
+            self.generations[file_path] = str(os.stat(file_path).st_mtime_ns)
             if is_pdf:
+                from pypdf import PdfReader
                 reader = PdfReader(file_path)
                 text = ""
                 for page in reader.pages:
@@ -83,60 +178,81 @@ class ResumeReader:
                     return f.read()
         except Exception as e:
             print(f"로컬 파일 읽기 실패 ({file_path}): {e}")
+            self._mark_failed(file_path)
             return ""
 
+    def _mark_failed(self, file_path: str) -> None:
+        """읽기 실패한 원본은 generation 을 남기지 않아 다음 동기화에서 다시 읽는다"""
+        self.failed_sources.add(file_path)
+        self.generations.pop(file_path, None)
+
     def _project_json_to_docs(self, data: dict): 
         doc_type = "projects"
         if "projects" in data:
             for p in data["projects"]:
-                content = json.dumps(p, ensure_ascii=False, indent=2)
+                content = render_record(p)
                 period = p.get("period", {})
                 period_from = self._parse_date(period.get("from") if isinstance(period, dict) else None)
                 period_to = self._parse_date(period.get("to") if isinstance(period, dict) else None)
 
-
                 tmp = {
                     "doc_type": doc_type,
+                    "project": p.get("name") or p.get("title"),
                     "company": p.get("company"),
                     "role": ", ".join(p.get("role", [])) if isinstance(p.get("role"), list) else p.get("role"),
                     "period": f"{p['period'].get('from', '')}~{p['period'].get('to', '')}" if isinstance(p.get("period"), dict) else p.get("period"),
-                    "period_from": period_from.isoformat() if period_from else None,
-                    "period_to": period_to.isoformat() if period_to else None,
+                    "period_from": period_from,
+                    "period_to": period_to,
                     "tech_stack": ", ".join([t["name"] for t in p.get("tech_stack", [])])
                 }
-                self.docs.append(content)
-                self.meta.append(tmp)
+                self._append_doc(content, tmp)
 
-    def _parse_date(self, val):
+    def _parse_date(self, val) -> Optional[str]:
+        """기간 값을 ISO 문자열로 (진행 중이면 PRESENT - 문서 해시가 실행 시각에 따라 바뀌지 않도록)"""
         if not val:
             return None
         if isinstance(val, str) and val.upper() in ["ING", "CURRENT", "PRESENT"]:
-            return datetime.now()
+            return PRESENT
         try:
-            return datetime.strptime(val, "%Y.%m")
+            return datetime.strptime(val, "%Y.%m").isoformat()
         except ValueError:
             try:
-                return parser.parse(val)
+                from dateutil import parser
+                return parser.parse(val).isoformat()
             except Exception:
                 return None
 
     def _qna_json_to_docs(self, data: dict): 
         doc_type = "qna"
+        self.qna = data if isinstance(data, list) else []
         for q in data:
-            content = json.dumps(q, ensure_ascii=False, indent=2)
+            content = render_record(q)
             tmp = {
                 "doc_type": doc_type, 
                 "topic_tags": ", ".join(q.get("topic_tags", [])) if isinstance(q.get("topic_tags"), list) else q.get("topic_tags"),
             }
-            self.docs.append(content)
-            self.meta.append(tmp)
+            self._append_doc(content, tmp)
 
     def _text_to_docs(self, data: str):
         doc_type = "summary"
+        from langchain.text_splitter import CharacterTextSplitter
         splitter = CharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
         chunks = splitter.split_text(data) 
         for c in chunks:
-            self.docs.append(c)
-            self.meta.append({
+            self._append_doc(c, {
                 "doc_type": doc_type
-            })  
+            })
+
+    def _append_doc(self, content: str, meta: dict) -> None:
+        """내용+메타데이터 해시를 id 로 부여해 추가 (완전히 같은 문서는 한 번만)"""
+        doc_id = self.content_hash(content, meta)
+        if doc_id in self.ids:
+            return
+        self.ids.append(doc_id)
+        self.docs.append(content)
+        self.meta.append(meta)
+
+    @staticmethod
+    def content_hash(content: str, meta: dict) -> str:
+        payload = json.dumps({"content": content, "meta": meta}, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
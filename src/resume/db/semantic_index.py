@@ -0,0 +1,60 @@
+import time
+from typing import Any, Optional
+import numpy as np
+
+
+class SemanticIndex:
+    """질문 임베딩 → 캐시된 답변을 담는 in-process 최근접 이웃 인덱스
+
+    엔트리에 expires_at(time.time() 기준)이 있으면 만료된 엔트리는 추가/검색 때 제거한다.
+    """
+    def __init__(self, max_size: int = 1000) -> None:
+        self.max_size = max_size
+        self.vectors = np.empty((0, 0), dtype=np.float32)
+        self.entries: list[dict[str, Any]] = []
+
+    def add(self, vector: list[float], entry: dict[str, Any]) -> None:
+        """정규화한 벡터와 함께 엔트리 추가 (만료된 것을 먼저 지우고, 그래도 가득 차면 가장 오래된 것부터 제거)"""
+        self._purge_expired(time.time())
+        v = self._normalize(vector)
+        if self.vectors.size == 0:
+            self.vectors = v.reshape(1, -1)
+        else:
+            self.vectors = np.vstack([self.vectors, v])
+        self.entries.append(entry)
+
+        if len(self.entries) > self.max_size:
+            overflow = len(self.entries) - self.max_size
+            self.vectors = self.vectors[overflow:]
+            self.entries = self.entries[overflow:]
+
+    def search(self, vector: list[float], category: Optional[str] = None) -> tuple[Optional[dict[str, Any]], float]:
+        """만료되지 않은 엔트리 중 코사인 유사도가 가장 높은 엔트리와 그 점수 (category 가 주어지면 같은 카테고리만)"""
+        self._purge_expired(time.time())
+        if not self.entries:
+            return None, 0.0
+
+        scores = self.vectors @ self._normalize(vector)
+        if category is not None:
+            mask = np.array([e.get("category") == category for e in self.entries])
+            if not mask.any():
+                return None, 0.0
+            scores = np.where(mask, scores, -np.inf)
+
+        best = int(np.argmax(scores))
+        return self.entries[best], float(scores[best])
+
+    def _purge_expired(self, now: float) -> None:
+        alive = [i for i, e in enumerate(self.entries) if e.get("expires_at", float("inf")) >= now]
+        if len(alive) == len(self.entries):
+            return
+        self.vectors = self.vectors[alive] if alive else np.empty((0, 0), dtype=np.float32)
+        self.entries = [self.entries[i] for i in alive]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _normalize(self, vector: list[float]) -> np.ndarray:
+        v = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(v)
+        return v / norm if norm else v
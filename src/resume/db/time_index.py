@@ -0,0 +1,47 @@
+import datetime
+from typing import Any, Optional
+
+from resume.db.lexical_index import matches_filter
+
+# 진행 중인 기간의 종료일 (메타데이터/해시에는 이 값 그대로 저장하고 "현재" 는 조회하는 쪽에서 해석한다)
+PRESENT = "present"
+
+
+def parse_date(val: Optional[str]) -> datetime.datetime:
+    if val == PRESENT:
+        # 진행 중인 기간은 어떤 종료일보다도 뒤 (현재 시각과 정렬 결과가 같고 시간이 지나도 바뀌지 않는다)
+        return datetime.datetime.max
+    try:
+        return datetime.datetime.fromisoformat(val) if val else datetime.datetime.min
+    except (TypeError, ValueError):
+        return datetime.datetime.min
+
+
+class TimeIndex:
+    """프로젝트 문서를 기간(period_from, period_to) 순으로 미리 정렬해 둔 인덱스
+
+    "최근/처음" 질문은 벡터 검색 후 정렬하는 대신 이 순서에서 앞쪽 k 개를 잘라 쓴다.
+    """
+    def __init__(self, metas: list[Optional[dict[str, Any]]]) -> None:
+        self.metas = metas
+        # 시작일이 있는 프로젝트만, 오래된 것 → 최근 순 (시작일이 같으면 종료일 기준)
+        dated = [
+            (parse_date(meta.get("period_from")), parse_date(meta.get("period_to")), i)
+            for i, meta in enumerate(metas)
+            if meta and meta.get("doc_type") == "projects" and meta.get("period_from")
+        ]
+        self.order = [i for _, _, i in sorted(dated)]
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def slice(self, time_condition: str, k: int, filters: Optional[dict[str, Any]] = None) -> list[int]:
+        """recent 면 최근 것부터, first 면 오래된 것부터 필터를 만족하는 문서 번호 k 개"""
+        order = reversed(self.order) if time_condition == "recent" else iter(self.order)
+        results = []
+        for i in order:
+            if matches_filter(self.metas[i], filters):
+                results.append(i)
+                if len(results) == k:
+                    break
+        return results
@@ -1,39 +1,174 @@
+import asyncio
+import datetime
+import hashlib
+import json
+from collections import OrderedDict
 from typing import (
     Dict,
     Optional,
 )
-from chromadb.api.types import Document
-from dotenv import load_dotenv
-from langchain_community.vectorstores import Chroma
-from langchain_openai import OpenAIEmbeddings
 import os
 
+from resume.db.indexer import EmbeddingIndexer
+from resume.db.lexical_index import LexicalIndex, reciprocal_rank_fusion
+from resume.db.numpy_index import NumpyVectorIndex
+from resume.db.time_index import TimeIndex
 from resume.db.resume_reader import ResumeReader
+from resume.metrics import VECTOR_SECONDS
+
+# langchain Chroma 의 기본 컬렉션 이름 (기존에 저장된 인덱스를 그대로 연다)
+COLLECTION_NAME = "langchain"
+
 
 class VectorStore:
-    def __init__(self, gcs_bucket: str, gcs_projects_path: str, gcs_qna_path: str, gcs_introduce_path: str, use_gcs = True, cache_file: str = "answer_cache.json", name: str = "Yoonha Lee"):
+    """Chroma 컬렉션 + BM25/기간/numpy 보조 인덱스
+
+    생성자는 저장된 컬렉션을 열기만 한다. 원본과의 동기화(임베딩)와 보조 인덱스 로드는 sync() 에서 하며,
+    CLI(resume index) 와 ResumeChatbot 의 warm-up 이 명시적으로 호출한다.
+    """
+    def __init__(self, gcs_bucket: str, gcs_projects_path: str, gcs_qna_path: str, gcs_introduce_path: str, use_gcs = True, cache_file: str = "answer_cache.json", name: str = "Yoonha Lee", embedding_cache_size: int = 256, indexer: Optional[EmbeddingIndexer] = None):
+        # langchain / chromadb 는 import 비용이 커서 VectorStore 를 만들 때 import 한다
+        import chromadb
+        from langchain_community.vectorstores import Chroma
+        from langchain_openai import OpenAIEmbeddings
+
+        # 원본 문서는 인덱스 갱신이 필요할 때만 읽는다
         resume_reader = ResumeReader(gcs_bucket, gcs_projects_path, gcs_qna_path, gcs_introduce_path, use_gcs, cache_file, name)
-        embeddings = OpenAIEmbeddings()
+        from resume.llm_client import get_http_client
+
+        # 질문 임베딩은 채팅과 같은 연결 풀/속도 제한을 쓴다
+        embeddings = OpenAIEmbeddings(http_async_client=get_http_client())
+        self.embeddings = embeddings
+        # 인덱싱은 별도 이벤트 루프(warm-up 스레드, CLI)에서 돌 수 있기 때문에 질문 임베딩용 클라이언트와 분리
+        self.indexer = indexer or EmbeddingIndexer(OpenAIEmbeddings())
+        self.reader = resume_reader
+        # 질문 → 임베딩 LRU (같은 질문을 요청마다 다시 임베딩하지 않도록)
+        self._embedding_cache: OrderedDict[str, list[float]] = OrderedDict()
+        self._embedding_cache_size = embedding_cache_size
         persist_dir = "db/chroma"
-        if os.path.exists(persist_dir):
-            self.vectordb = Chroma(persist_directory=persist_dir, embedding_function=embeddings)
-        else:
-            self.vectordb = Chroma.from_texts(resume_reader.docs, embeddings, metadatas=resume_reader.meta, persist_directory=persist_dir)
-            self.vectordb.persist()
-
-        # all_data = self.vectordb.get()
-        # for i, (doc, meta) in enumerate(zip(all_data["documents"], all_data["metadatas"])):
-        #     print(f"[{i}] {doc}")
-        #     print(f"META: {meta}")
-
-        # self.cache_file = cache_file
-        # if os.path.exists(cache_file):
-        #     with open(cache_file, "r", encoding="utf-8") as f:
-        #         self.answer_cache = json.load(f)
-        # else:
-        #     self.answer_cache = {}
-    
-    def get_similar_data(self, question: str, k: int, filters: Optional[Dict[str, str]] = None) -> list[Document]:
+        self.persist_dir = persist_dir
+        self.manifest_path = os.path.join(persist_dir, "manifest.json")
+        # 컬렉션은 직접 소유하고(인덱싱은 미리 계산한 임베딩을 기록), 검색은 같은 컬렉션 위의 langchain Chroma 로 한다
+        self.chroma = chromadb.PersistentClient(path=persist_dir)
+        self.collection = self.chroma.get_or_create_collection(COLLECTION_NAME)
+        self.vectordb = Chroma(client=self.chroma, collection_name=COLLECTION_NAME, embedding_function=embeddings)
+        # 읽기 경로 백엔드 - chroma(기본) 또는 numpy (Chroma 컬렉션을 원본으로 한 memory-map 행렬, 정확한 top-k)
+        self.backend = os.getenv("VECTOR_BACKEND", "chroma").lower()
+        # 아래 값들은 sync() 에서 채운다
+        self.index_version: Optional[str] = None
+        self.lexical: Optional[LexicalIndex] = None
+        self.time_index: Optional[TimeIndex] = None
+        self.numpy_index: Optional[NumpyVectorIndex] = None
+
+    async def sync(self, rebuild: bool = False) -> "VectorStore":
+        """원본과 인덱스를 동기화하고 검색용 보조 인덱스를 불러온다"""
+        self.index_version = await self._sync_index(self.reader, rebuild)
+        # 정확한 용어 검색용 BM25 인덱스 (Chroma 와 같은 디렉토리에 인덱스 버전과 함께 저장)
+        self.lexical_path = os.path.join(self.persist_dir, "lexical.json")
+        self.lexical = self._load_lexical()
+        # "최근/처음" 질문용 프로젝트 기간 순서 (lexical 인덱스와 같은 문서 번호 사용)
+        self.time_index = TimeIndex(self.lexical.metas)
+        self.numpy_index = self._load_numpy_index() if self.backend == "numpy" else None
+        return self
+
+    async def _sync_index(self, resume_reader: ResumeReader, rebuild: bool = False) -> str:
+        """내용 해시 id 기준으로 저장된 인덱스와 비교해 바뀐 문서만 임베딩/삭제하고 인덱스 버전을 반환"""
+        existing = set(self.collection.get(include=[])["ids"])
+
+        # 원본 generation 이 manifest 와 같으면 원본을 읽지 않고 기존 인덱스를 그대로 사용
+        manifest = self._read_manifest()
+        # 문서 변환 형식이 바뀐 경우(doc_format)에도 원본을 다시 읽어 내용 해시 id 를 갱신
+        if not rebuild and existing and manifest.get("generations") and manifest.get("doc_format") == ResumeReader.DOC_FORMAT:
+            if await asyncio.to_thread(resume_reader.fetch_generations) == manifest["generations"]:
+                return manifest.get("index_version") or self._index_version(existing)
+
+        # 원본 읽기(GCS/디스크)는 이벤트 루프를 막지 않도록 스레드에서
+        await asyncio.to_thread(resume_reader.load)
+        if rebuild and existing and resume_reader.ids:
+            self.collection.delete(ids=list(existing))
+            existing = set()
+        if not resume_reader.ids:
+            # 원본 읽기에 실패한 경우 기존 인덱스를 지우지 않고 그대로 사용
+            print("원본 문서가 비어 있어 기존 인덱스를 유지합니다.")
+            return self._index_version(existing)
+
+        current = set(resume_reader.ids)
+        if resume_reader.failed_sources and existing:
+            # 일부 원본만 읽지 못했으면 그 원본의 문서는 지우지 않고 그대로 둔다 (삭제가 아니라 "변경 없음")
+            doc_types = [resume_reader.source_doc_types[path] for path in resume_reader.failed_sources]
+            kept = set(self.collection.get(where={"doc_type": {"$in": doc_types}}, include=[])["ids"])
+            print(f"읽지 못한 원본 {sorted(resume_reader.failed_sources)} 의 문서 {len(kept)}개를 유지합니다.")
+            current |= kept
+        removed = existing - current
+        added = [i for i, doc_id in enumerate(resume_reader.ids) if doc_id not in existing]
+
+        if removed:
+            self.collection.delete(ids=list(removed))
+        if added:
+            # 토큰 예산 배치 단위로 동시에 임베딩한 뒤 컬렉션에 배치로 기록
+            await self.indexer.index(
+                self.collection,
+                [resume_reader.ids[i] for i in added],
+                [resume_reader.docs[i] for i in added],
+                [resume_reader.meta[i] for i in added],
+            )
+        if removed or added:
+            print(f"인덱스 갱신: 추가 {len(added)}개, 삭제 {len(removed)}개")
+
+        index_version = self._index_version(current)
+        self._write_manifest(resume_reader.generations, index_version, len(current))
+        return index_version
+
+    def _load_lexical(self) -> LexicalIndex:
+        """저장된 BM25 인덱스가 현재 인덱스 버전과 같으면 불러오고, 아니면 컬렉션 내용으로 다시 만든다"""
+        lexical = LexicalIndex.load(self.lexical_path, self.index_version)
+        if lexical is not None:
+            return lexical
+        data = self.collection.get(include=["documents", "metadatas"])
+        lexical = LexicalIndex(data["ids"], data["documents"], data["metadatas"])
+        lexical.save(self.lexical_path, self.index_version)
+        return lexical
+
+    def _load_numpy_index(self) -> NumpyVectorIndex:
+        index = NumpyVectorIndex.load(self.persist_dir, self.index_version)
+        if index is not None:
+            return index
+        data = self.collection.get(include=["documents", "metadatas", "embeddings"])
+        index = NumpyVectorIndex.build(data["ids"], data["documents"], data["metadatas"], data["embeddings"])
+        index.save(self.persist_dir, self.index_version)
+        # 저장한 파일을 memory-map 으로 다시 연다
+        return NumpyVectorIndex.load(self.persist_dir, self.index_version) or index
+
+    def _index_version(self, ids: set[str]) -> str:
+        return hashlib.sha256("".join(sorted(ids)).encode()).hexdigest()[:16]
+
+    def _read_manifest(self) -> dict:
+        return self.read_manifest(self.manifest_path)
+
+    @staticmethod
+    def read_manifest(manifest_path: str = "db/chroma/manifest.json") -> dict:
+        """저장된 manifest (VectorStore 를 만들지 않고도 인덱스 버전을 알 수 있도록 정적 메서드)"""
+        if not os.path.exists(manifest_path):
+            return {}
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self, generations: dict, index_version: str, doc_count: int) -> None:
+        """원본 파일 generation 과 인덱스 버전을 기록"""
+        manifest = {
+            "index_version": index_version,
+            "doc_count": doc_count,
+            "doc_format": ResumeReader.DOC_FORMAT,
+            "generations": {path: str(gen) for path, gen in generations.items()},
+            "updated_at": datetime.datetime.now().isoformat(),
+        }
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    def get_similar_data(self, question: str, k: int, filters: Optional[Dict[str, str]] = None) -> list:
         return self.vectordb.similarity_search(
             query=question,
             k=k,
@@ -45,4 +180,98 @@ class VectorStore:
         if not results:
             return 0
         _, score = results[0]
+        return score
+
+    async def embed_query(self, question: str) -> list[float]:
+        """질문 임베딩을 한 번만 계산 (LRU 캐시 적중 시 API 호출 없음)"""
+        vector = self._embedding_cache.get(question)
+        if vector is not None:
+            self._embedding_cache.move_to_end(question)
+            return vector
+
+        with VECTOR_SECONDS.labels(operation="embed_query", backend="openai").time():
+            vector = await self.embeddings.aembed_query(question)
+        self._embedding_cache[question] = vector
+        if len(self._embedding_cache) > self._embedding_cache_size:
+            self._embedding_cache.popitem(last=False)
+        return vector
+
+    async def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """여러 문장을 한 번의 요청으로 임베딩 (질문 임베딩과 같은 모델)"""
+        return await self.embeddings.aembed_documents(texts)
+
+    def get_similar_data_by_vector(self, vector: list[float], k: int, filters: Optional[Dict[str, str]] = None) -> list:
+        with VECTOR_SECONDS.labels(operation="search", backend=self.backend).time():
+            return self._similar_by_vector(vector, k, filters)
+
+    def _similar_by_vector(self, vector: list[float], k: int, filters: Optional[Dict[str, str]] = None) -> list:
+        if self.numpy_index is not None:
+            from langchain_core.documents import Document
+            return [
+                Document(page_content=self.numpy_index.docs[i], metadata=self.numpy_index.metas[i])
+                for i, _ in self.numpy_index.search(vector, k, filters)
+            ]
+        return self.vectordb.similarity_search_by_vector(
+            embedding=vector,
+            k=k,
+            filter=filters if filters else None
+        )
+
+    def lexical_search(self, question: str, k: int, filters: Optional[Dict[str, str]] = None) -> list:
+        """임베딩 없이 BM25 로만 검색"""
+        with VECTOR_SECONDS.labels(operation="lexical", backend="bm25").time():
+            return self._to_documents(i for i, _ in self.lexical.search(question, k, filters))
+
+    def exact_match(self, question: str) -> list:
+        """질문에 회사/기술/프로젝트 이름이 그대로 들어 있는 문서 (있으면 임베딩 없이 답할 수 있다)"""
+        return self._to_documents(self.lexical.exact_matches(question))
+
+    def filter_documents(self, filters: Optional[Dict[str, str]] = None) -> list:
+        return self._to_documents(self.lexical.filter(filters))
+
+    def get_chronological(self, time_condition: str, k: int, filters: Optional[Dict[str, str]] = None, vector: Optional[list[float]] = None) -> list:
+        """기간 순서에서 k 개를 잘라 반환 (vector 가 주어지면 그 k 개 안에서만 유사도 순으로 재정렬)"""
+        indexes = self.time_index.slice(time_condition, k, filters)
+        if vector is not None and len(indexes) > 1:
+            scores = self._similarities(indexes, vector)
+            indexes = [i for _, i in sorted(zip(scores, indexes), key=lambda x: x[0], reverse=True)]
+        return self._to_documents(indexes)
+
+    def _similarities(self, indexes: list[int], vector: list[float]) -> list[float]:
+        """lexical 문서 번호들의 저장된 임베딩과 질문 벡터의 코사인 유사도"""
+        import numpy as np
+        ids = [self.lexical.ids[i] for i in indexes]
+        data = self.collection.get(ids=ids, include=["embeddings"])
+        by_id = dict(zip(data["ids"], data["embeddings"]))
+        query = np.asarray(vector, dtype=np.float32)
+        scores = []
+        for doc_id in ids:
+            v = np.asarray(by_id.get(doc_id, np.zeros_like(query)), dtype=np.float32)
+            denom = np.linalg.norm(v) * np.linalg.norm(query)
+            scores.append(float(v @ query / denom) if denom else 0.0)
+        return scores
+
+    def hybrid_search(self, question: str, vector: list[float], k: int, filters: Optional[Dict[str, str]] = None, dense: Optional[list] = None) -> list:
+        """벡터 검색과 BM25 결과를 reciprocal rank fusion 으로 합친 상위 k 개 (dense 가 있으면 벡터 검색 재사용)"""
+        if dense is None:
+            dense = self.get_similar_data_by_vector(vector, k * 2, filters)
+        lexical = self.lexical_search(question, k * 2, filters)
+        return reciprocal_rank_fusion([dense, lexical])[:k]
+
+    def _to_documents(self, indexes) -> list:
+        from langchain_core.documents import Document
+        return [Document(page_content=self.lexical.docs[i], metadata=self.lexical.metas[i] or {}) for i in indexes]
+
+    def get_context_score_by_vector(self, vector: list[float]) -> float:
+        with VECTOR_SECONDS.labels(operation="score", backend=self.backend).time():
+            return self._context_score_by_vector(vector)
+
+    def _context_score_by_vector(self, vector: list[float]) -> float:
+        if self.numpy_index is not None:
+            return self.numpy_index.distance(vector)
+        # similarity_search_with_score 와 동일한 거리 값을 반환
+        results = self.vectordb.similarity_search_by_vector_with_relevance_scores(vector, k=1)
+        if not results:
+            return 0
+        _, score = results[0]
         return score
\ No newline at end of file
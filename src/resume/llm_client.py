@@ -0,0 +1,269 @@
+"""OpenAI 호출용 공유 HTTP 클라이언트와 모델별 요청/토큰 속도 제한
+
+채팅(AsyncOpenAI)과 질문 임베딩(OpenAIEmbeddings)이 하나의 httpx 연결 풀(keep-alive, 가능하면 HTTP/2)을 쓰고,
+모든 요청은 RateLimitedTransport 를 거쳐 모델별 RPM/TPM 토큰 버킷과 동시 요청 수 제한을 통과한다.
+버킷 크기/잔량은 응답의 x-ratelimit-* 헤더로 계속 맞추고, 429 를 받으면 retry-after 동안 해당 모델 요청을 멈춘다.
+"""
+import asyncio
+import json
+import os
+import re
+import time
+from typing import Any, Callable, Optional
+
+import httpx
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+_http_client: Optional[httpx.AsyncClient] = None
+_rate_limiter: Optional["RateLimiter"] = None
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """x-ratelimit-reset-* 형식("1s", "6m0s", "20ms")을 초 단위로"""
+    if not value:
+        return None
+    parts = _DURATION.findall(value)
+    if not parts:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return sum(float(n) * _UNITS[unit] for n, unit in parts)
+
+
+class TokenBucket:
+    """분당 한도(capacity)만큼 채워지는 토큰 버킷"""
+    def __init__(self, capacity: float, period: float = 60.0) -> None:
+        self.capacity = capacity
+        self.period = period
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        # 429 로 멈춰 있던 구간(blocked_until 이전)은 채우지 않는다
+        elapsed = now - max(self.updated, self.blocked_until)
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.capacity / self.period)
+        self.updated = max(self.updated, now)
+
+    def wait_time(self, amount: float) -> float:
+        """amount 만큼 꺼내려면 기다려야 하는 시간(초)"""
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) * self.period / self.capacity
+
+    def take(self, amount: float) -> None:
+        self.tokens -= min(amount, self.capacity)
+
+    def sync(self, limit: Optional[float], remaining: Optional[float]) -> None:
+        """서버가 알려준 한도/잔량에 맞춘다 (서버 쪽이 더 적게 남았으면 그 값을 따른다)"""
+        self._refill(time.monotonic())
+        if limit:
+            self.capacity = limit
+        if remaining is not None:
+            self.tokens = min(self.tokens, remaining)
+
+    def block(self, seconds: float) -> None:
+        """seconds 동안 멈추고, 풀린 뒤에는 빈 버킷에서 다시 채우기 시작한다"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+        self.updated = self.blocked_until
+
+
+class ModelLimiter:
+    """모델 하나의 RPM/TPM 버킷 + 동시 요청 수 제한"""
+    def __init__(self, rpm: float, tpm: float, max_inflight: int) -> None:
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.inflight = asyncio.Semaphore(max_inflight)
+        self.lock = asyncio.Lock()
+
+
+class RateLimiter:
+    """모델별 limiter 모음 - 처음 보는 모델은 환경변수 기본값으로 시작해 응답 헤더로 조정된다"""
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None, max_inflight: Optional[int] = None) -> None:
+        self.rpm = rpm or float(os.getenv("OPENAI_RPM", 500))
+        self.tpm = tpm or float(os.getenv("OPENAI_TPM", 200000))
+        self.max_inflight = max_inflight or int(os.getenv("OPENAI_MAX_INFLIGHT", 16))
+        self.models: dict[str, ModelLimiter] = {}
+        self.stats = {"requests": 0, "waited": 0, "rate_limited": 0}
+
+    def _get(self, model: str) -> ModelLimiter:
+        limiter = self.models.get(model)
+        if limiter is None:
+            limiter = ModelLimiter(self.rpm, self.tpm, self.max_inflight)
+            self.models[model] = limiter
+        return limiter
+
+    async def acquire(self, model: str, tokens: int) -> Callable[[], None]:
+        """요청 1건 + 예상 토큰만큼 버킷에서 꺼내고, 동시 요청 슬롯을 잡은 뒤 슬롯 반환 함수를 돌려준다"""
+        limiter = self._get(model)
+        await limiter.inflight.acquire()
+        try:
+            # lock 안에서 기다리므로 먼저 온 요청부터 순서대로 통과한다
+            async with limiter.lock:
+                waited = False
+                while True:
+                    wait = max(limiter.requests.wait_time(1), limiter.tokens.wait_time(tokens))
+                    if wait <= 0:
+                        break
+                    waited = True
+                    await asyncio.sleep(wait)
+                limiter.requests.take(1)
+                limiter.tokens.take(tokens)
+        except BaseException:
+            limiter.inflight.release()
+            raise
+
+        self.stats["requests"] += 1
+        self.stats["waited"] += int(waited)
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                limiter.inflight.release()
+        return release
+
+    def update(self, model: str, status_code: int, headers: Any) -> None:
+        """x-ratelimit-* 헤더로 버킷을 맞추고 429 면 retry-after 동안 멈춘다"""
+        limiter = self._get(model)
+        limiter.requests.sync(_number(headers.get("x-ratelimit-limit-requests")), _number(headers.get("x-ratelimit-remaining-requests")))
+        limiter.tokens.sync(_number(headers.get("x-ratelimit-limit-tokens")), _number(headers.get("x-ratelimit-remaining-tokens")))
+        if status_code == 429:
+            self.stats["rate_limited"] += 1
+            retry_after = _number(headers.get("retry-after-ms"))
+            retry_after = retry_after / 1000 if retry_after is not None else _number(headers.get("retry-after"))
+            if retry_after is None:
+                retry_after = max(
+                    parse_duration(headers.get("x-ratelimit-reset-requests")) or 0,
+                    parse_duration(headers.get("x-ratelimit-reset-tokens")) or 0,
+                ) or 1.0
+            limiter.requests.block(retry_after)
+            limiter.tokens.block(retry_after)
+
+
+def _number(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def estimate_request(request: httpx.Request) -> tuple[Optional[str], int]:
+    """요청 본문에서 모델 이름과 예상 토큰 수(입력 글자 수 기반 대략치 + max_tokens)"""
+    try:
+        body = json.loads(request.content or b"{}")
+    except (ValueError, httpx.RequestNotRead):
+        return None, 0
+    if not isinstance(body, dict) or "model" not in body:
+        return None, 0
+
+    text = 0
+    for message in body.get("messages") or []:
+        content = message.get("content")
+        text += len(content) if isinstance(content, str) else len(json.dumps(content, ensure_ascii=False))
+    inputs = body.get("input")
+    if isinstance(inputs, str):
+        text += len(inputs)
+    elif isinstance(inputs, list):
+        text += sum(len(i) if isinstance(i, str) else len(i) * 2 for i in inputs)
+    completion = body.get("max_tokens") or body.get("max_completion_tokens") or (0 if inputs is not None else 512)
+    return body["model"], text // 2 + 1 + completion
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """응답 본문(스트리밍 포함)을 다 읽고 닫을 때 동시 요청 슬롯을 반환"""
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]) -> None:
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport: httpx.AsyncBaseTransport, limiter: RateLimiter) -> None:
+        self.transport = transport
+        self.limiter = limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        model, tokens = estimate_request(request)
+        if model is None:
+            return await self.transport.handle_async_request(request)
+
+        release = await self.limiter.acquire(model, tokens)
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+        self.limiter.update(model, response.status_code, response.headers)
+        if response.is_closed:
+            # 본문을 이미 다 읽은 응답 (테스트용 transport 등)
+            release()
+        else:
+            response.stream = _ReleasingStream(response.stream, release)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """프로세스 공용 OpenAI HTTP 클라이언트 (연결 풀/limiter 공유)"""
+    global _http_client, _rate_limiter
+    if _http_client is None:
+        limits = httpx.Limits(
+            max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", 64)),
+            max_keepalive_connections=int(os.getenv("OPENAI_MAX_KEEPALIVE", 32)),
+            keepalive_expiry=float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", 60)),
+        )
+        http2 = os.getenv("OPENAI_HTTP2", "true").lower() == "true" and _http2_available()
+        _rate_limiter = RateLimiter()
+        transport = RateLimitedTransport(httpx.AsyncHTTPTransport(http2=http2, limits=limits), _rate_limiter)
+        _http_client = httpx.AsyncClient(
+            transport=transport,
+            limits=limits,
+            timeout=httpx.Timeout(float(os.getenv("OPENAI_TIMEOUT", 30)), connect=5.0),
+        )
+    return _http_client
+
+
+def rate_limit_stats() -> dict[str, int]:
+    """공용 클라이언트 limiter 의 누적 통계 (요청 수, 대기한 요청 수, 429 수 - 클라이언트를 만들기 전이면 빈 dict)"""
+    return dict(_rate_limiter.stats) if _rate_limiter is not None else {}
+
+
+def build_openai_client() -> Any:
+    """공용 연결 풀을 쓰는 AsyncOpenAI (429 재시도도 limiter 를 다시 거친다)"""
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(
+        http_client=get_http_client(),
+        timeout=float(os.getenv("OPENAI_TIMEOUT", 30)),
+        max_retries=int(os.getenv("OPENAI_MAX_RETRIES", 2)),
+    )
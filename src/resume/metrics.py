@@ -0,0 +1,108 @@
+"""prometheus_client 기반 파이프라인 메트릭과 요청 단위 구조화 로그
+
+- 단계/에이전트 호출 소요 시간, OpenAI 토큰 사용량, 답변 캐시 적중, 벡터 검색 지연을 기록한다.
+- serve_metrics() 는 Gradio 앱 옆 별도 포트(METRICS_PORT)에서 /metrics 를 제공한다.
+- RequestTrace 는 contextvar 로 현재 요청을 따라가며 단계 시간/토큰을 모아 요청이 끝날 때 JSON 한 줄로 남긴다.
+"""
+import contextvars
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
+
+from prometheus_client import CollectorRegistry, Counter, Histogram, start_http_server
+
+# 초 단위 기본 버킷 (수 ms 의 로컬 검색부터 수십 초의 LLM 호출까지)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# 앱 메트릭 전용 레지스트리 (테스트는 CollectorRegistry 를 따로 만들어 쓴다)
+REGISTRY = CollectorRegistry()
+
+STAGE_SECONDS = Histogram("resume_stage_seconds", "Chat pipeline stage duration", ("stage",), buckets=DEFAULT_BUCKETS, registry=REGISTRY)
+REQUEST_SECONDS = Histogram("resume_request_seconds", "End-to-end chat request duration", ("outcome",), buckets=DEFAULT_BUCKETS, registry=REGISTRY)
+REQUESTS = Counter("resume_requests", "Chat requests by outcome", ("outcome",), registry=REGISTRY)
+AGENT_SECONDS = Histogram("resume_agent_call_seconds", "OpenAI call duration per agent", ("agent",), buckets=DEFAULT_BUCKETS, registry=REGISTRY)
+AGENT_ERRORS = Counter("resume_agent_errors", "Failed OpenAI calls per agent", ("agent",), registry=REGISTRY)
+LLM_TOKENS = Counter("resume_llm_tokens", "OpenAI token usage", ("agent", "model", "type"), registry=REGISTRY)
+CACHE_LOOKUPS = Counter("resume_answer_cache", "Answer cache lookups", ("cache", "result"), registry=REGISTRY)
+STAGE_CACHE_LOOKUPS = Counter("resume_stage_cache", "Stage result cache lookups", ("stage", "result"), registry=REGISTRY)
+VECTOR_SECONDS = Histogram("resume_vector_search_seconds", "Vector store operation duration", ("operation", "backend"), buckets=DEFAULT_BUCKETS, registry=REGISTRY)
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    """ResumeChatbot.timing_listeners 구독자 - 히스토그램과 현재 요청의 trace 에 함께 기록"""
+    STAGE_SECONDS.labels(stage=stage).observe(seconds)
+    trace = current_trace.get()
+    if trace is not None:
+        trace.stages[stage] = trace.stages.get(stage, 0.0) + seconds
+
+
+def record_usage(agent: str, model: str, usage: Any) -> None:
+    """OpenAI 응답(또는 include_usage 스트림 마지막 청크)의 usage 를 토큰 카운터에 반영"""
+    if usage is None:
+        return
+    prompt = getattr(usage, "prompt_tokens", 0) or 0
+    completion = getattr(usage, "completion_tokens", 0) or 0
+    LLM_TOKENS.labels(agent=agent, model=model, type="prompt").inc(prompt)
+    LLM_TOKENS.labels(agent=agent, model=model, type="completion").inc(completion)
+    trace = current_trace.get()
+    if trace is not None:
+        trace.tokens[agent] = trace.tokens.get(agent, 0) + prompt + completion
+
+
+@contextmanager
+def agent_span(agent: str) -> Iterator[None]:
+    """에이전트 OpenAI 호출 하나의 소요 시간 (실패는 별도 카운터)"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        AGENT_ERRORS.labels(agent=agent).inc()
+        raise
+    finally:
+        AGENT_SECONDS.labels(agent=agent).observe(time.perf_counter() - start)
+
+
+@dataclass
+class RequestTrace:
+    """요청 하나의 단계 시간/토큰 모음 - 끝날 때 구조화 로그 한 줄로 남긴다"""
+    session_id: str
+    request_id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+    start: float = field(default_factory=time.perf_counter)
+    stages: dict[str, float] = field(default_factory=dict)
+    tokens: dict[str, int] = field(default_factory=dict)
+    outcome: Optional[str] = None  # 처리 도중 정해진 결과 (예: 캐시 적중)
+
+    def finish(self, outcome: str, **fields: Any) -> None:
+        elapsed = time.perf_counter() - self.start
+        REQUESTS.labels(outcome=outcome).inc()
+        REQUEST_SECONDS.labels(outcome=outcome).observe(elapsed)
+        if os.getenv("REQUEST_LOG", "true").lower() != "true":
+            return
+        record = {
+            "event": "chat_request",
+            "request_id": self.request_id,
+            "session_id": self.session_id,
+            "outcome": outcome,
+            "duration_ms": round(elapsed * 1000, 1),
+            "stages_ms": {stage: round(seconds * 1000, 1) for stage, seconds in self.stages.items()},
+            "tokens": self.tokens,
+            **fields,
+        }
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+
+
+current_trace: contextvars.ContextVar[Optional[RequestTrace]] = contextvars.ContextVar("resume_request_trace", default=None)
+
+
+def serve_metrics(port: Optional[int] = None, host: str = "0.0.0.0", registry: CollectorRegistry = REGISTRY) -> Any:
+    """/metrics 를 제공하는 HTTP 서버를 데몬 스레드에서 시작하고 서버를 반환 (port=0 이면 임의 포트)
+
+    start_http_server 가 (server, thread) 를 돌려주는 prometheus-client 0.20.0 이상이 필요하다.
+    """
+    port = port if port is not None else int(os.getenv("METRICS_PORT", 9090))
+    server, _ = start_http_server(port, addr=host, registry=registry)
+    return server
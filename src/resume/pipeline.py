@@ -0,0 +1,117 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+
+class PipelineAborted(Exception):
+    """abort_if 조건을 만족한 단계가 나와 파이프라인을 조기 종료"""
+    def __init__(self, stage: str, result: Any, run: "StageRun") -> None:
+        super().__init__(f"pipeline aborted at stage '{stage}'")
+        self.stage = stage
+        self.result = result
+        self.run = run
+
+
+class StageTimeout(Exception):
+    """단계가 제한 시간 안에 끝나지 않아 파이프라인을 중단"""
+    def __init__(self, stage: str, timeout: float, run: "StageRun") -> None:
+        super().__init__(f"stage '{stage}' timed out after {timeout}s")
+        self.stage = stage
+        self.timeout = timeout
+        self.run = run
+
+
+@dataclass
+class Stage:
+    name: str
+    func: Callable[..., Awaitable[Any]]
+    deps: tuple[str, ...] = ()
+    abort_if: Optional[Callable[[Any], bool]] = None
+    timeout: Optional[float] = None  # 초 (의존 단계를 기다리는 시간은 제외)
+
+
+@dataclass
+class StageRun:
+    """한 번의 실행 결과 - 단계별 결과와 소요 시간(초)"""
+    results: dict[str, Any] = field(default_factory=dict)
+    timings: dict[str, float] = field(default_factory=dict)
+
+
+class StageExecutor:
+    """의존 관계가 없는 단계끼리는 동시에 실행하는 비동기 단계 실행기
+
+    각 단계 함수는 deps 에 적힌 이름(앞선 단계 또는 run 입력값)을 키워드 인자로 받는다.
+    abort_if 가 참이 되면 아직 진행 중인 단계를 모두 취소하고 PipelineAborted 를 올린다.
+    timeout 을 넘긴 단계가 있으면 마찬가지로 나머지를 취소하고 StageTimeout 을 올린다.
+    """
+    def __init__(self) -> None:
+        self.stages: dict[str, Stage] = {}
+
+    def add(self, name: str, func: Callable[..., Awaitable[Any]], deps: tuple[str, ...] = (), abort_if: Optional[Callable[[Any], bool]] = None, timeout: Optional[float] = None) -> "StageExecutor":
+        if name in deps:
+            raise ValueError(f"stage '{name}' cannot depend on itself")
+        self.stages[name] = Stage(name, func, tuple(deps), abort_if, timeout)
+        return self
+
+    async def run(self, **inputs: Any) -> StageRun:
+        run = StageRun(results=dict(inputs))
+        tasks: dict[str, asyncio.Task] = {}
+        errors: list[Exception] = []  # 발생 순서대로 기록 (의존 단계로 전파된 예외는 제외)
+
+        for stage in self.stages.values():
+            for dep in stage.deps:
+                if dep not in self.stages and dep not in inputs:
+                    raise ValueError(f"stage '{stage.name}' depends on unknown '{dep}'")
+
+        async def execute(stage: Stage) -> Any:
+            kwargs = {}
+            for dep in stage.deps:
+                kwargs[dep] = inputs[dep] if dep in inputs else await tasks[dep]
+
+            start = time.perf_counter()
+            try:
+                if stage.timeout is None:
+                    result = await stage.func(**kwargs)
+                else:
+                    result = await asyncio.wait_for(stage.func(**kwargs), stage.timeout)
+            except asyncio.TimeoutError as e:
+                if stage.timeout is None:
+                    errors.append(e)
+                    raise
+                timed_out = StageTimeout(stage.name, stage.timeout, run)
+                errors.append(timed_out)
+                raise timed_out
+            except Exception as e:
+                errors.append(e)
+                raise
+            run.timings[stage.name] = time.perf_counter() - start
+            run.results[stage.name] = result
+
+            if stage.abort_if is not None and stage.abort_if(result):
+                aborted = PipelineAborted(stage.name, result, run)
+                errors.append(aborted)
+                raise aborted
+            return result
+
+        # 모든 단계를 먼저 Task 로 띄우고, 각 단계는 자기 의존 단계만 기다린다
+        for stage in self.stages.values():
+            tasks[stage.name] = asyncio.ensure_future(execute(stage))
+
+        try:
+            await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_EXCEPTION)
+            if errors:
+                # 가장 먼저 실패(또는 조기 종료)한 단계 기준으로 나머지 분기는 취소
+                raise errors[0]
+        finally:
+            pending = [t for t in tasks.values() if not t.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            # errors 로 이미 전달한 예외를 회수해 "Task exception was never retrieved" 경고를 막는다
+            for task in tasks.values():
+                if not task.cancelled():
+                    task.exception()
+
+        return run
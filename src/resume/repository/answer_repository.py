@@ -1,50 +1,116 @@
-import datetime
 import hashlib
+import os
+import time
 from typing import Any, Optional
 
 from openai import AsyncOpenAI
 from resume.agents.summarizer import Summarizer
 from resume.db.cache_store import CacheStore
+from resume.db.semantic_index import SemanticIndex
+from resume.metrics import CACHE_LOOKUPS
+from resume.utils.text import normalize_question
+
+# 모든 인스턴스가 공유하는 무효화 세대 카운터 (INCR 하면 이전 세대의 키는 더 이상 조회되지 않는다)
+GENERATION_KEY = "answer:generation"
+
 
 class AnswerRepository:
-    def __init__(self, redis: CacheStore, client: AsyncOpenAI, ttl=3600):
+    """정규화한 질문당 레코드 하나를 저장하는 답변 캐시
+
+    키: answer:{index_version}:{prompt_version}:{generation}:{sha256(정규화한 질문)}
+    - index_version: 인덱싱된 문서 내용 해시 → 이력서가 바뀌면 자동으로 새 네임스페이스
+    - prompt_version: 답변 프롬프트/모드 (ANSWER_PROMPT_VERSION)
+    - generation: Redis 카운터 → invalidate() 한 번(INCR)으로 키 스캔 없이 전체 무효화
+    카테고리별 보조 set(answer:{namespace}:category:{category})에 레코드 키를 함께 등록한다.
+    """
+    def __init__(self, redis: CacheStore, client: AsyncOpenAI, ttl=3600, semantic_threshold: Optional[float] = None, prompt_version: Optional[str] = None):
         self.redis = redis
         self.ttl = ttl
         self.summarizer = Summarizer(client)
+        # 표현만 다른 같은 질문을 잡기 위한 의미 기반 캐시
+        self.semantic_index = SemanticIndex()
+        self.semantic_threshold = semantic_threshold if semantic_threshold is not None else float(os.getenv("SEMANTIC_CACHE_THRESHOLD", 0.92))
+        self.stats = {"exact_hit": 0, "exact_miss": 0, "semantic_hit": 0, "semantic_miss": 0}
+        self.index_version = "v0"
+        self.prompt_version = prompt_version or os.getenv("ANSWER_PROMPT_VERSION", "1")
+        # generation 은 매 조회마다 읽지 않고 generation_refresh 초마다 갱신 (다른 인스턴스의 무효화는 그 안에 반영)
+        self.generation = 0
+        self.generation_refresh = float(os.getenv("ANSWER_GENERATION_REFRESH", 5))
+        self._generation_checked = float("-inf")
+        self._semantic_namespace: Optional[str] = None
 
-    def save(self, question: str, answer: str, category: str) -> None:
-        """새로운 응답을 기록"""
-        key = self._get_question_key(question)
-        entry = {
-            "category": category,
-            "question": question, 
-            "answer": answer,
-            "timestamp": datetime.datetime.now().isoformat()
-        }
-        histories = self._get(category)
-        histories.append(entry)
-        self.redis.save(key, self.ttl, histories)
-
-    def get_answer(self, question: str) -> Optional[str]:
-        value = self._get(question)
-        if not value:
-            return None
+    @property
+    def namespace(self) -> str:
+        return f"{self.index_version}:{self.prompt_version}:{self.generation}"
+
+    async def save(self, question: str, answer: str, category: str, vector: Optional[list[float]] = None, ttl: Optional[int] = None) -> None:
+        """새로운 응답을 기록 (vector 가 있으면 의미 기반 캐시에도 등록, ttl 이 없으면 기본 TTL)"""
+        ttl = ttl or self.ttl
+        await self._refresh_generation()
+        record = {"q": question, "a": answer, "c": category, "t": int(time.time())}
+        await self.redis.save(self._get_question_key(question), ttl, record, index_sets=[self._category_key(category)])
+
+        if vector is not None:
+            self._semantic().add(vector, {"category": category, "answer": answer, "expires_at": time.time() + ttl})
 
-        # value 가 list 인 경우
-        if isinstance(value, list):
-            if len(value) > 0 and isinstance(value[-1], dict) and "answer" in value[-1]:
-                return value[-1]["answer"]
+    async def get_answer(self, question: str) -> Optional[str]:
+        return (await self.get_answers([question]))[0]
+
+    async def get_answers(self, questions: list[str]) -> list[Optional[str]]:
+        """여러 질문의 캐시 답변을 MGET 한 번으로 조회"""
+        await self._refresh_generation()
+        records = await self.redis.get_many([self._get_question_key(q) for q in questions])
+        answers = [record.get("a") if isinstance(record, dict) else None for record in records]
+        for answer in answers:
+            self.stats["exact_hit" if answer else "exact_miss"] += 1
+            CACHE_LOOKUPS.labels(cache="exact", result="hit" if answer else "miss").inc()
+        return answers
+
+    async def get_category_records(self, category: str, limit: int = 50) -> list[dict[str, Any]]:
+        """카테고리 보조 set 에 등록된 현재 네임스페이스의 레코드들 (만료된 키는 제외)"""
+        await self._refresh_generation()
+        keys = (await self.redis.set_members(self._category_key(category)))[:limit]
+        if not keys:
+            return []
+        return [record for record in await self.redis.get_many(keys) if isinstance(record, dict) and record.get("a")]
+
+    async def invalidate(self) -> int:
+        """generation 을 올려 현재 네임스페이스의 답변을 모두 무효화 (O(1), 키 스캔 없음)"""
+        self.generation = await self.redis.incr(GENERATION_KEY)
+        self._generation_checked = time.monotonic()
+        return self.generation
+
+    def get_similar_answer(self, vector: list[float], category: str) -> Optional[str]:
+        """같은 카테고리에서 코사인 유사도가 임계값 이상인 (만료되지 않은) 캐시 답변"""
+        entry, score = self._semantic().search(vector, category)
+        if entry is None or score < self.semantic_threshold:
+            self.stats["semantic_miss"] += 1
+            CACHE_LOOKUPS.labels(cache="semantic", result="miss").inc()
             return None
+        self.stats["semantic_hit"] += 1
+        CACHE_LOOKUPS.labels(cache="semantic", result="hit").inc()
+        return entry["answer"]
+
+    def _semantic(self) -> SemanticIndex:
+        """네임스페이스가 바뀌면 의미 기반 캐시도 비운다"""
+        if self._semantic_namespace != self.namespace:
+            self.semantic_index = SemanticIndex(self.semantic_index.max_size)
+            self._semantic_namespace = self.namespace
+        return self.semantic_index
 
-        # value 가 dict 인 경우
-        if isinstance(value, dict) and "answer" in value:
-            return value["answer"]
+    async def _refresh_generation(self) -> None:
+        now = time.monotonic()
+        if now - self._generation_checked < self.generation_refresh:
+            return
+        self._generation_checked = now
+        generation = await self.redis.get_counter(GENERATION_KEY)
+        if generation is not None:
+            # Redis 장애 중에는 마지막으로 알던 세대를 유지
+            self.generation = generation
 
-        return None
-        
     def _get_question_key(self, question: str) -> str:
-        return hashlib.sha256(question.encode()).hexdigest()
-    
-    def _get(self, question: str) -> list[dict[str, Any]]:
-        key = self._get_question_key(question)
-        return self.redis.get(key)
\ No newline at end of file
+        digest = hashlib.sha256(normalize_question(question).encode()).hexdigest()
+        return f"answer:{self.namespace}:{digest}"
+
+    def _category_key(self, category: str) -> str:
+        return f"answer:{self.namespace}:category:{category}"
@@ -1,42 +1,124 @@
-from typing import Any
+import asyncio
+from typing import Any, Optional
 
 from openai import AsyncOpenAI
 from resume.agents.summarizer import Summarizer
-from resume.db.cache_store import CacheStore
+from resume.db.cache_store import REDIS_ERRORS, CacheStore
 
 class HistoryRepository:
-    def __init__(self, redis: CacheStore, client: AsyncOpenAI, ttl=3600):
+    """세션 대화 기록 - 턴은 Redis 리스트에 append 하고, 오래된 턴은 백그라운드에서 요약으로 압축"""
+    def __init__(self, redis: CacheStore, client: AsyncOpenAI, ttl=3600, keep_turns: int = 5, compact_after: int = 10, compaction_lock_ttl: int = 60):
         self.redis = redis
         self.ttl = ttl
         self.summarizer = Summarizer(client)
+        self.keep_turns = keep_turns  # 압축 후 원문 그대로 남길 최근 턴 수
+        self.compact_after = compact_after  # 턴이 이 수를 넘으면 압축 시작
+        self.compaction_lock_ttl = compaction_lock_ttl  # 레플리카 간 압축 락 TTL(초) - 요약이 이보다 오래 걸리면 락이 풀린다
+        self._compacting: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
 
-    def save(self, session_id: str, q: str, a: str) -> None:
-        """새로운 질답을 기록"""
-        key = f"chat:{session_id}:history"
-        history = self.get(session_id)
-        history.append({"q": q, "a": a})
-        self.redis.save(key, self.ttl, history)
-    
-    def set(self, session_id: str, history: list[dict[str, Any]]) -> None:
+    async def save(self, session_id: str, q: str, a: str) -> None:
+        """새로운 질답을 기록 (RPUSH + TTL 갱신 한 번의 왕복)"""
+        if not self.redis.available:
+            return  # Redis 장애 중에는 대화 기록 없이 답변만 제공
+        try:
+            async with self.redis.pipeline() as pipe:
+                pipe.rpush(self._turns_key(session_id), self.redis.encode({"q": q, "a": a}))
+                pipe.expire(self._turns_key(session_id), self.ttl)
+                pipe.expire(self._summary_key(session_id), self.ttl)
+                length, _, _ = await pipe.execute()
+        except REDIS_ERRORS as e:
+            self.redis.mark_down(e)
+            return
+
+        if length > self.compact_after:
+            self._schedule_compaction(session_id)
+
+    async def set(self, session_id: str, history: list[dict[str, Any]]) -> None:
         """history 전체를 갱신"""
-        key = f"chat:{session_id}:history"
-        self.redis.save(key, self.ttl, history)
+        summaries = [turn["summary"] for turn in history if "summary" in turn]
+        turns = [turn for turn in history if "summary" not in turn]
+        async with self.redis.pipeline() as pipe:
+            pipe.delete(self._turns_key(session_id), self._summary_key(session_id))
+            if turns:
+                pipe.rpush(self._turns_key(session_id), *[self.redis.encode(turn) for turn in turns])
+                pipe.expire(self._turns_key(session_id), self.ttl)
+            if summaries:
+                pipe.setex(self._summary_key(session_id), self.ttl, self.redis.encode(summaries[-1]))
+            await pipe.execute()
+
+    async def get(self, session_id: str) -> list[dict[str, Any]]:
+        return await self.redis.get_list(self._turns_key(session_id))
 
-    def get(self, session_id: str) -> list[dict[str, Any]]:
-        key = f"chat:{session_id}:history"
-        return self.redis.get(key)
-        
+    async def get_window(self, session_id: str, n: int = 5) -> list[dict[str, Any]]:
+        """[이전 대화 요약] + 최근 n 턴을 한 번의 왕복으로 조회"""
+        if not self.redis.available:
+            return []
+        try:
+            async with self.redis.pipeline() as pipe:
+                pipe.get(self._summary_key(session_id))
+                pipe.lrange(self._turns_key(session_id), -n, -1)
+                summary, turns = await pipe.execute()
+        except REDIS_ERRORS as e:
+            self.redis.mark_down(e)
+            return []
 
-    def get_window(self, session_id: str, n: int = 5) -> list[dict[str, Any]]:
-        history = self.get(session_id)
-        return history[-n:]
+        window = [{"summary": self.redis.decode(summary)}] if summary else []
+        return window + [self.redis.decode(turn) for turn in turns]
 
     async def get_summary(self, session_id: str, n: int = 10) -> list[dict[str, Any]]:
-        history = self.get(session_id)
-        if len(history) > n:
-            summary = await self.summarizer(history[:-5])  
-            new_history = [{"summary": summary}] + history[-5:]  
-            self.set(session_id, new_history) 
-            return new_history
-        return history
+        # 요약은 백그라운드 압축에서 만들어지므로 요청 경로에서는 창만 읽는다
+        return await self.get_window(session_id, n)
+
+    def _schedule_compaction(self, session_id: str) -> None:
+        if session_id in self._compacting:
+            return
+        self._compacting.add(session_id)
+        task = asyncio.create_task(self._compact(session_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _compact(self, session_id: str) -> None:
+        """최근 keep_turns 를 제외한 오래된 턴을 기존 요약과 합쳐 다시 요약하고 리스트 앞부분을 잘라냄
+
+        같은 세션을 여러 레플리카가 동시에 압축하면 같은 앞부분을 두 번 잘라 턴이 사라지므로
+        Redis 락(SET NX)을 잡은 쪽만 압축한다.
+        """
+        locked = False
+        try:
+            locked = bool(await self.redis.redis.set(self._lock_key(session_id), self.redis.instance_id, nx=True, ex=self.compaction_lock_ttl))
+            if not locked:
+                return
+            async with self.redis.pipeline() as pipe:
+                pipe.get(self._summary_key(session_id))
+                pipe.lrange(self._turns_key(session_id), 0, -(self.keep_turns + 1))
+                summary, old_turns = await pipe.execute()
+            if not old_turns:
+                return
+
+            previous: Optional[str] = self.redis.decode(summary) if summary else None
+            new_summary = await self.summarizer.summarize_history([self.redis.decode(t) for t in old_turns], previous)
+
+            # 요약하는 동안 뒤에 추가된 턴은 남기고, 요약에 반영된 앞부분만 잘라낸다
+            async with self.redis.pipeline() as pipe:
+                pipe.setex(self._summary_key(session_id), self.ttl, self.redis.encode(new_summary))
+                pipe.ltrim(self._turns_key(session_id), len(old_turns), -1)
+                await pipe.execute()
+        except Exception as e:
+            print(f"대화 요약 실패 ({session_id}): {e}")
+        finally:
+            if locked:
+                try:
+                    await self.redis.redis.delete(self._lock_key(session_id))
+                except REDIS_ERRORS as e:
+                    self.redis.mark_down(e)
+            self._compacting.discard(session_id)
+
+    def _turns_key(self, session_id: str) -> str:
+        return f"chat:{session_id}:turns"
+
+    def _summary_key(self, session_id: str) -> str:
+        return f"chat:{session_id}:summary"
 
+    def _lock_key(self, session_id: str) -> str:
+        return f"chat:{session_id}:compacting"
@@ -0,0 +1,47 @@
+import hashlib
+import os
+from typing import Any, Optional
+
+from resume.db.cache_store import CacheStore
+from resume.db.local_cache import LocalCache
+from resume.metrics import STAGE_CACHE_LOOKUPS
+from resume.utils.text import normalize_question
+
+
+# 인덱스와 무관한 단계 - 재인덱싱해도 결과를 그대로 재사용한다
+INDEX_INDEPENDENT_STAGES = ("classify",)
+
+
+class StageResultRepository:
+    """질문 분류/컨텍스트 검색처럼 정규화한 질문(과 인덱스 버전)만으로 결정되는 단계 결과 캐시
+
+    답변 캐시와 달리 세션 대화 기록과 무관하므로 다른 세션의 같은 질문에도 재사용한다.
+    검색 결과 키에는 인덱스 버전이 들어가 재인덱싱하면 자동으로 조회되지 않고,
+    분류 결과 키에는 넣지 않아 재인덱싱 후에도 이미 비용을 치른 LLM 분류를 다시 쓴다.
+    """
+    def __init__(self, redis: Optional[CacheStore] = None, ttl: Optional[int] = None) -> None:
+        # 같은 키의 값은 바뀌지 않으므로 L1 을 답변 캐시보다 오래 유지
+        self.redis = redis or CacheStore(LocalCache(
+            max_size=int(os.getenv("STAGE_L1_CACHE_SIZE", 1024)),
+            ttl=float(os.getenv("STAGE_L1_CACHE_TTL", 600)),
+            negative_ttl=float(os.getenv("L1_NEGATIVE_TTL", 5)),
+        ))
+        self.ttl = ttl or int(os.getenv("STAGE_CACHE_TTL", 86400))
+        self.index_version = "v0"
+        self.stats = {"hit": 0, "miss": 0}
+
+    async def get(self, stage: str, question: str) -> Optional[dict[str, Any]]:
+        value = await self.redis.get(self._key(stage, question))
+        hit = isinstance(value, dict) and bool(value)
+        self.stats["hit" if hit else "miss"] += 1
+        STAGE_CACHE_LOOKUPS.labels(stage=stage, result="hit" if hit else "miss").inc()
+        return value if hit else None
+
+    async def save(self, stage: str, question: str, value: dict[str, Any]) -> None:
+        await self.redis.save(self._key(stage, question), self.ttl, value)
+
+    def _key(self, stage: str, question: str) -> str:
+        digest = hashlib.sha256(normalize_question(question).encode()).hexdigest()
+        if stage in INDEX_INDEPENDENT_STAGES:
+            return f"stage:{stage}:{digest}"
+        return f"stage:{self.index_version}:{stage}:{digest}"
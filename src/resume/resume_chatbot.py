@@ -1,67 +1,514 @@
-from openai import AsyncOpenAI
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable, Optional
+from resume.admission import PRIORITY_FOLLOW_UP, PRIORITY_NEW, AdmissionController, Overloaded, closest_answer
 from resume.agents.classifier import Classifier
+from resume.agents.local_classifier import DOC_TYPES
 from resume.agents.persona import Persona
 from resume.agents.refiner import Refiner
 from resume.agents.retriever import Retriever
 from resume.db.cache_store import CacheStore
 from resume.db.vector_store import VectorStore
+from resume.llm_client import build_openai_client
+from resume.metrics import RequestTrace, current_trace, observe_stage
+from resume.pipeline import PipelineAborted, StageExecutor, StageTimeout
+from resume.singleflight import build_single_flight
+from resume.utils.text import normalize_question
 from resume.repository.answer_repository import AnswerRepository
 from resume.repository.history_repository import HistoryRepository
+from resume.repository.stage_repository import StageResultRepository
 from dotenv import load_dotenv
 
+NO_INFO_ANSWER = "제 이력서나 요약에는 해당 정보가 포함되어 있지 않아서 답변드리기 어려워요."
+PERSONA_NO_INFO = "제 이력서에는 해당 정보가 없습니다."
+NOT_READY_ANSWER = "지금은 답변을 준비하고 있어요. 잠시 후 다시 질문해 주세요."
+TIMEOUT_ANSWER = "지금은 답변이 평소보다 오래 걸리고 있어요. 잠시 후 다시 질문해 주세요."
+OVERLOADED_ANSWER = "지금 질문이 많이 몰려 있어요. 잠시 후 다시 질문해 주세요."
+
+# 단계별 제한 시간(초) - STAGE_TIMEOUT_<단계 이름> 환경변수로 조정 (refine 은 스트리밍 시 토큰 사이 대기 시간)
+STAGE_TIMEOUTS = {
+    "embed": 5.0,
+    "gate": 3.0,
+    "classify": 6.0,
+    "retrieve_cache": 1.0,
+    "prefetch": 3.0,
+    "semantic": 1.0,
+    "retrieve": 5.0,
+    "persona": 20.0,
+    "refine": 20.0,
+}
+
+
+def stage_timeout(stage: str) -> float:
+    return float(os.getenv(f"STAGE_TIMEOUT_{stage.upper()}", STAGE_TIMEOUTS[stage]))
+
+# 답변 생성 모드: Persona 초안 → Refiner 보정 (two_stage) / Persona 가 스타일까지 한 번에 (single_pass)
+TWO_STAGE = "two_stage"
+SINGLE_PASS = "single_pass"
+
+
+@dataclass
+class Draft:
+    """스타일 보정 직전까지의 파이프라인 결과"""
+    answer: Optional[str] = None  # 보정 없이 바로 돌려줄 답변 (의미 기반 캐시, 답변 불가)
+    draft: Optional[str] = None
+    context: Optional[str] = None
+    category: Optional[str] = None
+    vector: Optional[list[float]] = None
+    timings: dict[str, float] = field(default_factory=dict)  # 단계별 소요 시간(초)
+
 
 class ResumeChatbot:
-    def __init__(self, gcs_bucket: str, gcs_projects_path: str, gcs_qna_path: str, gcs_introduce_path: str, use_gcs = True, cache_file: str = "answer_cache.json"):
+    def __init__(self, gcs_bucket: str, gcs_projects_path: str, gcs_qna_path: str, gcs_introduce_path: str, use_gcs = True, cache_file: str = "answer_cache.json", answer_mode: Optional[str] = None, fast_startup: bool = False, admission: Optional[AdmissionController] = None):
         load_dotenv(override=True)
-        self.client = AsyncOpenAI()
-        db = VectorStore(
-            gcs_bucket, 
-            gcs_projects_path,
-            gcs_qna_path,
-            gcs_introduce_path,
-            use_gcs,
-            cache_file,
-        )
+        self.answer_mode = answer_mode or os.getenv("ANSWER_MODE", TWO_STAGE)
+        if self.answer_mode not in (TWO_STAGE, SINGLE_PASS):
+            raise ValueError(f"지원하지 않는 answer_mode 입니다: {self.answer_mode}")
+        # 채팅/임베딩이 함께 쓰는 연결 풀 + 모델별 속도 제한 클라이언트
+        self.client = build_openai_client()
+        self._store_args = (gcs_bucket, gcs_projects_path, gcs_qna_path, gcs_introduce_path, use_gcs, cache_file)
+        # 벡터 스토어 준비 여부 (fast_startup 이면 백그라운드에서 준비)
+        self.ready = threading.Event()
+        self.ready_timeout = float(os.getenv("READY_TIMEOUT", 30))
+        self.warmup_error: Optional[Exception] = None
+        # 준비 완료/최종 실패를 기다리는 요청들 (스레드를 잡지 않도록 이벤트 루프의 future 로 기다린다)
+        self._ready_waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._ready_lock = threading.Lock()
         cache = CacheStore()
-        self.answer_repository = AnswerRepository(cache, self.client)
+        # 답변 모드가 다르면 같은 질문이라도 답변이 다르므로 캐시 네임스페이스를 나눈다
+        self.answer_repository = AnswerRepository(cache, self.client, prompt_version=f"{os.getenv('ANSWER_PROMPT_VERSION', '1')}.{self.answer_mode}")
+        # 인덱스 준비 전에도 캐시 적중을 돌려줄 수 있도록 저장된 인덱스 버전을 먼저 사용
+        # 분류/검색 결과 캐시 (대화 기록이 달라 답변 캐시를 못 쓰는 반복 질문용)
+        self.stage_repository = StageResultRepository()
+        self._set_index_version(VectorStore.read_manifest().get("index_version", "v0"))
         self.history_repository = HistoryRepository(cache, self.client)
-        self.classifier = Classifier(self.client)
-        self.retriever = Retriever(self.client, db)
+        self.single_flight = build_single_flight(cache)
+        # 의미 기반 캐시 단계 사용 여부 (warm-up 은 질문마다 자기 키로 답변을 저장해야 하므로 끈다)
+        self.semantic_cache = True
+        # 전체 파이프라인 동시 실행 제한 (기본은 제한 없음 - 웹 앱에서 지정)
+        self.admission = admission or AdmissionController(max_concurrent=0)
+        self.classifier = Classifier(self.client, lambda texts: self.retriever.store.embed_documents(texts), stage_cache=self.stage_repository)
+        self.retriever = Retriever(self.client, None)
         self.persona = Persona(self.client, self.history_repository)
         self.refiner = Refiner(self.client)
+        # 단계별 소요 시간 구독자 (stage 이름, 초) - 기본은 메트릭 히스토그램 + 요청 trace, 벤치마크에서 추가 등록
+        self.timing_listeners: list[Callable[[str, float], None]] = [observe_stage]
+        self.pipeline = self._build_pipeline(include_persona=True)
+        self.context_pipeline = self._build_pipeline(include_persona=False)
+
+        if fast_startup:
+            self.start_warmup()
+        else:
+            self.warm_up()
+
+    def warm_up(self) -> None:
+        """prepare() 를 새 이벤트 루프에서 실행 (생성자/warm-up 스레드처럼 실행 중인 루프가 없는 곳에서 호출)"""
+        asyncio.run(self.prepare())
+
+    async def prepare(self) -> None:
+        """벡터 스토어(원본 확인, 인덱스 동기화)를 준비하고 ready 를 표시"""
+        store = await VectorStore(*self._store_args).sync()
+        self.retriever.store = store
+        self._set_index_version(store.index_version)
+        self._finish_warmup()
+
+    def _set_index_version(self, index_version: str) -> None:
+        """캐시 키 네임스페이스를 인덱스 버전에 맞춘다 (재인덱싱하면 이전 답변/단계 결과는 조회되지 않음)"""
+        self.answer_repository.index_version = index_version
+        self.stage_repository.index_version = index_version
 
-    async def chat(self, message: str, history: list, session_id: str):
+    def start_warmup(self, exit_on_failure: Optional[bool] = None) -> threading.Thread:
+        """HTTP 서버가 먼저 뜰 수 있도록 벡터 스토어 준비를 백그라운드 스레드에서 실행
+
+        실패하면 WARMUP_ATTEMPTS 번까지 지수 백오프(WARMUP_BACKOFF 초부터)로 다시 시도한다.
+        끝내 실패하면 기다리던 요청을 깨우고, exit_on_failure(기본 WARMUP_EXIT_ON_FAILURE) 면
+        플랫폼이 재시작할 수 있도록 프로세스를 종료한다.
+        """
+        attempts = max(1, int(os.getenv("WARMUP_ATTEMPTS", 5)))
+        backoff = float(os.getenv("WARMUP_BACKOFF", 2))
+        if exit_on_failure is None:
+            exit_on_failure = os.getenv("WARMUP_EXIT_ON_FAILURE", "true").lower() == "true"
+
+        def run() -> None:
+            start = time.perf_counter()
+            for attempt in range(1, attempts + 1):
+                try:
+                    self.warm_up()
+                    print(f"벡터 스토어 준비 완료 ({time.perf_counter() - start:.1f}s)")
+                    return
+                except Exception as e:
+                    print(f"벡터 스토어 준비 실패 ({attempt}/{attempts}): {e}")
+                    if attempt == attempts:
+                        self._finish_warmup(e)
+                    else:
+                        time.sleep(min(backoff * 2 ** (attempt - 1), 60))
+            if exit_on_failure:
+                print("벡터 스토어를 준비하지 못해 프로세스를 종료합니다.", flush=True)
+                os._exit(1)
+
+        thread = threading.Thread(target=run, name="resume-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def _finish_warmup(self, error: Optional[Exception] = None) -> None:
+        """준비 완료(또는 최종 실패)를 기록하고 기다리던 요청들을 모두 깨운다"""
+        with self._ready_lock:
+            if error is None:
+                self.ready.set()
+            else:
+                self.warmup_error = error
+            waiters, self._ready_waiters = self._ready_waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(lambda f=future: f.done() or f.set_result(None))
+
+    async def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        ready = await self._wait_warmup(timeout)
+        if ready:
+            # 인덱스가 준비되면 분류기 중심 벡터를 백그라운드에서 만든다 (이미 있거나 진행/백오프 중이면 그대로)
+            self.classifier.start_centroids()
+        return ready
+
+    async def _wait_warmup(self, timeout: Optional[float]) -> bool:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._ready_lock:
+            if self.ready.is_set() or self.warmup_error is not None:
+                return self.ready.is_set()
+            self._ready_waiters.append((loop, future))
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._ready_lock:
+                if (loop, future) in self._ready_waiters:
+                    self._ready_waiters.remove((loop, future))
+        return self.ready.is_set()
+
+    def _build_pipeline(self, include_persona: bool) -> StageExecutor:
+        """게이트/분류/선검색을 동시에 돌리는 단계 그래프 (include_persona 면 Persona 답변까지)"""
+        pipeline = (
+            StageExecutor()
+            # 질문 임베딩은 한 번만 계산하고 게이트/검색에서 재사용 (정확한 용어 일치면 None - BM25 만 사용)
+            .add("embed", self._embed_stage, deps=("message",), timeout=stage_timeout("embed"))
+            .add("gate", lambda message, embed: self.retriever.is_context_valid(message, vector=embed), deps=("message", "embed"), abort_if=lambda valid: not valid, timeout=stage_timeout("gate"))
+            # 1) 질문 분류 - 질문 벡터로 로컬 분류를 먼저 시도하고, 게이트와는 동시에 진행
+            .add("classify", lambda message, embed: self.classifier.classify_question(message, vector=embed), deps=("message", "embed"), timeout=stage_timeout("classify"))
+            # 같은 질문의 검색 결과 캐시 - 임베딩과 동시에 조회하고, 있으면 선검색을 건너뛴다
+            .add("retrieve_cache", lambda message: self.stage_repository.get("retrieve", message), deps=("message",), timeout=stage_timeout("retrieve_cache"))
+            # 분류가 진행되는 동안 필터 없는 top-k 를 미리 검색
+            .add("prefetch", self._prefetch_stage, deps=("embed", "retrieve_cache"), timeout=stage_timeout("prefetch"))
+            # 표현만 다른 같은 질문이면 의미 기반 캐시 답변을 사용
+            .add("semantic", self._semantic_stage, deps=("embed", "classify"), abort_if=bool, timeout=stage_timeout("semantic"))
+            # 2) 관련 컨텍스트 검색
+            .add("retrieve", self._retrieve_stage, deps=("message", "embed", "classify", "retrieve_cache", "prefetch", "gate", "semantic"), abort_if=lambda context: not context.strip(), timeout=stage_timeout("retrieve"))
+        )
+        if include_persona:
+            # 3) Persona 답변 생성
+            pipeline.add("persona", self._persona_stage, deps=("message", "session_id", "classify", "retrieve"), abort_if=lambda answer: PERSONA_NO_INFO in answer, timeout=stage_timeout("persona"))
+        return pipeline
+
+    async def chat(self, message: str, history: list, session_id: str) -> str:
+        trace = RequestTrace(session_id)
+        token = current_trace.set(trace)
+        outcome = "error"
+        try:
+            answer = await self._chat(message, session_id, self._priority(history))
+            outcome = self._outcome(trace, answer)
+            return answer
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            self._end_trace(trace, token, outcome)
+
+    async def chat_stream(self, message: str, history: list, session_id: str) -> AsyncIterator[str]:
+        """chat 의 스트리밍 버전 - 마지막 생성 단계의 토큰을 누적된 답변 형태로 yield"""
+        trace = RequestTrace(session_id)
+        token = current_trace.set(trace)
+        outcome = "error"
+        answer = None
+        stream = self._chat_stream(message, session_id, self._priority(history))
+        try:
+            async for answer in stream:
+                yield answer
+            outcome = self._outcome(trace, answer)
+        except (GeneratorExit, asyncio.CancelledError):
+            # 클라이언트가 스트림을 끊은 경우
+            outcome = "cancelled"
+            raise
+        finally:
+            # 안쪽 generator 의 정리(single-flight 종료 등)가 GC 를 기다리지 않도록 바로 닫는다
+            await stream.aclose()
+            self._end_trace(trace, token, outcome)
+
+    async def _chat(self, message: str, session_id: str, priority: int = PRIORITY_NEW) -> str:
         # 캐시에 있다면 답변 
-        cached = self.answer_repository.get_answer(message)
+        cached = await self._cache_lookup(message)
         if cached:
             return cached
-        
-        if not await self.retriever.is_context_valid(message):
-            return "제 이력서나 요약에는 해당 정보가 포함되어 있지 않아서 답변드리기 어려워요."
 
-        # 1) 질문 분류
-        category_info = await self.classifier.classify_question(message)
-        category = category_info["category"]
+        if not await self.wait_ready(self.ready_timeout):
+            return NOT_READY_ANSWER
+
+        # 같은 질문의 동시 요청들은 하나의 파이프라인 결과를 공유 (계산하는 쪽만 실행 슬롯을 잡는다)
+        try:
+            answer, recorded = await self.single_flight.do(self._flight_key(message), lambda: self._admitted(message, session_id, priority))
+        except Overloaded:
+            return await self._shed(message)
+        if recorded:
+            # 5) 대화 기록 저장 (답변 캐시는 답변을 계산한 쪽에서 저장)
+            await self._save_history(session_id, message, answer)
+        return answer
+
+    async def _chat_stream(self, message: str, session_id: str, priority: int = PRIORITY_NEW) -> AsyncIterator[str]:
+        # 캐시 적중은 바로 내보낸다
+        cached = await self._cache_lookup(message)
+        if cached:
+            yield cached
+            return
+
+        if not await self.wait_ready(self.ready_timeout):
+            yield NOT_READY_ANSWER
+            return
+
+        key = self._flight_key(message)
+        shared = self.single_flight.join(key)
+        remote = self.single_flight.remote
+        if shared is not None or (remote is not None and not await remote.try_lead(key)):
+            # 같은 질문을 이미 계산 중이면 그 결과를 기다렸다가 한 번에 내보낸다
+            # (리더가 취소되면 do 안에서 이 요청이 다시 리더가 되어 직접 계산한다)
+            try:
+                answer, recorded = await self.single_flight.do(key, lambda: self._admitted(message, session_id, priority))
+            except Overloaded:
+                yield await self._shed(message)
+                return
+            if recorded:
+                await self._save_history(session_id, message, answer)
+            yield answer
+            return
+
+        # 이 요청이 리더 - 토큰을 직접 스트리밍하고 끝나면 기다리던 요청들에 결과를 넘긴다
+        future = self.single_flight.begin(key)
+        result = None
+        shed = False
+        try:
+            async with self.admission.slot(priority):
+                async for partial, result in self._generate_stream(message, session_id):
+                    yield partial
+        except Overloaded as e:
+            # 슬롯을 받지 못함 - 기다리던 요청들도 같은 대체 답변을 받는다
+            self.single_flight.finish(key, future, error=e)
+            shed = True
+        except BaseException as e:
+            self.single_flight.finish(key, future, error=e)
+            raise
+        finally:
+            if remote is not None:
+                if result is not None:
+                    await remote.publish(key, result)
+                await remote.release(key)
+        if shed:
+            yield await self._shed(message)
+            return
+        self.single_flight.finish(key, future, result)
+
+        if result is not None and result[1]:
+            await self._save_history(session_id, message, result[0])
+
+    async def _admitted(self, message: str, session_id: str, priority: int) -> tuple[str, bool]:
+        async with self.admission.slot(priority):
+            return await self._generate(message, session_id)
+
+    async def _shed(self, message: str) -> str:
+        """과부하로 파이프라인을 돌리지 못한 질문 - 같은 카테고리(모르면 전체)의 가장 비슷한 캐시 답변으로 대신한다"""
+        trace = current_trace.get()
+        if trace is not None:
+            trace.outcome = "shed"
+        local = self.classifier.local.classify(message)
+        categories = [local["category"]] if local else list(DOC_TYPES)
+        records = []
+        for category in categories:
+            records.extend(await self.answer_repository.get_category_records(category))
+        return closest_answer(message, records) or OVERLOADED_ANSWER
+
+    def _priority(self, history: list) -> int:
+        """이미 답변을 받은 턴이 있는 세션(대화 중인 방문자)을 먼저 처리"""
+        follow_up = any(isinstance(turn, (list, tuple)) and len(turn) > 1 and turn[1] for turn in history or [])
+        return PRIORITY_FOLLOW_UP if follow_up else PRIORITY_NEW
+
+    async def _generate(self, message: str, session_id: str, answer_ttl: Optional[int] = None) -> tuple[str, bool]:
+        """파이프라인 전체 실행 → (답변, 대화 기록에 남길 답변인지)"""
+        draft = await self._draft(message, session_id, self.pipeline)
+        if draft.answer is not None:
+            return draft.answer, False
+
+        if self.answer_mode == SINGLE_PASS:
+            # single-pass 모드에서는 Persona 답변이 곧 최종 답변
+            final_answer = draft.draft
+        else:
+            # 4) 스타일 보정 (시간 안에 끝나지 않으면 보정 전 초안을 그대로 답변, 캐시에는 남기지 않음)
+            try:
+                final_answer = await self._timed(draft, "refine", asyncio.wait_for(self.refiner.refine_answer(draft.draft), stage_timeout("refine")))
+            except asyncio.TimeoutError:
+                return draft.draft, True
+
+        await self.answer_repository.save(message, final_answer, draft.category, draft.vector, ttl=answer_ttl)
+        return final_answer, True
+
+    async def _generate_stream(self, message: str, session_id: str) -> AsyncIterator[tuple[str, Optional[tuple[str, bool]]]]:
+        """_generate 의 스트리밍 버전 - (누적 답변, 마지막에만 채워지는 최종 결과) 를 yield"""
+        # single-pass 모드에서는 Persona 단계 자체를 스트리밍하므로 컨텍스트 검색까지만 실행
+        pipeline = self.context_pipeline if self.answer_mode == SINGLE_PASS else self.pipeline
+        draft = await self._draft(message, session_id, pipeline)
+        if draft.answer is not None:
+            yield draft.answer, (draft.answer, False)
+            return
+
+        final_answer = ""
+        start = time.perf_counter()
+        try:
+            if self.answer_mode == SINGLE_PASS:
+                stream = self.persona.persona_answer_stream(message, draft.category, draft.context, session_id, single_pass=True)
+                async for token in self._with_timeout(stream, stage_timeout("persona")):
+                    final_answer += token
+                    # 답변 불가 문구일 수 있는 동안은 내보내지 않고 보류
+                    if PERSONA_NO_INFO.startswith(final_answer.strip()):
+                        continue
+                    yield final_answer, None
+                if PERSONA_NO_INFO in final_answer:
+                    yield NO_INFO_ANSWER, (NO_INFO_ANSWER, False)
+                    return
+            else:
+                async for token in self._with_timeout(self.refiner.refine_answer_stream(draft.draft), stage_timeout("refine")):
+                    final_answer += token
+                    yield final_answer, None
+        except asyncio.TimeoutError:
+            # 스트림이 멈추면 지금까지의 답변(없으면 보정 전 초안)으로 마무리하고 캐시에는 남기지 않는다
+            fallback = final_answer or draft.draft or TIMEOUT_ANSWER
+            yield fallback, (fallback, fallback != TIMEOUT_ANSWER)
+            return
+        finally:
+            self._emit("persona" if self.answer_mode == SINGLE_PASS else "refine", time.perf_counter() - start)
+
+        # 스트림이 끝난 뒤 전체 답변을 저장
+        await self.answer_repository.save(message, final_answer, draft.category, draft.vector)
+        yield final_answer, (final_answer, True)
+
+    async def _with_timeout(self, stream: AsyncIterator[str], timeout: float) -> AsyncIterator[str]:
+        """토큰 사이 대기 시간이 timeout 을 넘으면 asyncio.TimeoutError"""
+        try:
+            while True:
+                try:
+                    token = await asyncio.wait_for(stream.__anext__(), timeout)
+                except StopAsyncIteration:
+                    return
+                yield token
+        finally:
+            await stream.aclose()
+
+    async def _cache_lookup(self, message: str) -> Optional[str]:
+        start = time.perf_counter()
+        try:
+            answer = await self.answer_repository.get_answer(message)
+        finally:
+            self._emit("cache_lookup", time.perf_counter() - start)
+        trace = current_trace.get()
+        if answer and trace is not None:
+            trace.outcome = "cache_hit"
+        return answer
+
+    async def _save_history(self, session_id: str, message: str, answer: str) -> None:
+        start = time.perf_counter()
+        try:
+            await self.history_repository.save(session_id, message, answer)
+        finally:
+            self._emit("history_save", time.perf_counter() - start)
+
+    def _outcome(self, trace: RequestTrace, answer: Optional[str]) -> str:
+        """요청 로그/메트릭용 결과 분류"""
+        if trace.outcome:
+            return trace.outcome
+        return {
+            NOT_READY_ANSWER: "not_ready",
+            TIMEOUT_ANSWER: "timeout",
+            NO_INFO_ANSWER: "no_info",
+        }.get(answer, "answered")
+
+    def _end_trace(self, trace: RequestTrace, token, outcome: str) -> None:
+        try:
+            current_trace.reset(token)
+        except ValueError:
+            # 스트리밍 generator 가 다른 컨텍스트에서 닫힌 경우
+            current_trace.set(None)
+        trace.finish(outcome, index_version=self.answer_repository.index_version, answer_mode=self.answer_mode)
+
+    def _emit(self, stage: str, seconds: float) -> None:
+        for listener in self.timing_listeners:
+            listener(stage, seconds)
+
+    def _flight_key(self, message: str) -> str:
+        return f"{self.retriever.store.index_version}:{normalize_question(message)}"
+
+    async def _draft(self, message: str, session_id: str, pipeline: StageExecutor) -> Draft:
+        """마지막 생성 단계 전까지의 파이프라인 실행"""
+        try:
+            run = await pipeline.run(message=message, session_id=session_id)
+        except PipelineAborted as e:
+            answer = e.result if e.stage == "semantic" else NO_INFO_ANSWER
+            return self._emitted(Draft(answer=answer, timings=e.run.timings))
+        except StageTimeout as e:
+            print(f"파이프라인 시간 초과: {e}")
+            return self._emitted(Draft(answer=TIMEOUT_ANSWER, timings=e.run.timings))
+
+        return self._emitted(Draft(
+            draft=run.results.get("persona"),
+            context=run.results["retrieve"],
+            category=run.results["classify"]["category"],
+            vector=run.results["embed"],
+            timings=run.timings,
+        ))
 
-        # 2) 관련 컨텍스트 검색
-        context = await self.retriever.retrieve_context(message, category_info)
-        if not context.strip():
-            final_answer = "제 이력서나 요약에는 해당 정보가 포함되어 있지 않아서 답변드리기 어려워요."
-            return final_answer
+    def _emitted(self, draft: Draft) -> Draft:
+        """파이프라인 단계 소요 시간을 구독자에게 알린 뒤 그대로 반환"""
+        for stage, seconds in draft.timings.items():
+            self._emit(stage, seconds)
+        return draft
 
-        # 3) Persona 답변 생성
-        # recent_history = self.history_store.get_summary(session_id, self.summarize_history)
-        draft_answer = await self.persona.persona_answer(message, category, context, session_id)
-        if "제 이력서에는 해당 정보가 없습니다." in draft_answer:
-            return "제 이력서나 요약에는 해당 정보가 포함되어 있지 않아서 답변드리기 어려워요."
+    async def _timed(self, draft: Draft, stage: str, coro: Awaitable[str]) -> str:
+        start = time.perf_counter()
+        result = await coro
+        draft.timings[stage] = time.perf_counter() - start
+        self._emit(stage, draft.timings[stage])
+        return result
 
-        # 4) 스타일 보정
-        final_answer = await self.refiner.refine_answer(draft_answer)
+    async def _embed_stage(self, message: str) -> Optional[list[float]]:
+        if not self.retriever.needs_embedding(message):
+            return None
+        return await self.retriever.embed_question(message)
 
-        # 5) 대화 기록 저장
-        self.history_repository.save(session_id, message, final_answer)
-        self.answer_repository.save(message, final_answer, category)
+    async def _semantic_stage(self, embed: Optional[list[float]], classify: dict) -> Optional[str]:
+        if embed is None or not self.semantic_cache:
+            return None
+        return self.answer_repository.get_similar_answer(embed, classify["category"])
 
-        return final_answer
+    async def _prefetch_stage(self, embed: Optional[list[float]], retrieve_cache: Optional[dict]) -> list:
+        if retrieve_cache is not None:
+            # 캐시된 컨텍스트를 쓸 가능성이 높으므로 선검색 생략 (분류가 달라 못 쓰면 retrieve 단계에서 직접 검색)
+            return []
+        return await self.retriever.prefetch(embed)
 
+    async def _retrieve_stage(self, message: str, embed: Optional[list[float]], classify: dict, retrieve_cache: Optional[dict], prefetch: list, gate: bool, semantic: Optional[str]) -> str:
+        # 같은 질문이 같은 분류로 검색된 적이 있으면 검색/컨텍스트 조립을 건너뛴다
+        if retrieve_cache is not None and retrieve_cache.get("classify") == classify:
+            return retrieve_cache["context"]
+        context = await self.retriever.retrieve_context(message, classify, vector=embed, prefetched=prefetch)
+        if context.strip():
+            await self.stage_repository.save("retrieve", message, {"classify": classify, "context": context})
+        return context
 
+    async def _persona_stage(self, message: str, session_id: str, classify: dict, retrieve: str) -> str:
+        return await self.persona.persona_answer(message, classify["category"], retrieve, session_id, single_pass=self.answer_mode == SINGLE_PASS)
@@ -0,0 +1,160 @@
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Optional
+
+from resume.db.cache_store import REDIS_ERRORS, CacheStore
+
+
+class RedisSingleFlight:
+    """레플리카 간 single-flight - Redis 락을 잡은 레플리카만 계산하고 나머지는 pub/sub 으로 결과를 기다린다"""
+    def __init__(self, cache: CacheStore, lock_ttl: float = 30.0, wait_timeout: float = 20.0) -> None:
+        self.cache = cache
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+
+    async def try_lead(self, key: str) -> bool:
+        """락을 잡으면 True (Redis 장애 시에도 각자 계산하도록 True)"""
+        if not self.cache.available:
+            return True
+        try:
+            return bool(await self.cache.redis.set(self._lock_key(key), self.cache.instance_id, nx=True, px=int(self.lock_ttl * 1000)))
+        except REDIS_ERRORS as e:
+            self.cache.mark_down(e)
+            return True
+
+    async def publish(self, key: str, result: Any) -> None:
+        """결과를 잠시 보관하고 기다리는 레플리카에 알림"""
+        try:
+            encoded = self.cache.encode(result)
+            async with self.cache.pipeline() as pipe:
+                pipe.setex(self._result_key(key), int(self.lock_ttl), encoded)
+                pipe.publish(self._channel(key), encoded)
+                await pipe.execute()
+        except REDIS_ERRORS as e:
+            self.cache.mark_down(e)
+
+    async def release(self, key: str) -> None:
+        try:
+            await self.cache.redis.delete(self._lock_key(key))
+        except REDIS_ERRORS as e:
+            self.cache.mark_down(e)
+
+    async def wait(self, key: str) -> Optional[Any]:
+        """다른 레플리카의 결과를 기다림 (제한 시간 초과나 리더 실패 시 None)"""
+        pubsub = self.cache.redis.pubsub()
+        try:
+            await pubsub.subscribe(self._channel(key))
+            # 구독 전에 이미 발행된 결과가 있을 수 있으므로 보관본부터 확인
+            stored = await self.cache.redis.get(self._result_key(key))
+            if stored:
+                return self.cache.decode(stored)
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.wait_timeout
+            while loop.time() < deadline:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is not None:
+                    return self.cache.decode(message["data"])
+                if not await self.cache.redis.exists(self._lock_key(key)):
+                    # 락이 사라졌는데 결과가 없으면 리더가 실패한 것
+                    stored = await self.cache.redis.get(self._result_key(key))
+                    return self.cache.decode(stored) if stored else None
+            return None
+        except REDIS_ERRORS as e:
+            self.cache.mark_down(e)
+            return None
+        finally:
+            await pubsub.aclose()
+
+    def _lock_key(self, key: str) -> str:
+        return f"singleflight:{key}:lock"
+
+    def _result_key(self, key: str) -> str:
+        return f"singleflight:{key}:result"
+
+    def _channel(self, key: str) -> str:
+        return f"singleflight:{key}:done"
+
+
+class LeaderCancelled(Exception):
+    """리더가 취소되어 결과 없이 끝남 - 기다리던 호출자 중 하나가 다시 리더가 된다"""
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 요청들은 하나의 실행 결과를 함께 기다린다 (remote 가 있으면 레플리카 간에도)"""
+    def __init__(self, remote: Optional[RedisSingleFlight] = None) -> None:
+        self.remote = remote
+        self._calls: dict[str, asyncio.Future] = {}
+        self.stats = {"leader": 0, "shared": 0, "remote_shared": 0}
+
+    def join(self, key: str) -> Optional[asyncio.Future]:
+        """진행 중인 실행이 있으면 그 결과 Future"""
+        return self._calls.get(key)
+
+    def begin(self, key: str) -> asyncio.Future:
+        """이 호출자가 리더로서 실행을 시작함을 등록"""
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.stats["leader"] += 1
+        return future
+
+    def finish(self, key: str, future: asyncio.Future, result: Any = None, error: Optional[BaseException] = None) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if future.done():
+            return
+        if error is not None:
+            if not isinstance(error, Exception):
+                # 리더 요청이 취소됨 (클라이언트 연결 끊김 등) - 다른 요청에 취소를 전파하지 않는다
+                error = LeaderCancelled(key)
+            future.set_exception(error)
+            future.exception()  # 기다리는 쪽이 없어도 경고가 나지 않도록 조회 처리
+        else:
+            future.set_result(result)
+
+    async def wait(self, future: asyncio.Future) -> Any:
+        self.stats["shared"] += 1
+        return await asyncio.shield(future)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        shared = self.join(key)
+        while shared is not None:
+            try:
+                return await self.wait(shared)
+            except LeaderCancelled:
+                # 리더가 취소되어 항목이 지워졌으면 먼저 깨어난 호출자가 새 리더가 된다
+                shared = self.join(key)
+
+        future = self.begin(key)
+        try:
+            result = await self._lead(key, fn)
+        except BaseException as e:
+            self.finish(key, future, error=e)
+            raise
+        self.finish(key, future, result)
+        return result
+
+    async def _lead(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        if self.remote is None:
+            return await fn()
+
+        if await self.remote.try_lead(key):
+            try:
+                result = await fn()
+                await self.remote.publish(key, result)
+                return result
+            finally:
+                await self.remote.release(key)
+
+        result = await self.remote.wait(key)
+        if result is not None:
+            self.stats["remote_shared"] += 1
+            return result
+        return await fn()
+
+
+def build_single_flight(cache: CacheStore) -> SingleFlight:
+    """SINGLE_FLIGHT_DISTRIBUTED=true 이면 Redis 기반 레플리카 간 coalescing 까지 사용"""
+    if os.getenv("SINGLE_FLIGHT_DISTRIBUTED", "false").lower() == "true":
+        return SingleFlight(RedisSingleFlight(cache))
+    return SingleFlight()
@@ -0,0 +1,101 @@
+import json
+import os
+from typing import Any, Optional
+
+from resume.utils.tokens import count_tokens, get_encoding
+
+
+def render_record(record: Any, prefix: str = "") -> str:
+    """JSON 레코드를 "필드: 값" 줄로 압축 (들여쓰기/중괄호/따옴표 없이 프롬프트 토큰을 줄이기 위함)
+
+    - 값이 비어 있는 필드는 생략
+    - 문자열/숫자 리스트는 ", " 로 연결, name 이 있는 객체 리스트는 name 만 연결
+    - 중첩 객체는 "상위.하위" 라벨로 펼친다
+    """
+    if isinstance(record, list):
+        return "\n".join(render_record(item, prefix) for item in record)
+    if not isinstance(record, dict):
+        return f"{prefix}: {record}" if prefix else str(record)
+
+    lines = []
+    for key, value in record.items():
+        label = f"{prefix}.{key}" if prefix else str(key)
+        if value in (None, "", [], {}):
+            continue
+        if isinstance(value, dict):
+            lines.append(render_record(value, label))
+        elif isinstance(value, list):
+            if all(isinstance(v, dict) and "name" in v for v in value):
+                lines.append(f"{label}: {', '.join(str(v['name']) for v in value)}")
+            elif all(not isinstance(v, (dict, list)) for v in value):
+                lines.append(f"{label}: {', '.join(str(v) for v in value)}")
+            else:
+                lines.extend(render_record(v, label) if isinstance(v, dict) else f"{label}: {v}" for v in value)
+        else:
+            lines.append(f"{label}: {value}")
+    return "\n".join(lines)
+
+
+def compact_document(text: str) -> str:
+    """JSON 으로 저장된 문서(이전 버전 인덱스)도 프롬프트에 넣기 전에 압축 형식으로 변환"""
+    stripped = text.lstrip()
+    if not stripped.startswith(("{", "[")):
+        return text
+    try:
+        return render_record(json.loads(stripped))
+    except ValueError:
+        return text
+
+
+def strip_overlap(previous: str, current: str, min_overlap: int = 20) -> str:
+    """previous 의 끝과 current 의 앞이 겹치면 (CharacterTextSplitter chunk_overlap) 겹친 부분을 잘라낸다"""
+    limit = min(len(previous), len(current))
+    for size in range(limit, min_overlap - 1, -1):
+        if previous.endswith(current[:size]):
+            return current[size:].lstrip()
+    return current
+
+
+class ContextAssembler:
+    """검색 결과를 순위대로 토큰 예산(tiktoken 기준) 안에 채워 넣어 Persona 컨텍스트를 만든다"""
+    def __init__(self, max_tokens: Optional[int] = None, encoding: str = "o200k_base") -> None:
+        self.max_tokens = max_tokens if max_tokens is not None else int(os.getenv("CONTEXT_TOKEN_BUDGET", 1500))
+        self.encoding_name = encoding
+        self._encoding = None
+
+    def count_tokens(self, text: str) -> int:
+        return count_tokens(text, self._get_encoding())
+
+    def _get_encoding(self):
+        if self._encoding is None:
+            self._encoding = get_encoding(self.encoding_name) or False
+        return self._encoding
+
+    def assemble(self, snippets: list[str]) -> str:
+        """중복/겹치는 조각을 정리하고 앞(높은 순위)부터 예산에 들어가는 조각만 담는다"""
+        selected: list[str] = []
+        used = 0
+        for snippet in snippets:
+            snippet = snippet.strip()
+            for previous in selected:
+                snippet = strip_overlap(previous, snippet)
+            if not snippet or any(snippet in previous for previous in selected):
+                continue
+
+            tokens = self.count_tokens(snippet)
+            if used + tokens > self.max_tokens:
+                if not selected:
+                    # 가장 관련 있는 조각 하나가 예산보다 크면 앞부분만 담는다
+                    selected.append(self._truncate(snippet, self.max_tokens))
+                    break
+                # 더 작은 다음 조각은 들어갈 수 있으므로 계속 진행
+                continue
+            selected.append(snippet)
+            used += tokens
+        return "\n\n".join(selected)
+
+    def _truncate(self, text: str, max_tokens: int) -> str:
+        encoding = self._get_encoding()
+        if encoding:
+            return encoding.decode(encoding.encode(text)[:max_tokens])
+        return text[:max_tokens * 2]
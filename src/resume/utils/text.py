@@ -0,0 +1,12 @@
+import re
+import unicodedata
+
+_SPACES = re.compile(r"\s+")
+_TRAILING_PUNCT = re.compile(r"[\s?!.~…。？！]+$")
+
+
+def normalize_question(question: str) -> str:
+    """캐시/중복 제거 키용 질문 정규화 (NFKC, 소문자, 공백 정리, 끝 문장부호 제거)"""
+    text = unicodedata.normalize("NFKC", question).strip().lower()
+    text = _SPACES.sub(" ", text)
+    return _TRAILING_PUNCT.sub("", text)
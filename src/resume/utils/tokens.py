@@ -0,0 +1,21 @@
+from functools import lru_cache
+from typing import Any, Optional, Union
+
+
+@lru_cache(maxsize=None)
+def get_encoding(name: str) -> Optional[Any]:
+    """tiktoken 인코딩 (tiktoken 이 없거나 인코딩 파일을 받지 못하면 None, 실패도 캐시해 다시 시도하지 않음)"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(name)
+    except Exception:
+        return None
+
+
+def count_tokens(text: str, encoding: Union[str, Any, None] = "o200k_base") -> int:
+    """encoding(이름 또는 tiktoken 인코딩) 기준 토큰 수 - 인코딩이 없으면 한국어 기준 대략치"""
+    if isinstance(encoding, str):
+        encoding = get_encoding(encoding)
+    if encoding:
+        return len(encoding.encode(text))
+    return len(text) // 2 + 1
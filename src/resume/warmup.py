@@ -0,0 +1,73 @@
+"""자주 묻는 질문의 답변을 미리 만들어 답변 캐시에 채워두는 warm-up 작업
+
+qna.json 의 질문과 FAQ 파일(FAQ_PATH)의 질문을 실제 파이프라인으로 돌려 긴 TTL 로 저장한다.
+답변 캐시 키에는 인덱스 버전이 들어가므로 인덱스가 바뀌면 다시 warm-up 해야 한다.
+"""
+import asyncio
+import json
+import os
+from typing import Optional
+
+from resume.resume_chatbot import ResumeChatbot
+from resume.utils.text import normalize_question
+
+WARMUP_SESSION_ID = "warmup"
+
+
+def load_faq(path: Optional[str]) -> list[str]:
+    """FAQ 파일 읽기 - JSON 배열(문자열 또는 {"question": ...}) 이나 한 줄에 질문 하나인 텍스트"""
+    if not path or not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return [line.strip() for line in text.splitlines() if line.strip() and not line.startswith("#")]
+    return [item if isinstance(item, str) else item.get("question", "") for item in data if item]
+
+
+def collect_questions(bot: ResumeChatbot, faq_path: Optional[str] = None) -> list[str]:
+    """qna.json + FAQ 질문을 정규화 기준으로 중복 제거"""
+    reader = bot.retriever.store.reader.load()
+    questions, seen = [], set()
+    for question in reader.qna_questions + load_faq(faq_path or os.getenv("FAQ_PATH")):
+        key = normalize_question(question)
+        if key and key not in seen:
+            seen.add(key)
+            questions.append(question)
+    return questions
+
+
+async def warm_answers(bot: ResumeChatbot, questions: list[str], concurrency: int = 4, ttl: Optional[int] = None) -> dict[str, int]:
+    """동시 실행 수를 제한해 질문들을 파이프라인에 돌리고 결과를 긴 TTL 로 답변 캐시에 저장"""
+    ttl = ttl or int(os.getenv("WARMUP_TTL", 7 * 24 * 3600))
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = {"questions": len(questions), "cached": 0, "warmed": 0, "skipped": 0, "failed": 0}
+
+    # 이미 캐시에 있는 질문은 MGET 한 번으로 걸러낸다
+    cached = await bot.answer_repository.get_answers(questions)
+    stats["cached"] = sum(1 for answer in cached if answer)
+    pending = [q for q, answer in zip(questions, cached) if not answer]
+
+    async def warm(question: str) -> None:
+        async with semaphore:
+            try:
+                await bot._generate(question, WARMUP_SESSION_ID, answer_ttl=ttl)
+            except Exception as e:
+                print(f"warm-up 실패 ({question}): {e}")
+                stats["failed"] += 1
+
+    # 의미 기반 캐시 적중은 자기 키로 저장되지 않고, 서빙 프로세스의 의미 기반 캐시는 따로 비어 있으므로
+    # warm-up 중에는 모든 질문을 파이프라인 끝까지 돌린다
+    semantic_cache, bot.semantic_cache = bot.semantic_cache, False
+    try:
+        await asyncio.gather(*(warm(q) for q in pending))
+    finally:
+        bot.semantic_cache = semantic_cache
+
+    # 실제로 레코드가 저장된 질문만 warmed (답변 불가, 보정 시간 초과 등은 저장되지 않으므로 skipped)
+    written = await bot.answer_repository.get_answers(pending) if pending else []
+    stats["warmed"] = sum(1 for answer in written if answer)
+    stats["skipped"] = len(pending) - stats["warmed"] - stats["failed"]
+    return stats
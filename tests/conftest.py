@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture
+def fake_redis():
+    """CacheStore 공유 풀을 테스트마다 새 fakeredis 서버로 바꾼다"""
+    fakeredis = pytest.importorskip("fakeredis")
+    import redis.asyncio as aioredis
+    from resume.db.cache_store import CacheStore
+
+    previous = CacheStore._pool
+    server = fakeredis.FakeServer()
+    CacheStore.use_pool(aioredis.ConnectionPool(
+        connection_class=getattr(fakeredis.aioredis, "FakeAsyncRedisConnection", fakeredis.aioredis.FakeConnection),
+        server=server,
+        decode_responses=True,
+    ))
+    yield server
+    CacheStore._pool = previous
+
+
+DOCS = [
+    SimpleNamespace(page_content="company: 토스\nrole: 백엔드\ntech_stack: Kotlin, Kafka", metadata={"doc_type": "projects"}),
+    SimpleNamespace(page_content="협업: 코드 리뷰 문화를 만들었습니다.", metadata={"doc_type": "qna"}),
+]
+
+
+class FakeStore:
+    """VectorStore 대역 - 모든 질문을 같은 벡터로 임베딩하고 같은 문서를 돌려준다"""
+    index_version = "idx-test"
+
+    def __init__(self) -> None:
+        self.embed_calls: list[str] = []
+
+    def exact_match(self, question: str):
+        return None
+
+    async def embed_query(self, question: str) -> list[float]:
+        self.embed_calls.append(question)
+        return [1.0, 0.0, 0.0]
+
+    def get_context_score_by_vector(self, vector: list[float]) -> float:
+        return 1.0
+
+    def get_similar_data_by_vector(self, vector, k, filters=None):
+        return DOCS[:k]
+
+    def hybrid_search(self, question, vector, k, filters, dense=None):
+        return DOCS[:k]
+
+    def lexical_search(self, question, k, filters=None):
+        return DOCS[:k]
+
+    def get_chronological(self, time_condition, k, filters, vector=None):
+        return DOCS[:k]
+
+
+@pytest.fixture
+def chatbot(monkeypatch, fake_redis):
+    """OpenAI/벡터 스토어 없이 파이프라인을 끝까지 돌리는 ResumeChatbot 을 만드는 함수
+
+    LLM 호출은 bench 의 StubAsyncOpenAI, 검색은 FakeStore 가 대신하고, ready=True 면 벡터 스토어가 준비된 상태로 시작한다.
+    """
+    from resume.bench.stub_openai import StubAsyncOpenAI
+    from resume.resume_chatbot import ResumeChatbot
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(ResumeChatbot, "start_warmup", lambda self, exit_on_failure=None: None)
+
+    def build(answer: str = "저는 Kafka 로 주문 흐름을 비동기로 바꾼 경험이 있습니다.", answer_mode: str = "two_stage", ready: bool = True, **kwargs) -> ResumeChatbot:
+        bot = ResumeChatbot("bucket", "projects.json", "qna.json", "introduce.txt", use_gcs=False, answer_mode=answer_mode, fast_startup=True, **kwargs)
+        client = StubAsyncOpenAI(latency=0, per_token_latency=0, answer=answer)
+        for agent in (bot.classifier, bot.persona, bot.refiner, bot.history_repository.summarizer, bot.answer_repository.summarizer):
+            agent.client = client
+        # 중심 벡터 없이 키워드 규칙/LLM 분류만 사용
+        bot.classifier.embed_documents = None
+        bot.retriever.store = FakeStore()
+        if ready:
+            bot._finish_warmup()
+        return bot
+
+    return build
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from resume.admission import PRIORITY_FOLLOW_UP, PRIORITY_NEW, AdmissionController, Overloaded, closest_answer
+
+
+def test_waiters_are_served_by_priority_then_arrival():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queue=10, queue_timeout=1.0)
+        order = []
+
+        async def job(name, priority, hold):
+            async with controller.slot(priority):
+                order.append(name)
+                await asyncio.sleep(hold)
+
+        first = asyncio.create_task(job("first", PRIORITY_NEW, 0.05))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(job("new", PRIORITY_NEW, 0)),
+            asyncio.create_task(job("follow-up", PRIORITY_FOLLOW_UP, 0)),
+        ]
+        await asyncio.sleep(0)
+        depth = controller.queued
+        await asyncio.gather(first, *waiters)
+        return order, depth, controller.active, controller.queued
+
+    order, depth, active, queued = asyncio.run(scenario())
+    assert order == ["first", "follow-up", "new"]
+    assert depth == 2
+    assert (active, queued) == (0, 0)
+
+
+def test_full_queue_and_deadline_shed_load():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=0.05)
+        await controller.acquire()
+        waiter = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded) as full:
+            await controller.acquire()
+        with pytest.raises(Overloaded) as deadline:
+            await waiter
+        controller.release()
+        return full.value.reason, deadline.value.reason, controller.active, controller.queued, controller.stats
+
+    full, deadline, active, queued, stats = asyncio.run(scenario())
+    assert (full, deadline) == ("queue_full", "deadline")
+    assert (active, queued) == (0, 0)
+    assert stats["shed_queue_full"] == 1 and stats["shed_deadline"] == 1
+
+
+def test_closest_answer_requires_enough_overlap():
+    records = [
+        {"q": "협업하면서 어려웠던 점이 있었나요?", "a": "API 계약을 먼저 정했습니다."},
+        {"q": "가장 자신 있는 언어는?", "a": "Kotlin 입니다."},
+    ]
+    assert closest_answer("협업할 때 어려웠던 점은?", records) == "API 계약을 먼저 정했습니다."
+    assert closest_answer("연봉은 얼마인가요?", records) is None
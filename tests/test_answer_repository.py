@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+import redis.asyncio as aioredis
+
+from resume.db.cache_store import CacheStore
+from resume.repository.answer_repository import AnswerRepository
+
+
+@pytest.fixture
+def repository():
+    previous = CacheStore._pool
+    CacheStore.use_pool(aioredis.ConnectionPool(
+        connection_class=getattr(fakeredis.aioredis, "FakeAsyncRedisConnection", fakeredis.aioredis.FakeConnection),
+        server=fakeredis.FakeServer(),
+        decode_responses=True,
+    ))
+    repo = AnswerRepository(CacheStore(), client=None, prompt_version="1.test")
+    repo.index_version = "idx1"
+    repo.generation_refresh = 0
+    yield repo
+    CacheStore._pool = previous
+
+
+def test_one_record_per_normalised_question(repository):
+    async def scenario():
+        await repository.save("기술스택이 뭐예요?", "Kotlin 입니다.", "기술스택")
+        await repository.save("기술스택이  뭐예요", "Go 도 씁니다.", "기술스택")
+        answers = await repository.get_answers(["기술스택이 뭐예요?", "협업 경험은?"])
+        records = await repository.get_category_records("기술스택")
+        await repository.redis.close()
+        return answers, records
+
+    answers, records = asyncio.run(scenario())
+    assert answers == ["Go 도 씁니다.", None]
+    assert len(records) == 1
+    assert records[0]["a"] == "Go 도 씁니다." and records[0]["c"] == "기술스택"
+
+
+def test_invalidate_and_index_change_hide_previous_answers(repository):
+    async def scenario():
+        await repository.save("자기소개 해주세요", "백엔드 개발자입니다.", "자기소개")
+        before = await repository.get_answer("자기소개 해주세요")
+        await repository.invalidate()
+        after_invalidate = await repository.get_answer("자기소개 해주세요")
+
+        await repository.save("자기소개 해주세요", "새 답변", "자기소개")
+        repository.index_version = "idx2"
+        after_reindex = await repository.get_answer("자기소개 해주세요")
+        await repository.redis.close()
+        return before, after_invalidate, after_reindex
+
+    before, after_invalidate, after_reindex = asyncio.run(scenario())
+    assert before == "백엔드 개발자입니다."
+    assert after_invalidate is None
+    assert after_reindex is None
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from resume.db.cache_store import CacheStore
+from resume.db.local_cache import LocalCache
+
+
+def test_index_set_keeps_the_longest_member_ttl(fake_redis):
+    async def scenario():
+        store = CacheStore()
+        # 웜업 답변(7일) 뒤에 일반 답변(1시간)이 같은 카테고리 set 에 저장됨
+        await store.save("answer:warm", 7 * 24 * 3600, {"a": "웜업"}, index_sets=["answers:기술스택"])
+        await store.save("answer:live", 3600, {"a": "실시간"}, index_sets=["answers:기술스택"])
+        ttl = await store.redis.ttl("answers:기술스택")
+        members = await store.set_members("answers:기술스택")
+        await store.close()
+        return ttl, members
+
+    ttl, members = asyncio.run(scenario())
+    assert ttl > 3600
+    assert members == ["answer:live", "answer:warm"]
+
+
+def test_commands_have_a_socket_timeout(monkeypatch):
+    previous = CacheStore._pool
+    CacheStore._pool = None
+    monkeypatch.setenv("REDIS_SOCKET_TIMEOUT", "0.5")
+    try:
+        kwargs = CacheStore._get_pool().connection_kwargs
+    finally:
+        CacheStore._pool = previous
+    assert kwargs["socket_timeout"] == 0.5
+    assert kwargs["socket_connect_timeout"] == 1.0
+
+
+def test_falls_back_to_l1_while_redis_is_down(fake_redis):
+    async def scenario():
+        store = CacheStore()
+        fake_redis.connected = False
+        await store.get("answer:1")
+        down = not store.available
+        # 장애 중 저장은 L1 이 원본 역할을 하고, 조회는 Redis 에 가지 않는다
+        await store.save("answer:1", 60, {"a": "L1 답변"})
+        cached = await store.get("answer:1")
+        many = await store.get_many(["answer:1", "answer:2"])
+        members = await store.set_members("answers:기술스택")
+        fake_redis.connected = True
+        await store.close()
+        return down, cached, many, members, store.stats
+
+    down, cached, many, members, stats = asyncio.run(scenario())
+    assert down
+    assert cached == {"a": "L1 답변"}
+    assert many == [{"a": "L1 답변"}, []]
+    assert members == []
+    assert stats["l2_error"] == 1
+
+
+def test_save_on_one_instance_invalidates_l1_of_another(fake_redis):
+    async def scenario():
+        writer, reader = CacheStore(), CacheStore(LocalCache(max_size=16, ttl=60))
+        await writer.save("answer:1", 60, {"a": "이전 답변"})
+        before = await reader.get("answer:1")  # reader 의 L1 에 올라가고 무효화 구독 시작
+        await asyncio.sleep(0.05)
+        await writer.save("answer:1", 60, {"a": "새 답변"})
+        await asyncio.sleep(0.05)
+        after = await reader.get("answer:1")
+        await writer.close()
+        await reader.close()
+        return before, after, reader.stats
+
+    before, after, stats = asyncio.run(scenario())
+    assert before == {"a": "이전 답변"}
+    assert after == {"a": "새 답변"}
+    assert stats["l2_hit"] == 2
@@ -0,0 +1,43 @@
+from resume.utils.context import ContextAssembler, compact_document, render_record, strip_overlap
+
+
+def test_render_record_is_field_labelled_plain_text():
+    project = {
+        "name": "주문 시스템",
+        "period": {"from": "2021.03", "to": "2022.01"},
+        "tech_stack": [{"name": "Kafka"}, {"name": "Spring"}],
+        "highlights": ["지연 50% 감소", "장애 0건"],
+        "note": "",
+    }
+    assert render_record(project) == (
+        "name: 주문 시스템\n"
+        "period.from: 2021.03\n"
+        "period.to: 2022.01\n"
+        "tech_stack: Kafka, Spring\n"
+        "highlights: 지연 50% 감소, 장애 0건"
+    )
+    assert compact_document('{"q": "질문", "a": "답변"}') == "q: 질문\na: 답변"
+    assert compact_document("그냥 텍스트") == "그냥 텍스트"
+
+
+def test_strip_overlap_removes_splitter_overlap():
+    first = "가" * 30 + "겹치는 부분입니다. 충분히 긴 문장이에요"
+    second = "겹치는 부분입니다. 충분히 긴 문장이에요 다음 내용"
+    assert strip_overlap(first, second) == "다음 내용"
+    assert strip_overlap("짧은", "짧은 겹침") == "짧은 겹침"
+
+
+def test_assembler_packs_ranked_snippets_within_budget():
+    assembler = ContextAssembler(max_tokens=10)
+    assembler._encoding = False  # 글자 수 기반 대략치로 고정 (len // 2 + 1)
+
+    # 9 토큰 + 중복 + 예산 초과 조각은 건너뛰고, 들어가는 작은 조각은 담는다
+    assert assembler.assemble(["a" * 16, "a" * 16, "b" * 10, "c"]) == "a" * 16 + "\n\n" + "c"
+    # 첫 조각이 예산보다 크면 앞부분만 담는다
+    assert assembler.assemble(["x" * 100]) == "x" * 20
+
+
+def test_count_tokens_falls_back_to_character_estimate():
+    from resume.utils.tokens import count_tokens
+    assert count_tokens("a" * 16, None) == 9
+    assert count_tokens("가나다", False) == 2
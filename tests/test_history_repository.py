@@ -0,0 +1,129 @@
+import asyncio
+
+from resume.db.cache_store import CacheStore
+from resume.repository.history_repository import HistoryRepository
+
+
+class RecordingSummarizer:
+    """요약 호출을 기록하는 Summarizer 대역 (during 은 요약 도중에 실행할 작업)"""
+    def __init__(self, during=None) -> None:
+        self.calls = []
+        self.during = during
+
+    async def summarize_history(self, history, previous_summary=None):
+        self.calls.append(([turn["q"] for turn in history], previous_summary))
+        await asyncio.sleep(0.02)
+        if self.during is not None:
+            await self.during()
+        return f"요약({','.join(turn['q'] for turn in history)})"
+
+
+def build_repository(summarizer=None) -> HistoryRepository:
+    repo = HistoryRepository(CacheStore(), client=None, keep_turns=2, compact_after=100)
+    repo.summarizer = summarizer or RecordingSummarizer()
+    return repo
+
+
+async def save_turns(repo: HistoryRepository, session_id: str, numbers) -> None:
+    for n in numbers:
+        await repo.save(session_id, f"q{n}", f"a{n}")
+
+
+def test_turns_appended_during_summary_survive_the_trim(fake_redis):
+    async def scenario():
+        repo = build_repository()
+        repo.summarizer.during = lambda: save_turns(repo, "s1", [6, 7])
+        await save_turns(repo, "s1", range(1, 6))
+        await repo._compact("s1")
+        window = await repo.get_window("s1", n=10)
+        await repo.redis.close()
+        return repo.summarizer.calls, window
+
+    calls, window = asyncio.run(scenario())
+    assert calls == [(["q1", "q2", "q3"], None)]
+    assert window[0] == {"summary": "요약(q1,q2,q3)"}
+    assert [turn["q"] for turn in window[1:]] == ["q4", "q5", "q6", "q7"]
+
+
+def test_previous_summary_is_carried_forward(fake_redis):
+    async def scenario():
+        repo = build_repository()
+        await repo.set("s1", [{"summary": "이전 요약"}] + [{"q": f"q{n}", "a": f"a{n}"} for n in range(1, 5)])
+        await repo._compact("s1")
+        window = await repo.get_window("s1")
+        await repo.redis.close()
+        return repo.summarizer.calls, window
+
+    calls, window = asyncio.run(scenario())
+    assert calls == [(["q1", "q2"], "이전 요약")]
+    assert window == [{"summary": "요약(q1,q2)"}, {"q": "q3", "a": "a3"}, {"q": "q4", "a": "a4"}]
+
+
+def test_only_one_replica_compacts_a_session(fake_redis):
+    async def scenario():
+        summarizer = RecordingSummarizer()
+        replicas = [build_repository(summarizer), build_repository(summarizer)]
+        await save_turns(replicas[0], "s1", range(1, 6))
+        await asyncio.gather(*(repo._compact("s1") for repo in replicas))
+        turns = await replicas[1].get("s1")
+        for repo in replicas:
+            await repo.redis.close()
+        return summarizer.calls, turns
+
+    calls, turns = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert [turn["q"] for turn in turns] == ["q4", "q5"]
+
+
+def test_save_schedules_background_compaction(fake_redis):
+    async def scenario():
+        repo = build_repository()
+        repo.compact_after = 4
+        await save_turns(repo, "s1", range(1, 6))
+        await asyncio.gather(*repo._tasks)
+        window = await repo.get_window("s1")
+        await repo.redis.close()
+        return window
+
+    window = asyncio.run(scenario())
+    assert window == [{"summary": "요약(q1,q2,q3)"}, {"q": "q4", "a": "a4"}, {"q": "q5", "a": "a5"}]
+
+
+def test_window_round_trip(fake_redis):
+    async def scenario():
+        repo = build_repository()
+        await save_turns(repo, "s1", range(1, 5))
+        await save_turns(repo, "s2", [9])
+        window = await repo.get_window("s1", n=2)
+        everything = await repo.get("s1")
+        ttl = await repo.redis.redis.ttl(repo._turns_key("s1"))
+
+        # set() 은 기존 기록을 통째로 바꾸고, 요약은 창의 맨 앞에 온다
+        await repo.set("s1", [{"summary": "요약"}, {"q": "새 질문", "a": "새 답변"}])
+        replaced = await repo.get_window("s1")
+        other = await repo.get_window("s2")
+        await repo.redis.close()
+        return window, everything, ttl, replaced, other
+
+    window, everything, ttl, replaced, other = asyncio.run(scenario())
+    assert window == [{"q": "q3", "a": "a3"}, {"q": "q4", "a": "a4"}]
+    assert [turn["q"] for turn in everything] == ["q1", "q2", "q3", "q4"]
+    assert 0 < ttl <= 3600
+    assert replaced == [{"summary": "요약"}, {"q": "새 질문", "a": "새 답변"}]
+    assert other == [{"q": "q9", "a": "a9"}]
+
+
+def test_history_is_skipped_while_redis_is_down(fake_redis):
+    async def scenario():
+        repo = build_repository()
+        await save_turns(repo, "s1", [1])
+        fake_redis.connected = False
+        window = await repo.get_window("s1")  # 장애를 감지하고 L1 전용 모드로 전환
+        await save_turns(repo, "s1", [2])
+        fake_redis.connected = True
+        await repo.redis.close()
+        return window, repo.redis.available
+
+    window, available = asyncio.run(scenario())
+    assert window == []
+    assert not available
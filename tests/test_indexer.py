@@ -0,0 +1,78 @@
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from resume.db.indexer import EmbeddingIndexer
+
+
+def rate_limit_error() -> openai.RateLimitError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+    return openai.RateLimitError("rate limited", response=httpx.Response(429, request=request), body=None)
+
+
+class FakeEmbeddings:
+    """배치별 호출과 동시 실행 수를 기록하고, 처음 failures 번은 rate limit 으로 실패"""
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+        self.batches: list[list[str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        if self.failures:
+            self.failures -= 1
+            raise rate_limit_error()
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            self.batches.append(texts)
+            return [[float(len(text))] for text in texts]
+        finally:
+            self.in_flight -= 1
+
+
+class FakeCollection:
+    def __init__(self) -> None:
+        self.upserts: list[list[str]] = []
+
+    def upsert(self, ids, embeddings, documents, metadatas) -> None:
+        assert len(ids) == len(embeddings) == len(documents) == len(metadatas)
+        self.upserts.append(ids)
+
+
+def test_batches_respect_the_token_budget_and_keep_order():
+    embeddings = FakeEmbeddings()
+    # 글자 수 기반 대략치 (len // 2 + 1): 9, 4, 4, 2, 9 토큰
+    docs = ["a" * 16, "b" * 6, "c" * 6, "d" * 2, "e" * 16]
+    indexer = EmbeddingIndexer(embeddings, max_batch_tokens=10, max_concurrency=2, write_batch_size=2, encoding=None)
+
+    assert indexer.make_batches(docs) == [[0], [1, 2, 3], [4]]
+
+    collection = FakeCollection()
+    written = asyncio.run(indexer.index(collection, [f"id{i}" for i in range(len(docs))], docs, [{}] * len(docs)))
+    assert written == 5
+    assert sorted(map(len, embeddings.batches)) == [1, 1, 3]
+    assert embeddings.max_in_flight <= 2
+    assert collection.upserts == [["id0", "id1"], ["id2", "id3"], ["id4"]]
+    assert indexer.make_batches(["x" * 40]) == [[0]]  # 예산보다 큰 문서도 혼자 한 배치
+
+
+def test_rate_limited_batches_are_retried_with_backoff():
+    embeddings = FakeEmbeddings(failures=2)
+    indexer = EmbeddingIndexer(embeddings, max_retries=3, retry_backoff=0.001, encoding=None)
+
+    vectors = asyncio.run(indexer.embed(["가나다", "라마"]))
+    assert vectors == [[3.0], [2.0]]
+    assert embeddings.batches == [["가나다", "라마"]]
+
+
+def test_gives_up_after_max_retries():
+    embeddings = FakeEmbeddings(failures=5)
+    indexer = EmbeddingIndexer(embeddings, max_retries=2, retry_backoff=0.001, encoding=None)
+
+    with pytest.raises(openai.RateLimitError):
+        asyncio.run(indexer.embed(["가나다"]))
+    assert embeddings.failures == 2
@@ -0,0 +1,53 @@
+import json
+
+from resume.db.lexical_index import LexicalIndex, reciprocal_rank_fusion, tokenize
+
+
+def _index() -> LexicalIndex:
+    docs = [
+        json.dumps({"name": "주문 시스템 개편", "company": "카카오"}, ensure_ascii=False),
+        json.dumps({"name": "검색 플랫폼", "company": "Naver"}, ensure_ascii=False),
+        "팀원들과 코드 리뷰 문화를 만들었습니다.",
+    ]
+    metas = [
+        {"doc_type": "projects", "company": "카카오", "tech_stack": "Kafka, Go"},
+        {"doc_type": "projects", "company": "Naver", "tech_stack": "Elasticsearch, Java"},
+        {"doc_type": "qna"},
+    ]
+    return LexicalIndex(["a", "b", "c"], docs, metas)
+
+
+def test_tokenize_uses_hangul_bigrams_and_whole_words():
+    assert tokenize("Kafka 도입") == ["kafka", "도입"]
+    assert tokenize("코드리뷰") == ["코드", "드리", "리뷰"]
+
+
+def test_search_ranks_exact_terms_and_applies_filters():
+    index = _index()
+
+    assert index.search("Elasticsearch 경험", k=3)[0][0] == 1
+    assert index.search("코드 리뷰", k=3)[0][0] == 2
+    assert index.search("코드 리뷰", k=3, filters={"doc_type": "projects"}) == []
+    assert [i for i, _ in index.search("프로젝트", k=3, filters={"company": {"$regex": ".*naver.*"}})] == []
+
+
+def test_exact_matches_use_word_boundaries_for_latin_terms():
+    index = _index()
+
+    assert index.exact_matches("카카오에서 무슨 일을 했나요?") == [0]
+    assert index.exact_matches("Go 언어를 써봤나요?") == [0]
+    assert index.exact_matches("Google 에서 일했나요?") == []
+
+
+def test_save_and_load_only_for_same_version(tmp_path):
+    path = str(tmp_path / "lexical.json")
+    _index().save(path, "v1")
+
+    assert LexicalIndex.load(path, "v2") is None
+    loaded = LexicalIndex.load(path, "v1")
+    assert loaded.search("Elasticsearch", k=1)[0][0] == 1
+
+
+def test_reciprocal_rank_fusion_prefers_items_ranked_by_both():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d"]], key=lambda d: d)
+    assert fused[0] == "b"
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from resume.llm_client import RateLimiter, TokenBucket, parse_duration  # noqa: E402
+
+
+def test_parse_duration_handles_openai_reset_formats():
+    assert parse_duration("1s") == 1.0
+    assert parse_duration("6m0s") == 360.0
+    assert parse_duration("20ms") == pytest.approx(0.02)
+    assert parse_duration(None) is None
+
+
+def test_bucket_syncs_with_headers_and_blocks_on_429():
+    bucket = TokenBucket(capacity=60)
+    assert bucket.wait_time(1) == 0
+    bucket.sync(limit=120, remaining=0)
+    assert bucket.wait_time(1) == pytest.approx(0.5, rel=0.1)
+
+    limiter = RateLimiter(rpm=60, tpm=1000, max_inflight=1)
+    limiter.update("gpt-4o-mini", 429, {"retry-after-ms": "200"})
+    assert limiter.models["gpt-4o-mini"].requests.wait_time(1) > 0.1
+
+
+def test_acquire_limits_inflight_requests():
+    async def main():
+        limiter = RateLimiter(rpm=6000, tpm=10 ** 6, max_inflight=1)
+        release = await limiter.acquire("m", 10)
+        second = asyncio.ensure_future(limiter.acquire("m", 10))
+        await asyncio.sleep(0.01)
+        assert not second.done()
+        release()
+        release()  # 두 번 호출해도 슬롯은 한 번만 반환
+        (await second)()
+        return limiter.models["m"].inflight._value
+
+    assert asyncio.run(main()) == 1
+
+
+def test_bucket_does_not_refill_while_blocked(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("resume.llm_client.time.monotonic", lambda: now[0])
+    bucket = TokenBucket(capacity=60)
+    bucket.block(30)
+
+    now[0] = 131.0
+    # 풀린 뒤 1초 동안 채워진 만큼만 남아 있다 (멈춰 있던 30초는 채우지 않음)
+    assert bucket.wait_time(1) == 0
+    bucket.take(1)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+import pytest
+
+from resume.bench.fake_openai_server import EMBEDDING_DIM, FakeOpenAIServer, FakeServerConfig
+from resume.bench.stub_openai import DEFAULT_ANSWER
+
+
+@pytest.fixture
+def fake_server():
+    server = FakeOpenAIServer(FakeServerConfig(chat_latency=0, per_token_latency=0, embedding_latency=0)).start_in_thread()
+    yield server
+    server.stop()
+
+
+def test_fake_server_speaks_the_openai_protocol(fake_server):
+    openai = pytest.importorskip("openai")
+
+    async def scenario():
+        client = openai.AsyncOpenAI(base_url=fake_server.base_url, api_key="fake-key", max_retries=0)
+        try:
+            classified = await client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[{"role": "user", "content": '분류할 질문: "기술스택이 뭐예요?"'}],
+                response_format={"type": "json_object"},
+            )
+            stream = await client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[{"role": "user", "content": "자기소개 해주세요"}],
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            tokens, usage = [], None
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    tokens.append(chunk.choices[0].delta.content)
+                usage = chunk.usage or usage
+            # langchain 은 tiktoken 토큰 id 목록으로 임베딩을 요청한다
+            embedded = await client.embeddings.create(model="text-embedding-3-small", input=[[1, 2, 3], [1, 2, 3], [7, 8]])
+        finally:
+            await client.close()
+        return classified, "".join(tokens), usage, embedded
+
+    classified, streamed, usage, embedded = asyncio.run(scenario())
+    assert json.loads(classified.choices[0].message.content)["category"] == "기술스택"
+    assert streamed.strip() == DEFAULT_ANSWER.strip()
+    assert usage is not None and usage.completion_tokens > 0
+    vectors = [item.embedding for item in embedded.data]
+    assert len(vectors) == 3 and len(vectors[0]) == EMBEDDING_DIM
+    assert vectors[0] == pytest.approx(vectors[1])
+    assert vectors[0] != pytest.approx(vectors[2])
+    assert fake_server.stats.requests == {"chat/completions": 2, "embeddings": 1}
+
+
+def test_load_test_end_to_end(tmp_path, monkeypatch):
+    for module in ("chromadb", "langchain_community", "langchain_openai", "fakeredis"):
+        pytest.importorskip(module)
+    # OpenAIEmbeddings 가 입력을 자르려고 tiktoken 인코딩 파일을 내려받는다 (오프라인이면 실행할 수 없음)
+    tiktoken = pytest.importorskip("tiktoken")
+    try:
+        tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        pytest.skip(f"tiktoken 인코딩을 불러올 수 없음: {e}")
+    from resume.bench import load_test
+
+    # load_test 가 가짜 서버 주소/키를 환경변수로 지정하므로 테스트가 끝나면 되돌린다
+    monkeypatch.delenv("OPENAI_BASE_URL", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    out = tmp_path / "load.json"
+    code = load_test.main([
+        "--sessions", "2", "--requests", "2",
+        "--chat-latency", "0", "--token-latency", "0", "--embedding-latency", "0",
+        "--json", str(out),
+    ])
+
+    result = json.loads(out.read_text(encoding="utf-8"))
+    assert code == 0
+    assert result["requests"] == 4 and result["errors"] == 0
+    assert result["server"]["requests"].get("chat/completions", 0) > 0
@@ -0,0 +1,27 @@
+import time
+
+from resume.db.local_cache import MISSING, NEGATIVE, LocalCache
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = LocalCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # a 를 최근 사용으로 갱신
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_and_negative_entries_expire():
+    cache = LocalCache(ttl=0.01, negative_ttl=0.01)
+    cache.set("answer", "cached")
+    cache.set_missing("unknown")
+    assert cache.get("answer") == "cached"
+    assert cache.get("unknown") is NEGATIVE
+
+    time.sleep(0.02)
+    assert cache.get("answer") is MISSING
+    assert cache.get("unknown") is MISSING
@@ -0,0 +1,59 @@
+import asyncio
+
+from resume.agents.classifier import Classifier
+from resume.agents.local_classifier import LocalClassifier
+
+
+def test_keyword_rules_classify_obvious_questions():
+    local = LocalClassifier()
+
+    assert local.classify("기술스택이 뭐예요?")["category"] == "기술스택"
+    result = local.classify("가장 최근 프로젝트는 무엇인가요?")
+    assert result == {"category": "프로젝트 경험", "time_condition": "recent", "filters": {"doc_type": "projects"}}
+    assert local.classify("첫 프로젝트에 대해 알려주세요")["time_condition"] == "first"
+
+
+def test_named_entities_and_unknown_questions_fall_back():
+    local = LocalClassifier()
+
+    assert local.classify("Kafka 프로젝트 경험이 있나요?") is None
+    assert local.classify("취미가 뭐예요?") is None
+
+
+def test_centroid_decides_only_with_clear_margin():
+    local = LocalClassifier(min_score=0.5, min_margin=0.1)
+    local.set_centroids({"협업": [[1.0, 0.0, 0.0]], "자기소개": [[0.0, 1.0, 0.0]], "학습 경험": [[0.0, 0.0, 1.0]]})
+
+    assert local.classify("취미가 뭐예요?", [0.1, 0.9, 0.0])["category"] == "자기소개"
+    assert local.classify("취미가 뭐예요?", [0.7, 0.7, 0.0]) is None
+    # 규칙이 여러 개 걸리면 걸린 카테고리 안에서만 비교
+    assert local.classify("팀원과 함께 공부한 경험은?", [0.2, 0.0, 0.9])["category"] == "학습 경험"
+
+
+def test_keyword_questions_skip_centroids_and_failures_back_off():
+    embed_calls = []
+
+    async def failing_embed(texts):
+        embed_calls.append(len(texts))
+        raise RuntimeError("embeddings down")
+
+    async def scenario():
+        classifier = Classifier(None, failing_embed)
+
+        async def fake_llm(question):
+            return {"category": "자기소개", "time_condition": "none", "filters": {"doc_type": "summary"}}
+        classifier.classify_with_llm = fake_llm
+
+        keyword = await classifier.classify_question("기술스택이 뭐예요?")
+        calls_after_keyword = len(embed_calls)
+        await classifier.classify_question("취미가 뭐예요?")
+        await classifier._centroid_task
+        await classifier.classify_question("주말엔 뭐 해요?")
+        return keyword, calls_after_keyword, classifier.stats
+
+    keyword, calls_after_keyword, stats = asyncio.run(scenario())
+    assert keyword["category"] == "기술스택"
+    assert calls_after_keyword == 0
+    # 첫 실패 후에는 백오프 동안 다시 임베딩하지 않는다
+    assert len(embed_calls) == 1
+    assert stats["llm"] == 2
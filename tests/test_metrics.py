@@ -0,0 +1,64 @@
+import json
+import urllib.request
+from types import SimpleNamespace
+
+import pytest
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+
+from resume.metrics import RequestTrace, current_trace, observe_stage, record_usage, serve_metrics
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = CollectorRegistry()
+    hist = Histogram("t_seconds", "test", ("stage",), buckets=(0.1, 1.0), registry=registry)
+    hist.labels(stage="gate").observe(0.05)
+    hist.labels(stage="gate").observe(0.5)
+    hist.labels(stage="gate").observe(5.0)
+
+    text = generate_latest(registry).decode()
+    assert '# TYPE t_seconds histogram' in text
+    assert 't_seconds_bucket{le="0.1",stage="gate"} 1.0' in text
+    assert 't_seconds_bucket{le="1.0",stage="gate"} 2.0' in text
+    assert 't_seconds_bucket{le="+Inf",stage="gate"} 3.0' in text
+    assert 't_seconds_count{stage="gate"} 3.0' in text
+
+
+def test_counter_requires_declared_labels():
+    registry = CollectorRegistry()
+    counter = Counter("t", "test", ("result",), registry=registry)
+    counter.labels(result="hit").inc()
+    counter.labels(result="hit").inc(2)
+    assert registry.get_sample_value("t_total", {"result": "hit"}) == 3
+    with pytest.raises(ValueError):
+        counter.labels(other="x")
+
+
+def test_trace_collects_stages_and_tokens(capsys):
+    trace = RequestTrace("session-1")
+    token = current_trace.set(trace)
+    try:
+        observe_stage("classify", 0.2)
+        observe_stage("classify", 0.1)
+        record_usage("persona", "gpt-4o-mini", SimpleNamespace(prompt_tokens=10, completion_tokens=5))
+    finally:
+        current_trace.reset(token)
+    trace.finish("answered")
+
+    record = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert record["session_id"] == "session-1"
+    assert record["outcome"] == "answered"
+    assert abs(record["stages_ms"]["classify"] - 300.0) < 0.01
+    assert record["tokens"] == {"persona": 15}
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    registry = CollectorRegistry()
+    Gauge("t_queue_depth", "test", registry=registry).set(3)
+    server = serve_metrics(port=0, host="127.0.0.1", registry=registry)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+            body = response.read().decode()
+            assert response.headers["Content-Type"].startswith("text/plain")
+    finally:
+        server.shutdown()
+    assert "t_queue_depth 3.0" in body
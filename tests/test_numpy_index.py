@@ -0,0 +1,39 @@
+import numpy as np
+
+from resume.db.numpy_index import NumpyVectorIndex
+
+
+def _index() -> NumpyVectorIndex:
+    metas = [
+        {"doc_type": "projects", "tech_stack": "Kafka, Spring"},
+        {"doc_type": "projects", "tech_stack": "React"},
+        {"doc_type": "qna"},
+    ]
+    vectors = [[1.0, 0.0], [0.8, 0.6], [0.0, 2.0]]
+    return NumpyVectorIndex.build(["a", "b", "c"], ["A", "B", "C"], metas, vectors)
+
+
+def test_exact_top_k_with_masks():
+    index = _index()
+
+    assert [i for i, _ in index.search([0.0, 1.0], k=2)] == [2, 1]
+    assert [i for i, _ in index.search([0.0, 1.0], k=3, filters={"doc_type": "projects"})] == [1, 0]
+    assert [i for i, _ in index.search([0.0, 1.0], k=3, filters={"tech_stack": {"$regex": ".*kafka.*"}})] == [0]
+
+
+def test_distance_matches_chroma_l2_scale():
+    index = _index()
+    # 같은 방향이면 거리 0, 직교하면 제곱 거리 2
+    assert abs(index.distance([3.0, 0.0])) < 1e-6
+    assert abs(index.distance([-1.0, 1.0]) - (2 - np.sqrt(2))) < 1e-3
+    empty = NumpyVectorIndex.build([], [], [], [])
+    assert empty.distance([1.0, 0.0]) == 0
+
+
+def test_save_and_memory_mapped_load(tmp_path):
+    _index().save(str(tmp_path), "v1")
+
+    assert NumpyVectorIndex.load(str(tmp_path), "v2") is None
+    loaded = NumpyVectorIndex.load(str(tmp_path), "v1")
+    assert isinstance(loaded.vectors, np.memmap)
+    assert loaded.search([1.0, 0.0], k=1)[0][0] == 0
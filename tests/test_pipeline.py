@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from resume.pipeline import PipelineAborted, StageExecutor, StageTimeout
+
+
+def test_independent_stages_run_concurrently():
+    async def slow(value):
+        await asyncio.sleep(0.05)
+        return value
+
+    async def gate(message):
+        return await slow(bool(message))
+
+    async def classify(message):
+        return await slow("기술스택")
+
+    async def answer(gate, classify):
+        return f"{gate}:{classify}"
+
+    executor = (
+        StageExecutor()
+        .add("gate", gate, deps=("message",))
+        .add("classify", classify, deps=("message",))
+        .add("answer", answer, deps=("gate", "classify"))
+    )
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        run = await executor.run(message="기술스택이 뭐예요?")
+        return run, loop.time() - start
+
+    run, elapsed = asyncio.run(main())
+    assert run.results["answer"] == "True:기술스택"
+    assert set(run.timings) == {"gate", "classify", "answer"}
+    assert elapsed < 0.09
+
+
+def test_abort_cancels_in_flight_branches():
+    cancelled = []
+
+    async def gate():
+        return False
+
+    async def classify():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append("classify")
+            raise
+
+    executor = (
+        StageExecutor()
+        .add("gate", gate, abort_if=lambda valid: not valid)
+        .add("classify", classify)
+    )
+
+    with pytest.raises(PipelineAborted) as info:
+        asyncio.run(executor.run())
+    assert info.value.stage == "gate"
+    assert cancelled == ["classify"]
+
+
+def test_stage_timeout_stops_pipeline():
+    async def slow(message):
+        await asyncio.sleep(1)
+        return message
+
+    async def fast(message):
+        return message
+
+    executor = StageExecutor().add("fast", fast, deps=("message",)).add("slow", slow, deps=("message",), timeout=0.01)
+
+    with pytest.raises(StageTimeout) as exc_info:
+        asyncio.run(executor.run(message="q"))
+    assert exc_info.value.stage == "slow"
+    assert exc_info.value.run.results["fast"] == "q"
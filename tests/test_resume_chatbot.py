@@ -0,0 +1,179 @@
+import asyncio
+import threading
+import time
+
+from resume.resume_chatbot import NO_INFO_ANSWER, NOT_READY_ANSWER, PERSONA_NO_INFO, ResumeChatbot
+
+# conftest 의 chatbot 은 생성 시 warm-up 스레드를 막아 두므로 원래 메서드를 따로 잡아 둔다
+start_warmup = ResumeChatbot.start_warmup
+
+
+async def collect(stream, limit=None):
+    chunks = []
+    async for chunk in stream:
+        chunks.append(chunk)
+        if limit is not None and len(chunks) >= limit:
+            break
+    await stream.aclose()
+    return chunks
+
+
+def test_stream_flushes_a_cache_hit_as_one_chunk(chatbot):
+    bot = chatbot()
+
+    async def scenario():
+        await bot.answer_repository.save("기술스택이 뭐예요?", "Kotlin 과 Kafka 를 주로 씁니다.", "기술스택")
+        return await collect(bot.chat_stream("기술스택이 뭐예요?", [], "s1"))
+
+    assert asyncio.run(scenario()) == ["Kotlin 과 Kafka 를 주로 씁니다."]
+
+
+def test_stream_saves_the_answer_only_after_it_completes(chatbot):
+    bot = chatbot()
+    question = "가장 힘들었던 프로젝트는?"
+
+    async def scenario():
+        # 첫 조각에서 끊긴 스트림은 캐시에 남지 않는다
+        partial = await collect(bot.chat_stream(question, [], "s1"), limit=1)
+        after_disconnect = await bot.answer_repository.get_answer(question)
+        chunks = await collect(bot.chat_stream(question, [], "s2"))
+        saved = await bot.answer_repository.get_answer(question)
+        history = await bot.history_repository.get("s2")
+        return partial, after_disconnect, chunks, saved, history
+
+    partial, after_disconnect, chunks, saved, history = asyncio.run(scenario())
+    assert len(partial) == 1 and after_disconnect is None
+    # 누적된 답변을 여러 번에 나눠 내보내고, 마지막 조각이 저장된 답변
+    assert len(chunks) > 1 and all(chunks[-1].startswith(chunk) for chunk in chunks)
+    assert saved == chunks[-1]
+    assert history == [{"q": question, "a": chunks[-1]}]
+
+
+def test_stream_does_not_stream_a_no_info_answer(chatbot):
+    bot = chatbot(answer=PERSONA_NO_INFO)
+    question = "취미가 뭐예요?"
+
+    async def scenario():
+        chunks = await collect(bot.chat_stream(question, [], "s1"))
+        return chunks, await bot.answer_repository.get_answer(question), await bot.history_repository.get("s1")
+
+    chunks, saved, history = asyncio.run(scenario())
+    assert chunks == [NO_INFO_ANSWER]
+    assert saved is None and history == []
+
+
+class FailingClient:
+    """호출되면 실패하는 클라이언트 - single-pass 모드에서 Refiner 를 거치지 않는지 확인용"""
+    class _Completions:
+        async def create(self, **kwargs):
+            raise AssertionError("single-pass 모드에서 Refiner 가 호출됨")
+
+    def __init__(self) -> None:
+        self.chat = type("Chat", (), {"completions": self._Completions()})()
+
+
+def test_single_pass_holds_back_the_no_info_sentinel(chatbot):
+    bot = chatbot(answer=PERSONA_NO_INFO, answer_mode="single_pass")
+    bot.refiner.client = FailingClient()
+    question = "취미가 뭐예요?"
+
+    async def scenario():
+        chunks = await collect(bot.chat_stream(question, [], "s1"))
+        return chunks, await bot.answer_repository.get_answer(question)
+
+    chunks, saved = asyncio.run(scenario())
+    assert chunks == [NO_INFO_ANSWER]
+    assert saved is None
+
+
+def test_single_pass_saves_a_normal_answer_without_refining(chatbot):
+    answer = "저는 Kafka 로 주문 흐름을 비동기로 바꾼 경험이 있습니다."
+    bot = chatbot(answer=answer, answer_mode="single_pass")
+    bot.refiner.client = FailingClient()
+
+    async def scenario():
+        chunks = await collect(bot.chat_stream("가장 힘들었던 프로젝트는?", [], "s1"))
+        replied = await bot.chat("협업 경험을 말해주세요", [], "s2")
+        saved = await bot.answer_repository.get_answers(["가장 힘들었던 프로젝트는?", "협업 경험을 말해주세요"])
+        return chunks, replied, saved
+
+    chunks, replied, saved = asyncio.run(scenario())
+    assert chunks[-1].strip() == answer and len(chunks) > 1
+    assert replied == answer
+    assert saved == [chunks[-1], answer]
+    # 캐시 네임스페이스가 답변 모드별로 나뉜다
+    assert bot.answer_repository.prompt_version.endswith(".single_pass")
+
+
+
+def scripted_warm_up(bot, failures: int):
+    """failures 번 실패한 뒤 준비 완료를 표시하는 warm_up 대역"""
+    calls = []
+
+    def warm_up():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise RuntimeError("GCS 일시 장애")
+        bot._finish_warmup()
+
+    return warm_up, calls
+
+
+def test_warmup_retries_with_backoff_until_ready(chatbot, monkeypatch):
+    monkeypatch.setenv("WARMUP_ATTEMPTS", "5")
+    monkeypatch.setenv("WARMUP_BACKOFF", "0.01")
+    exits = []
+    monkeypatch.setattr("resume.resume_chatbot.os._exit", exits.append)
+    bot = chatbot(ready=False)
+    bot.warm_up, calls = scripted_warm_up(bot, failures=2)
+
+    start_warmup(bot, exit_on_failure=True).join(5)
+    assert len(calls) == 3
+    assert bot.ready.is_set() and bot.warmup_error is None
+    assert exits == []
+
+
+def test_requests_wait_for_readiness(chatbot):
+    bot = chatbot(ready=False)
+    bot.ready_timeout = 0.05
+
+    async def scenario():
+        # 준비 전에도 캐시 적중은 바로 답하고, 캐시에 없는 질문은 준비 안내로 답한다
+        await bot.answer_repository.save("기술스택이 뭐예요?", "Kotlin 입니다.", "기술스택")
+        cached = await bot.chat("기술스택이 뭐예요?", [], "s1")
+        not_ready = await bot.chat("가장 힘들었던 프로젝트는?", [], "s1")
+
+        # 기다리는 동안 다른 스레드에서 준비가 끝나면 바로 깨어난다
+        waiter = asyncio.create_task(bot.wait_ready(5))
+        await asyncio.sleep(0.01)
+        start = time.perf_counter()
+        threading.Thread(target=bot._finish_warmup).start()
+        ready = await waiter
+        return cached, not_ready, ready, time.perf_counter() - start
+
+    cached, not_ready, ready, waited = asyncio.run(scenario())
+    assert cached == "Kotlin 입니다."
+    assert not_ready == NOT_READY_ANSWER
+    assert ready and waited < 1
+
+
+def test_final_warmup_failure_wakes_waiters_and_exits(chatbot, monkeypatch):
+    monkeypatch.setenv("WARMUP_ATTEMPTS", "2")
+    monkeypatch.setenv("WARMUP_BACKOFF", "0.01")
+    exits = []
+    monkeypatch.setattr("resume.resume_chatbot.os._exit", exits.append)
+    bot = chatbot(ready=False)
+    bot.warm_up, calls = scripted_warm_up(bot, failures=10)
+
+    async def scenario():
+        waiter = asyncio.create_task(bot.wait_ready(5))
+        await asyncio.sleep(0.01)
+        start = time.perf_counter()
+        await asyncio.to_thread(start_warmup(bot, exit_on_failure=True).join, 5)
+        return await waiter, time.perf_counter() - start, await bot.wait_ready(5)
+
+    woken, waited, after = asyncio.run(scenario())
+    assert len(calls) == 2
+    assert woken is False and waited < 1 and after is False
+    assert isinstance(bot.warmup_error, RuntimeError)
+    assert exits == [1]
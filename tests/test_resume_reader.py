@@ -0,0 +1,92 @@
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+exceptions = pytest.importorskip("google.api_core.exceptions")
+
+from resume.bench.load_test import INTRODUCE, PROJECTS, QNA
+from resume.db.resume_reader import ResumeReader
+
+
+class FakeBlob:
+    """generation 이 같으면 NotModified 를 던지는 GCS blob 대역"""
+    def __init__(self, bucket: "FakeBucket", path: str) -> None:
+        self.bucket = bucket
+        self.path = path
+        self.generation = bucket.generations[path]
+
+    def download_as_bytes(self, if_generation_not_match=None) -> bytes:
+        if if_generation_not_match == self.generation:
+            self.bucket.not_modified.append(self.path)
+            raise exceptions.NotModified("not modified")
+        if self.bucket.barrier is not None:
+            # 세 원본을 동시에 받지 않으면 barrier 가 시간 초과로 깨진다
+            self.bucket.barrier.wait()
+        self.bucket.downloads.append(self.path)
+        return self.bucket.contents[self.path].encode("utf-8")
+
+
+class FakeBucket:
+    def __init__(self, barrier=None) -> None:
+        self.contents = {
+            "projects.json": json.dumps(PROJECTS, ensure_ascii=False),
+            "qna.json": json.dumps(QNA, ensure_ascii=False),
+            "introduce.txt": INTRODUCE,
+        }
+        self.generations = {path: 1 for path in self.contents}
+        self.downloads: list[str] = []
+        self.not_modified: list[str] = []
+        self.barrier = barrier
+
+    def blob(self, path: str) -> FakeBlob:
+        return FakeBlob(self, path)
+
+    def get_blob(self, path: str) -> FakeBlob:
+        return FakeBlob(self, path) if path in self.contents else None
+
+
+def gcs_reader(bucket: FakeBucket, cache_dir) -> ResumeReader:
+    reader = ResumeReader("bucket", "projects.json", "qna.json", "introduce.txt", use_gcs=False, source_cache_dir=str(cache_dir))
+    reader.use_gcs = True
+    reader.storage_client = SimpleNamespace(bucket=lambda name: bucket)
+    return reader
+
+
+def test_sources_are_downloaded_concurrently(tmp_path):
+    bucket = FakeBucket(barrier=threading.Barrier(3, timeout=2))
+    reader = gcs_reader(bucket, tmp_path).load()
+
+    assert sorted(bucket.downloads) == ["introduce.txt", "projects.json", "qna.json"]
+    assert not reader.failed_sources
+    assert {meta["doc_type"] for meta in reader.meta} == {"projects", "qna", "summary"}
+    assert reader.generations == {"projects.json": "1", "qna.json": "1", "introduce.txt": "1"}
+
+
+def test_unchanged_generation_is_served_from_the_disk_cache(tmp_path):
+    bucket = FakeBucket()
+    first = gcs_reader(bucket, tmp_path).load()
+
+    # 새 프로세스라도 디스크 캐시의 generation 이 같으면 내용을 다시 받지 않는다
+    bucket.contents["qna.json"] = "바뀌었지만 generation 은 그대로"
+    second = gcs_reader(bucket, tmp_path).load()
+    assert len(bucket.downloads) == 3
+    assert sorted(bucket.not_modified) == ["introduce.txt", "projects.json", "qna.json"]
+    assert second.ids == first.ids
+    assert second.generations == first.generations
+
+    # generation 이 바뀐 원본만 다시 받는다
+    bucket.contents["qna.json"] = json.dumps(QNA[:1], ensure_ascii=False)
+    bucket.generations["qna.json"] = 2
+    third = gcs_reader(bucket, tmp_path).load()
+    assert bucket.downloads[3:] == ["qna.json"]
+    assert third.generations["qna.json"] == "2"
+    assert len(third.qna_questions) == 1
+
+
+def test_fetch_generations_reads_only_metadata(tmp_path):
+    bucket = FakeBucket()
+    reader = gcs_reader(bucket, tmp_path)
+    assert reader.fetch_generations() == {"projects.json": "1", "qna.json": "1", "introduce.txt": "1"}
+    assert bucket.downloads == [] and not reader.loaded
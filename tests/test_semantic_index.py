@@ -0,0 +1,36 @@
+import time
+
+from resume.db.semantic_index import SemanticIndex
+
+
+def test_search_returns_nearest_in_category():
+    index = SemanticIndex()
+    index.add([1.0, 0.0], {"category": "기술스택", "answer": "a"})
+    index.add([0.9, 0.1], {"category": "협업", "answer": "b"})
+
+    entry, score = index.search([0.95, 0.05], "협업")
+    assert entry["answer"] == "b"
+    assert score > 0.9
+
+    entry, _ = index.search([1.0, 0.0], "자기소개")
+    assert entry is None
+
+
+def test_oldest_entries_evicted_when_full():
+    index = SemanticIndex(max_size=2)
+    for i in range(3):
+        index.add([1.0, float(i)], {"category": "c", "answer": str(i)})
+
+    assert len(index) == 2
+    assert [e["answer"] for e in index.entries] == ["1", "2"]
+
+
+def test_expired_entries_are_dropped_before_ranking():
+    index = SemanticIndex(max_size=2)
+    now = time.time()
+    index.add([1.0, 0.0], {"category": "c", "answer": "stale", "expires_at": now - 1})
+    index.add([0.9, 0.1], {"category": "c", "answer": "fresh", "expires_at": now + 60})
+
+    entry, _ = index.search([1.0, 0.0], "c")
+    assert entry["answer"] == "fresh"
+    assert len(index) == 1
@@ -0,0 +1,56 @@
+import asyncio
+
+from resume.singleflight import SingleFlight
+from resume.utils.text import normalize_question
+
+
+def test_concurrent_callers_share_one_execution():
+    calls = []
+
+    async def pipeline():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "답변"
+
+    async def main():
+        flight = SingleFlight()
+        key = normalize_question("최근 프로젝트가 뭐예요?")
+        results = await asyncio.gather(*(flight.do(key, pipeline) for _ in range(5)))
+        return results, flight.stats
+
+    results, stats = asyncio.run(main())
+    assert results == ["답변"] * 5
+    assert len(calls) == 1
+    assert stats["shared"] == 4
+
+
+def test_normalize_question_ignores_spacing_and_trailing_punctuation():
+    assert normalize_question("  최근   프로젝트가 뭐예요?? ") == normalize_question("최근 프로젝트가 뭐예요")
+
+
+def test_cancelled_leader_hands_over_to_a_waiter():
+    calls = []
+
+    async def pipeline():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "답변"
+
+    async def main():
+        flight = SingleFlight()
+        key = normalize_question("협업 경험은?")
+        leader = asyncio.create_task(flight.do(key, pipeline))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(flight.do(key, pipeline)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        # 리더의 클라이언트가 연결을 끊음
+        leader.cancel()
+        results = await asyncio.gather(*followers)
+        return leader, results, flight
+
+    leader, results, flight = asyncio.run(main())
+    assert leader.cancelled()
+    assert results == ["답변"] * 3
+    # 취소된 리더 1번 + 넘겨받은 새 리더 1번
+    assert len(calls) == 2
+    assert flight.join(normalize_question("협업 경험은?")) is None
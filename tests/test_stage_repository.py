@@ -0,0 +1,38 @@
+import asyncio
+
+from resume.repository.stage_repository import StageResultRepository
+
+
+class MemoryStore:
+    """CacheStore 의 get/save 만 흉내내는 메모리 저장소"""
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key, [])
+
+    async def save(self, key, ttl, data):
+        self.data[key] = data
+
+
+def test_stage_results_are_keyed_by_normalised_question_and_index_version():
+    async def scenario():
+        repo = StageResultRepository(MemoryStore(), ttl=60)
+        repo.index_version = "v1"
+        await repo.save("classify", "기술스택이 뭐예요?", {"category": "기술스택"})
+        await repo.save("retrieve", "기술스택이 뭐예요?", {"context": "Kafka"})
+
+        same = await repo.get("classify", "  기술스택이   뭐예요 ")
+        other_stage = await repo.get("retrieve", "스택 알려주세요")
+        repo.index_version = "v2"
+        # 분류는 인덱스와 무관하므로 재인덱싱 후에도 재사용, 검색 결과는 버려진다
+        reclassified = await repo.get("classify", "기술스택이 뭐예요?")
+        reretrieved = await repo.get("retrieve", "기술스택이 뭐예요?")
+        return same, other_stage, reclassified, reretrieved, repo.stats
+
+    same, other_stage, reclassified, reretrieved, stats = asyncio.run(scenario())
+    assert same == {"category": "기술스택"}
+    assert other_stage is None
+    assert reclassified == {"category": "기술스택"}
+    assert reretrieved is None
+    assert stats == {"hit": 2, "miss": 2}
@@ -0,0 +1,38 @@
+from resume.db.resume_reader import ResumeReader
+from resume.db.time_index import PRESENT, TimeIndex
+
+
+def test_slices_projects_in_chronological_order():
+    metas = [
+        {"doc_type": "projects", "company": "A", "period_from": "2021-03-01T00:00:00"},
+        {"doc_type": "qna"},
+        {"doc_type": "projects", "company": "B", "period_from": "2023-01-01T00:00:00"},
+        {"doc_type": "projects", "company": "C", "period_from": "2019-07-01T00:00:00"},
+        {"doc_type": "projects", "company": "D"},  # 기간 정보 없음 → 제외
+    ]
+    index = TimeIndex(metas)
+
+    assert len(index) == 3
+    assert index.slice("recent", 2) == [2, 0]
+    assert index.slice("first", 1) == [3]
+    assert index.slice("recent", 5, filters={"company": {"$regex": "^[AC]$"}}) == [0, 3]
+
+
+def test_ongoing_period_sorts_after_finished_ones():
+    metas = [
+        {"doc_type": "projects", "company": "A", "period_from": "2023-01-01T00:00:00", "period_to": PRESENT},
+        {"doc_type": "projects", "company": "B", "period_from": "2023-01-01T00:00:00", "period_to": "2024-06-01T00:00:00"},
+    ]
+
+    assert TimeIndex(metas).slice("recent", 1) == [0]
+
+
+def test_reader_ids_do_not_depend_on_indexing_time():
+    def ids():
+        reader = ResumeReader("", "", "", "", use_gcs=False)
+        reader._project_json_to_docs({"projects": [{"name": "P", "period": {"from": "2023.01", "to": "ING"}, "tech_stack": []}]})
+        return reader.ids, reader.meta
+
+    first_ids, metas = ids()
+    assert metas[0]["period_to"] == PRESENT
+    assert ids()[0] == first_ids
@@ -0,0 +1,141 @@
+import asyncio
+import hashlib
+import json
+
+import pytest
+
+chromadb = pytest.importorskip("chromadb")
+pytest.importorskip("langchain_openai")
+
+from resume.bench.load_test import QNA, write_corpus
+from resume.db.indexer import EmbeddingIndexer
+from resume.db.vector_store import VectorStore
+from resume.resume_chatbot import NO_INFO_ANSWER, TIMEOUT_ANSWER
+
+
+class FakeEmbeddings:
+    """문장 해시로 만든 결정적 벡터를 돌려주고 임베딩한 문장을 기록"""
+    def __init__(self) -> None:
+        self.texts: list[str] = []
+        self.queries: list[str] = []
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.texts.extend(texts)
+        return [self.vector(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        self.queries.append(text)
+        return self.vector(text)
+
+    @staticmethod
+    def vector(text: str) -> list[float]:
+        digest = hashlib.sha256(text.encode()).digest()
+        return [b / 255 for b in digest[:8]]
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    """임시 디렉토리에서 (db/chroma 포함) 합성 원본으로 VectorStore 를 만드는 함수"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    args = write_corpus(str(tmp_path))
+    embeddings = FakeEmbeddings()
+
+    def open_store() -> VectorStore:
+        return VectorStore(**args, indexer=EmbeddingIndexer(embeddings))
+
+    yield args, embeddings, open_store
+    # chromadb 는 경로별 클라이언트를 프로세스 안에서 재사용하므로 같은 상대 경로(db/chroma)를 쓰는 다음 테스트를 위해 비운다
+    chromadb.api.client.SharedSystemClient.clear_system_cache()
+
+
+def sync(store: VectorStore) -> VectorStore:
+    return asyncio.run(store.sync())
+
+
+def write_qna(args, items) -> None:
+    with open(args["gcs_qna_path"], "w", encoding="utf-8") as f:
+        json.dump(items, f, ensure_ascii=False)
+
+
+def test_sync_embeds_only_added_documents_and_deletes_removed(corpus):
+    args, embeddings, open_store = corpus
+    first = sync(open_store())
+    initial = set(first.collection.get(include=[])["ids"])
+    embedded = len(embeddings.texts)
+
+    # 질문 하나는 바꾸고 하나는 지움 → 바뀐 문서 하나만 새로 임베딩
+    changed = dict(QNA[0], answer="API 계약을 먼저 정하고 계약 테스트로 병렬 개발했습니다.")
+    write_qna(args, [changed, QNA[1]])
+    second = sync(open_store())
+    ids = set(second.collection.get(include=[])["ids"])
+
+    assert len(embeddings.texts) == embedded + 1
+    assert "계약 테스트" in embeddings.texts[-1]
+    assert len(ids) == len(initial) - 1
+    assert len(initial - ids) == 2
+    assert second.index_version != first.index_version
+    assert VectorStore.read_manifest(second.manifest_path)["index_version"] == second.index_version
+
+
+def test_unchanged_sources_skip_reading_and_embedding(corpus):
+    args, embeddings, open_store = corpus
+    first = sync(open_store())
+    embedded = len(embeddings.texts)
+
+    second = sync(open_store())
+    assert not second.reader.loaded
+    assert len(embeddings.texts) == embedded
+    assert second.index_version == first.index_version
+    assert len(second.lexical.ids) == len(first.lexical.ids)
+
+
+def test_index_is_kept_when_sources_are_empty(corpus, tmp_path):
+    args, embeddings, open_store = corpus
+    first = sync(open_store())
+    for key in ("gcs_projects_path", "gcs_qna_path", "gcs_introduce_path"):
+        (tmp_path / args[key]).unlink()
+
+    second = sync(open_store())
+    assert second.collection.count() == first.collection.count()
+    assert second.index_version == first.index_version
+
+
+def test_unreadable_source_is_treated_as_unchanged(corpus):
+    args, embeddings, open_store = corpus
+    first = sync(open_store())
+    qna_ids = set(first.collection.get(where={"doc_type": "qna"}, include=[])["ids"])
+
+    # qna.json 을 읽지 못해도 qna 문서는 삭제되지 않는다
+    with open(args["gcs_qna_path"], "w", encoding="utf-8") as f:
+        f.write("{깨진 json")
+    second = sync(open_store())
+
+    assert set(second.collection.get(where={"doc_type": "qna"}, include=[])["ids"]) == qna_ids
+    assert second.collection.count() == first.collection.count()
+    assert second.index_version == first.index_version
+    # 읽지 못한 원본은 manifest 에 남기지 않아 다음 동기화에서 다시 읽는다
+    assert args["gcs_qna_path"] not in VectorStore.read_manifest(second.manifest_path)["generations"]
+
+
+def test_one_request_embeds_the_question_once(corpus, chatbot):
+    args, embeddings, open_store = corpus
+    store = sync(open_store())
+    store.embeddings = embeddings
+    bot = chatbot()
+    bot.retriever.store = store
+    question = "가장 오래 고민했던 문제는 무엇인가요?"
+
+    async def scenario():
+        # 게이트/분류/선검색/의미 기반 캐시/검색이 모두 같은 질문 벡터를 쓴다
+        answer = await bot.chat(question, [], "s1")
+        first = list(embeddings.queries)
+        # 같은 질문을 다시 계산해도(다른 세션, 답변 캐시 무효화) LRU 에서 꺼내 쓴다
+        await bot.answer_repository.invalidate()
+        await bot.chat(question, [], "s2")
+        return answer, first, list(embeddings.queries)
+
+    answer, first, after = asyncio.run(scenario())
+    assert answer not in ("", NO_INFO_ANSWER, TIMEOUT_ANSWER)
+    assert first == [question]
+    assert after == [question]
@@ -0,0 +1,36 @@
+import asyncio
+
+from resume.bench.stub_openai import StubAsyncOpenAI
+from resume.warmup import warm_answers
+
+
+def test_paraphrased_questions_are_saved_under_their_own_key(chatbot):
+    bot = chatbot()
+    questions = ["가장 힘들었던 프로젝트는?", "제일 어려웠던 프로젝트가 뭐였나요?"]
+
+    async def scenario():
+        # 첫 질문의 답변이 의미 기반 캐시에 있어도 두 번째 질문은 파이프라인을 끝까지 돌아 자기 키로 저장된다
+        category = (await bot.classifier.classify_question(questions[1]))["category"]
+        await bot.answer_repository.save(questions[0], "이전 답변", category, vector=[1.0, 0.0, 0.0])
+        stats = await warm_answers(bot, questions, ttl=600)
+        answers = await bot.answer_repository.get_answers(questions)
+        return stats, answers
+
+    stats, answers = asyncio.run(scenario())
+    assert stats == {"questions": 2, "cached": 1, "warmed": 1, "skipped": 0, "failed": 0}
+    assert answers[1] and answers[1] != "이전 답변"
+    assert bot.semantic_cache
+
+
+def test_refine_timeout_is_not_counted_as_warmed(chatbot, monkeypatch):
+    bot = chatbot()
+    bot.refiner.client = StubAsyncOpenAI(latency=0.5, per_token_latency=0)
+    monkeypatch.setenv("STAGE_TIMEOUT_REFINE", "0.05")
+
+    async def scenario():
+        stats = await warm_answers(bot, ["가장 힘들었던 프로젝트는?"], ttl=600)
+        return stats, await bot.answer_repository.get_answer("가장 힘들었던 프로젝트는?")
+
+    stats, answer = asyncio.run(scenario())
+    assert stats["warmed"] == 0 and stats["skipped"] == 1
+    assert answer is None